@@ -5,6 +5,7 @@ from backend.auth import get_current_active_user
 from backend.config import DEFAULT_LIMIT, MAX_LIMIT, RATE_LIMIT_LLM
 from backend.db import get_db
 from backend.rate_limit import get_user_or_ip, limiter
+from backend.responses import EventStreamResponse
 from backend.schemas.chat import (
     ChatIn,
     ChatMessageOut,
@@ -18,6 +19,7 @@ from backend.services.chat import (
     get_session,
     list_sessions,
     send_message,
+    stream_message,
     update_session,
 )
 from core.db.models import User
@@ -92,3 +94,20 @@ async def post_message(
 ) -> ChatMessageOut:
     """Send a message to a chat session and get the assistant's response."""
     return await send_message(db, user.id, session_id, body.message)
+
+
+@router.post("/{session_id}/messages/stream", response_class=EventStreamResponse)
+@limiter.limit(RATE_LIMIT_LLM, key_func=get_user_or_ip)
+async def post_message_stream(
+    request: Request,
+    session_id: int,
+    body: ChatIn,
+    user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db),
+) -> EventStreamResponse:
+    """Send a message and stream the response as server-sent events.
+
+    Recommendations stream `intent`, `products`, `reason`s and `summary`; other intents
+    send `intent` only. `message` (the saved ChatMessageOut) always comes last.
+    """
+    return EventStreamResponse(await stream_message(db, user.id, session_id, body.message), db)
@@ -1,20 +1,47 @@
 from decimal import Decimal
 from typing import Annotated, Literal
 
-from fastapi import APIRouter, Depends, Path, Query
+from fastapi import APIRouter, Depends, Path, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
+from backend.conditional import is_not_modified, not_modified, strong_etag, validators
 from backend.config import (
     DEFAULT_LIMIT,
+    DEFAULT_RANDOM_SAMPLE,
+    DEFAULT_SUGGEST_LIMIT,
+    FACETS_MAX_AGE,
+    MAX_BATCH_SKUS,
+    MAX_CURSOR_LENGTH,
     MAX_FILTER_LENGTH,
     MAX_LIMIT,
+    MAX_RANDOM_SAMPLE,
     MAX_SAQ_STORE_ID_LENGTH,
     MAX_SEARCH_LENGTH,
     MAX_SKU_LENGTH,
+    MAX_SUGGEST_LIMIT,
+    MIN_SUGGEST_PREFIX,
+    PRODUCT_MAX_AGE,
 )
 from backend.db import get_db, get_session_factory
-from backend.schemas.product import FacetsOut, PaginatedOut, ProductOut
-from backend.services.products import get_facets, get_product, get_random_product, list_products
+from backend.responses import ModelJSONResponse
+from backend.schemas.product import (
+    FacetsOut,
+    PaginatedOut,
+    ProductBatchOut,
+    ProductOut,
+    SuggestOut,
+)
+from backend.services.catalog import catalog_last_modified, catalog_version
+from backend.services.products import (
+    get_facets,
+    get_product,
+    get_product_updated_at,
+    get_products_batch,
+    get_random_product,
+    get_random_products,
+    get_suggestions,
+    list_products,
+)
 
 router = APIRouter(prefix="/products", tags=["products"])
 
@@ -23,7 +50,10 @@ router = APIRouter(prefix="/products", tags=["products"])
 async def get_products(
     limit: int = Query(default=DEFAULT_LIMIT, ge=1, le=MAX_LIMIT),
     offset: int = Query(default=0, ge=0),
-    sort: Literal["recent", "price_asc", "price_desc", "alpha"] | None = Query(default=None),
+    cursor: str | None = Query(default=None, min_length=1, max_length=MAX_CURSOR_LENGTH),
+    sort: Literal["recent", "price_asc", "price_desc", "alpha", "relevance"] | None = Query(
+        default=None
+    ),
     q: str | None = Query(default=None, min_length=1, max_length=MAX_SEARCH_LENGTH),
     category: list[Annotated[str, Query(max_length=MAX_FILTER_LENGTH)]] | None = Query(
         default=None
@@ -38,13 +68,22 @@ async def get_products(
     ),
     scope: Literal["wine", "all"] = Query(default="wine"),
     db: AsyncSession = Depends(get_db),
-) -> PaginatedOut:
-    """List products with offset-based pagination and optional filters and sorting options."""
-    return await list_products(
+) -> Response:
+    """List products with optional filters and sorting options.
+
+    Paginate with `offset`, or pass the previous page's `next_cursor` as `cursor`
+    for keyset pagination (constant cost at any depth).
+
+    `q` searches name, producer, grape, region, appellation and description (French
+    stemming, accent-insensitive). `sort=relevance` ranks those matches best-first;
+    relevance pages are offset-only.
+    """
+    page = await list_products(
         db,
         limit,
         offset,
         sort=sort,
+        cursor=cursor,
         q=q,
         category=category,
         country=country,
@@ -55,10 +94,13 @@ async def get_products(
         in_stores=in_stores,
         wine_scope=scope == "wine",
     )
+    return ModelJSONResponse(page)
 
 
 @router.get("/facets", response_model=FacetsOut)
 async def get_product_facets(
+    request: Request,
+    response: Response,
     category: list[Annotated[str, Query(max_length=MAX_FILTER_LENGTH)]] | None = Query(
         default=None
     ),
@@ -68,17 +110,58 @@ async def get_product_facets(
     ),
     scope: Literal["wine", "all"] = Query(default="wine"),
     session_factory: async_sessionmaker[AsyncSession] = Depends(get_session_factory),
-) -> FacetsOut:
-    """Return distinct filter values and price range for the catalog."""
+) -> FacetsOut | Response:
+    """Return distinct filter values and price range for the catalog.
+
+    Supports conditional GET — 304 until the catalog version changes.
+    """
+    async with session_factory() as s:
+        version = await catalog_version(s)
+    # The URL carries the filters; only the catalog can change what it returns
+    last_modified = catalog_last_modified(version)
+    etag = strong_etag("facets", version)
+    headers = validators(etag, last_modified, FACETS_MAX_AGE)
+    if is_not_modified(request, etag, last_modified):
+        return not_modified(headers)
+    response.headers.update(headers)
     return await get_facets(
         session_factory,
         category=category,
         available=available,
         in_stores=in_stores,
         wine_scope=scope == "wine",
+        version=version,
     )
 
 
+@router.get("/suggest", response_model=SuggestOut)
+async def get_product_suggestions(
+    prefix: str = Query(min_length=MIN_SUGGEST_PREFIX, max_length=MAX_SEARCH_LENGTH),
+    limit: int = Query(default=DEFAULT_SUGGEST_LIMIT, ge=1, le=MAX_SUGGEST_LIMIT),
+) -> SuggestOut:
+    """Typeahead: product names, producers, regions, grapes and appellations.
+
+    Matches any word start, accent-insensitive; falls back to the closest spelling
+    (reported as `corrected`) when nothing matches. Served from memory.
+    """
+    return get_suggestions(prefix, limit)
+
+
+@router.get("/batch", response_model=ProductBatchOut)
+async def get_products_by_sku(
+    sku: list[Annotated[str, Query(min_length=1, max_length=MAX_SKU_LENGTH)]] = Query(
+        min_length=1, max_length=MAX_BATCH_SKUS
+    ),
+    db: AsyncSession = Depends(get_db),
+) -> Response:
+    """Return many products in one call, in request order.
+
+    Repeat `sku` per product. SKUs not in the catalog are listed in `missing`, delisted
+    ones in `delisted`.
+    """
+    return ModelJSONResponse(await get_products_batch(db, sku))
+
+
 @router.get("/random", response_model=ProductOut)
 async def get_random(
     category: list[Annotated[str, Query(max_length=MAX_FILTER_LENGTH)]] | None = Query(
@@ -109,10 +192,60 @@ async def get_random(
     )
 
 
+@router.get("/random/sample", response_model=list[ProductOut])
+async def get_random_sample(
+    n: int = Query(default=DEFAULT_RANDOM_SAMPLE, ge=1, le=MAX_RANDOM_SAMPLE),
+    category: list[Annotated[str, Query(max_length=MAX_FILTER_LENGTH)]] | None = Query(
+        default=None
+    ),
+    country: str | None = Query(default=None, max_length=MAX_FILTER_LENGTH),
+    region: str | None = Query(default=None, max_length=MAX_FILTER_LENGTH),
+    min_price: Decimal | None = Query(default=None, ge=0),
+    max_price: Decimal | None = Query(default=None, ge=0),
+    available: bool | None = Query(default=None),
+    in_stores: list[Annotated[str, Query(max_length=MAX_SAQ_STORE_ID_LENGTH)]] | None = Query(
+        default=None
+    ),
+    scope: Literal["wine", "all"] = Query(default="wine"),
+    db: AsyncSession = Depends(get_db),
+) -> Response:
+    """Return up to `n` distinct random products matching the given filters."""
+    products = await get_random_products(
+        db,
+        n,
+        category=category,
+        country=country,
+        region=region,
+        min_price=min_price,
+        max_price=max_price,
+        available=available,
+        in_stores=in_stores,
+        wine_scope=scope == "wine",
+    )
+    return ModelJSONResponse(products)
+
+
 @router.get("/{sku}", response_model=ProductOut)
 async def get_product_detail(
+    request: Request,
+    response: Response,
     sku: str = Path(max_length=MAX_SKU_LENGTH),
     db: AsyncSession = Depends(get_db),
-) -> ProductOut:
-    """Get a single product by SKU."""
-    return await get_product(db, sku)
+) -> ProductOut | Response:
+    """Get a single product by SKU.
+
+    Supports conditional GET — 304 while neither the product nor the catalog changed.
+    Revalidation reads only updated_at; the product is loaded for a 200 alone.
+    """
+    updated_at = await get_product_updated_at(db, sku)
+    # updated_at moves on every SQLAlchemy write; the version also catches raw-SQL backfills
+    version = await catalog_version(db)
+    last_modified = catalog_last_modified(version)
+    etag = strong_etag("product", sku, updated_at.isoformat(), version)
+    if is_not_modified(request, etag, last_modified):
+        return not_modified(validators(etag, last_modified, PRODUCT_MAX_AGE))
+    product = await get_product(db, sku)
+    # Tag the body actually sent, in case the row changed since the validator read
+    etag = strong_etag("product", sku, product.updated_at.isoformat(), version)
+    response.headers.update(validators(etag, last_modified, PRODUCT_MAX_AGE))
+    return product
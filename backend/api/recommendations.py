@@ -5,8 +5,9 @@ from backend.auth import get_caller_user_id, resolve_user_id
 from backend.config import RATE_LIMIT_LLM
 from backend.db import get_db
 from backend.rate_limit import get_user_or_ip, limiter
+from backend.responses import EventStreamResponse
 from backend.schemas.recommendation import RecommendationIn, RecommendationOut
-from backend.services.recommendations import recommend
+from backend.services.recommendations import recommend, recommend_stream
 
 router = APIRouter(prefix="/recommendations", tags=["recommendations"])
 
@@ -27,3 +28,28 @@ async def post_recommendations(
         available_online=body.available_online,
         in_store=body.in_store,
     )
+
+
+@router.post("/stream", response_class=EventStreamResponse)
+@limiter.limit(RATE_LIMIT_LLM, key_func=get_user_or_ip)
+async def post_recommendations_stream(
+    request: Request,
+    body: RecommendationIn,
+    caller_user_id: str | None = Depends(get_caller_user_id),
+    db: AsyncSession = Depends(get_db),
+) -> EventStreamResponse:
+    """Same pipeline as POST /recommendations, as server-sent events.
+
+    Events: `intent`, `products` (ranked, before curation), one `reason` per wine as
+    it's written, `summary`, then `done` with the full RecommendationOut (incl. log_id).
+    `error` ends the stream if a stage fails.
+    """
+    user_id = resolve_user_id(caller_user_id, body.user_id)
+    events = recommend_stream(
+        db,
+        body.query,
+        user_id=user_id,
+        available_online=body.available_online,
+        in_store=body.in_store,
+    )
+    return EventStreamResponse(events, db)
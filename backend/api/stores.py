@@ -1,19 +1,33 @@
-from fastapi import APIRouter, Depends, Path, Query, status
+from decimal import Decimal
+from typing import Annotated, Literal
+
+from fastapi import APIRouter, Depends, Path, Query, Request, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.auth import get_caller_user_id, resolve_user_id
+from backend.conditional import is_not_modified, not_modified, strong_etag, validators
 from backend.config import (
+    DEFAULT_LIMIT,
     DEFAULT_NEARBY_LIMIT,
+    MAX_CURSOR_LENGTH,
+    MAX_FILTER_LENGTH,
+    MAX_LIMIT,
     MAX_NEARBY_LIMIT,
     MAX_SAQ_STORE_ID_LENGTH,
+    MAX_SEARCH_LENGTH,
     MAX_USER_ID_LENGTH,
+    NEARBY_MAX_AGE,
 )
 from backend.db import get_db
+from backend.responses import ModelJSONResponse
+from backend.schemas.product import PaginatedOut
 from backend.schemas.store import StoreWithDistance, UserStorePreferenceIn, UserStorePreferenceOut
+from backend.services.catalog import catalog_last_modified, catalog_version
 from backend.services.stores import (
     add_user_store,
     get_nearby_stores,
     get_user_stores,
+    list_store_products,
     remove_user_store,
 )
 
@@ -22,15 +36,69 @@ router = APIRouter(prefix="/stores", tags=["stores"])
 
 @router.get("/nearby", response_model=list[StoreWithDistance])
 async def nearby_stores(
+    request: Request,
+    response: Response,
     lat: float = Query(ge=-90, le=90),
     lng: float = Query(ge=-180, le=180),
     limit: int = Query(default=DEFAULT_NEARBY_LIMIT, ge=1, le=MAX_NEARBY_LIMIT),
     db: AsyncSession = Depends(get_db),
-) -> list[StoreWithDistance]:
-    """Return the nearest SAQ stores to the given GPS coordinates."""
+) -> list[StoreWithDistance] | Response:
+    """Return the nearest SAQ stores to the given GPS coordinates.
+
+    Supports conditional GET — store details and inventory counts change only with the
+    catalog version, which the store and availability scrapes both bump.
+    """
+    version = await catalog_version(db)
+    last_modified = catalog_last_modified(version)
+    etag = strong_etag("stores", version)
+    headers = validators(etag, last_modified, NEARBY_MAX_AGE)
+    if is_not_modified(request, etag, last_modified):
+        return not_modified(headers)
+    response.headers.update(headers)
     return await get_nearby_stores(db, lat, lng, limit)
 
 
+@router.get("/{saq_store_id}/products", response_model=PaginatedOut)
+async def store_products(
+    saq_store_id: str = Path(min_length=1, max_length=MAX_SAQ_STORE_ID_LENGTH),
+    limit: int = Query(default=DEFAULT_LIMIT, ge=1, le=MAX_LIMIT),
+    offset: int = Query(default=0, ge=0),
+    cursor: str | None = Query(default=None, min_length=1, max_length=MAX_CURSOR_LENGTH),
+    sort: Literal["recent", "price_asc", "price_desc", "alpha", "relevance"] | None = Query(
+        default=None
+    ),
+    q: str | None = Query(default=None, min_length=1, max_length=MAX_SEARCH_LENGTH),
+    category: list[Annotated[str, Query(max_length=MAX_FILTER_LENGTH)]] | None = Query(
+        default=None
+    ),
+    country: str | None = Query(default=None, max_length=MAX_FILTER_LENGTH),
+    region: str | None = Query(default=None, max_length=MAX_FILTER_LENGTH),
+    min_price: Decimal | None = Query(default=None, ge=0),
+    max_price: Decimal | None = Query(default=None, ge=0),
+    available: bool | None = Query(default=None),
+    scope: Literal["wine", "all"] = Query(default="wine"),
+    db: AsyncSession = Depends(get_db),
+) -> Response:
+    """List products in stock at a store — same filters and pagination as /products."""
+    page = await list_store_products(
+        db,
+        saq_store_id,
+        limit,
+        offset,
+        sort=sort,
+        cursor=cursor,
+        q=q,
+        category=category,
+        country=country,
+        region=region,
+        min_price=min_price,
+        max_price=max_price,
+        available=available,
+        wine_scope=scope == "wine",
+    )
+    return ModelJSONResponse(page)
+
+
 @router.get("/preferences", response_model=list[UserStorePreferenceOut])
 async def list_user_stores(
     user_id: str | None = Query(default=None, min_length=1, max_length=MAX_USER_ID_LENGTH),
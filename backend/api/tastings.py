@@ -1,9 +1,10 @@
-from fastapi import APIRouter, Depends, Path, Query, status
+from fastapi import APIRouter, Depends, Path, Query, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.auth import get_caller_user_id
 from backend.config import MAX_LIMIT
 from backend.db import get_db
+from backend.responses import ModelJSONResponse
 from backend.schemas.tasting import TastingIn, TastingOut, TastingRatingOut, TastingUpdateIn
 from backend.services.tastings import (
     create_tasting,
@@ -52,9 +53,9 @@ async def get_tastings(
     offset: int = Query(default=0, ge=0),
     user_id: str | None = Depends(get_caller_user_id),
     db: AsyncSession = Depends(get_db),
-) -> list[TastingOut]:
+) -> Response:
     """List the authenticated user's tasting notes, reverse-chronological."""
-    return await list_tastings(db, user_id=user_id, limit=limit, offset=offset)
+    return ModelJSONResponse(await list_tastings(db, user_id=user_id, limit=limit, offset=offset))
 
 
 @router.patch("/{note_id}", response_model=TastingOut)
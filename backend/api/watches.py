@@ -1,9 +1,10 @@
-from fastapi import APIRouter, Depends, Path, Query, status
+from fastapi import APIRouter, Depends, Path, Query, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.auth import get_caller_user_id, resolve_user_id
 from backend.config import MAX_SKU_LENGTH, MAX_USER_ID_LENGTH
 from backend.db import get_db
+from backend.responses import ModelJSONResponse
 from backend.schemas.watch import AckIn, NotificationOut, WatchIn, WatchWithProduct
 from backend.services.watches import (
     ack_notifications,
@@ -32,10 +33,10 @@ async def get_watches(
     user_id: str | None = Query(default=None, min_length=1, max_length=MAX_USER_ID_LENGTH),
     caller_user_id: str | None = Depends(get_caller_user_id),
     db: AsyncSession = Depends(get_db),
-) -> list[WatchWithProduct]:
+) -> Response:
     """List all watches for a user, with product details."""
     resolved = resolve_user_id(caller_user_id, user_id)
-    return await list_watches(db, resolved)
+    return ModelJSONResponse(await list_watches(db, resolved))
 
 
 @router.get(
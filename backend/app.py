@@ -1,3 +1,4 @@
+import asyncio
 import os
 from collections.abc import AsyncGenerator
 from contextlib import asynccontextmanager
@@ -22,12 +23,16 @@ from backend.api.users import router as users_router
 from backend.api.waitlist import router as waitlist_router
 from backend.api.watches import router as watches_router
 from backend.auth import verify_admin, verify_auth
+from backend.catalog_engine import catalog_engine
 from backend.config import SERVICE_NAME, backend_settings
 from backend.db import SessionLocal, engine, verify_db_connection
 from backend.errors import register_exception_handlers
+from backend.log_writer import log_writer
 from backend.rate_limit import limiter
-from backend.redis_client import redis_client
+from backend.redis_client import redis_bytes_client, redis_client
 from backend.repositories import users as users_repo
+from backend.services.recommendations import warm_embedding_cache
+from backend.vector_engine import vector_engine
 from core.config.settings import settings
 from core.logging import setup_logging
 
@@ -70,8 +75,31 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
         )
     logger.info("Admin user verified")
 
+    if backend_settings.CATALOG_ENGINE_ENABLED:
+        catalog_engine.start(SessionLocal)
+    if backend_settings.VECTOR_SEARCH_BACKEND == "memory":
+        vector_engine.start(SessionLocal)
+    if backend_settings.RECOMMENDATION_LOG_WRITE_BEHIND:
+        log_writer.start(SessionLocal)
+
+    warm_task: asyncio.Task | None = None
+    if (
+        backend_settings.EMBEDDING_CACHE_ENABLED
+        and backend_settings.EMBEDDING_CACHE_WARM
+        and backend_settings.OPENAI_API_KEY
+    ):
+        warm_task = asyncio.create_task(warm_embedding_cache(SessionLocal))
+
     yield
+    if warm_task is not None:
+        warm_task.cancel()
+        await asyncio.gather(warm_task, return_exceptions=True)
+    await catalog_engine.stop()
+    await vector_engine.stop()
+    # Before the engine is disposed — flushes the rows still queued
+    await log_writer.stop()
     await redis_client.aclose()
+    await redis_bytes_client.aclose()
     await engine.dispose()
     logger.info("Shutdown complete")
 
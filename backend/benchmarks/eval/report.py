@@ -75,6 +75,14 @@ def print_report(report: EvalReport) -> None:
             delta = _delta_str(avg, prev_tag_avgs.get(tag))
             print(f"    {tag:<20} {avg:.2f}{delta}")
 
+    if report.latency_p50:
+        prev_p50 = previous.latency_p50 if previous else {}
+        print()
+        print("  LATENCY p50 (ms):")
+        for stage, p50 in report.latency_p50.items():
+            delta = _delta_str(p50, prev_p50.get(stage))
+            print(f"    {stage:<20} {p50:.0f}{delta}")
+
     print("=" * 70)
 
     # Low scores detail
@@ -109,6 +117,7 @@ def save_report(report: EvalReport) -> Path:
         "weighted_average": data["weighted_average"],
         "averages": data["averages"],
         "tag_averages": data["tag_averages"],
+        "latency_p50": data["latency_p50"],
         "total_queries": data["total_queries"],
         "rubric": data["rubric"],
         "query_scores": data["query_scores"],
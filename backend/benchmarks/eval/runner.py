@@ -1,4 +1,5 @@
 import asyncio
+import statistics
 
 import anthropic
 from loguru import logger
@@ -6,9 +7,11 @@ from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 from backend.services.recommendations import recommend
 from core.db.base import create_session_factory
+from core.db.models import RecommendationLog
 
 from .judge import JUDGE_CONCURRENCY, JUDGE_MODEL, judge_query
 from .schemas import (
+    LATENCY_STAGES,
     DimensionScore,
     EvalReport,
     ParsedIntentSummary,
@@ -22,10 +25,13 @@ from .schemas import (
 async def _run_single(
     session_factory: async_sessionmaker[AsyncSession],
     test_query: TestQuery,
-) -> tuple[ParsedIntentSummary, list[ProductSummary], str]:
+) -> tuple[ParsedIntentSummary, list[ProductSummary], str, dict[str, int]]:
     """Run the real recommendation pipeline for one query."""
     async with session_factory() as db:
         result = await recommend(db, test_query.query, available_online=False)
+        # Per-stage timings from the (flushed, never committed) log row
+        log = await db.get(RecommendationLog, result.log_id) if result.log_id else None
+        latency = log.latency_ms if log is not None and log.latency_ms else {}
 
     intent = ParsedIntentSummary(
         categories=result.intent.categories,
@@ -53,7 +59,7 @@ async def _run_single(
         )
         for item in result.products
     ]
-    return intent, products, result.summary
+    return intent, products, result.summary, latency
 
 
 def _make_error_score(
@@ -91,11 +97,13 @@ async def run_eval(
     collected: list[
         tuple[TestQuery, ParsedIntentSummary, list[ProductSummary], str, str | None]
     ] = []
+    latencies: dict[int, dict[str, int]] = {}
 
     for i, test_query in enumerate(queries, 1):
         logger.info("[{}/{}] {}", i, len(queries), test_query.query)
         try:
-            intent, products, summary = await _run_single(session_factory, test_query)
+            intent, products, summary, latency = await _run_single(session_factory, test_query)
+            latencies[test_query.id] = latency
             logger.info(
                 "  -> {} products | intent: {} {} {}",
                 len(products),
@@ -141,6 +149,7 @@ async def run_eval(
     for test_query, *_ in collected:
         qs = error_scores[test_query.id] if test_query.id in error_scores else next(judged_iter)
         qs.summary = summaries.get(test_query.id, "")
+        qs.latency_ms = latencies.get(test_query.id, {})
         query_scores.append(qs)
 
     # Phase 3: Compute averages
@@ -171,6 +180,13 @@ async def run_eval(
     for tag, scores in sorted(tag_scores.items()):
         tag_averages[tag] = round(sum(scores) / len(scores), 2)
 
+    # Phase 5: Median stage latencies over the queries that ran
+    latency_p50: dict[str, float] = {}
+    for stage in LATENCY_STAGES:
+        timings = [qs.latency_ms[stage] for qs in query_scores if stage in qs.latency_ms]
+        if timings:
+            latency_p50[stage] = statistics.median(timings)
+
     return EvalReport(
         judge_model=JUDGE_MODEL,
         judge_runs=judge_runs,
@@ -181,4 +197,5 @@ async def run_eval(
         averages=averages,
         tag_averages=tag_averages,
         weighted_average=round(weighted_avg, 2),
+        latency_p50=latency_p50,
     )
@@ -8,6 +8,9 @@ from pydantic import BaseModel, Field
 
 DATA_DIR = Path(__file__).parent / "data"
 
+# latency_ms keys summarized in the report — the pipeline stages, then the whole request
+LATENCY_STAGES = ("intent", "embed", "search", "curation", "total")
+
 
 class TestQuery(BaseModel):
     id: int
@@ -69,6 +72,8 @@ class QueryScore(BaseModel):
     products: list[ProductSummary]
     summary: str = ""
     error: str | None = None
+    # The recommendation log's per-stage timings (ms), including speculation flags
+    latency_ms: dict[str, int] = {}
 
 
 class EvalReport(BaseModel):
@@ -82,6 +87,7 @@ class EvalReport(BaseModel):
     averages: dict[str, float]
     tag_averages: dict[str, float] = {}
     weighted_average: float
+    latency_p50: dict[str, float] = {}
 
 
 def load_queries() -> list[TestQuery]:
@@ -0,0 +1,232 @@
+"""HNSW and quantized search vs exact scan on the eval queries: p50/p95 latency and recall@k.
+
+Each query is parsed and embedded once (Claude + OpenAI), then find_similar's filtered
+nearest-neighbour statement runs --runs times per setting. The exact scan over full vectors
+(index scans off) is the ground truth. Quantized settings rank on embedding_prefix first and
+re-rank --rerank candidates on full vectors, once scanned and once through the prefix index.
+
+    python -m backend.benchmarks.vector --ef-search 40 100 200 --rerank 100 300 --runs 5
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from dataclasses import asdict, dataclass
+from datetime import UTC, datetime
+from pathlib import Path
+
+import numpy as np
+from loguru import logger
+from sqlalchemy import Select, func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from backend.benchmarks.eval.schemas import load_queries
+from backend.config import backend_settings
+from backend.repositories.recommendations import hnsw_settings, similar_stmt
+from backend.schemas.recommendation import IntentResult
+from backend.services._openai import get_openai_client
+from backend.services.intent import parse_intent
+from core.config.settings import settings
+from core.db.base import create_session_factory
+from core.embedding_client import async_create_embeddings
+
+RESULTS_DIR = Path(__file__).parent / "results"
+
+# Ground truth: no index scans, so the planner sorts every filtered row by distance
+_EXACT = select(func.set_config("enable_indexscan", "off", True))
+# The pre-iterative behaviour — filters applied to ef_search index hits, then stop
+_NO_ITERATIVE = select(func.set_config("hnsw.iterative_scan", "off", True))
+
+
+@dataclass
+class SettingResult:
+    name: str
+    p50_ms: float
+    p95_ms: float
+    recall: float | None  # mean recall@k against the exact scan; None for the exact scan
+    min_recall: float | None
+    short: int  # queries returning fewer rows than the exact scan
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="HNSW vector search recall/latency benchmark")
+    parser.add_argument(
+        "--split",
+        choices=["train", "holdout", "all"],
+        default="all",
+        help="Which eval query split to run (default: all)",
+    )
+    parser.add_argument(
+        "--ef-search",
+        type=int,
+        nargs="+",
+        default=[backend_settings.HNSW_EF_SEARCH],
+        help="hnsw.ef_search values to compare (default: HNSW_EF_SEARCH)",
+    )
+    parser.add_argument(
+        "--rerank",
+        type=int,
+        nargs="+",
+        default=[backend_settings.VECTOR_RERANK_CANDIDATES],
+        help="Quantized first-pass sizes to compare (default: VECTOR_RERANK_CANDIDATES)",
+    )
+    parser.add_argument(
+        "--k",
+        type=int,
+        default=25,
+        help="Candidates fetched per query — find_similar's limit x diversity pool (default: 25)",
+    )
+    parser.add_argument(
+        "--runs",
+        type=int,
+        default=5,
+        help="Timed repetitions per query and setting (default: 5)",
+    )
+    return parser.parse_args()
+
+
+async def _prepare(queries: list[str]) -> list[tuple[IntentResult, list[float]]]:
+    """Parse and embed each query once — recommendation intents only."""
+    intents = await asyncio.gather(*(parse_intent(q) for q in queries))
+    searchable = [i for i in intents if i.intent_type == "recommendation"]
+    vectors = await async_create_embeddings(
+        [i.semantic_query for i in searchable], client=get_openai_client()
+    )
+    return list(zip(searchable, vectors, strict=True))
+
+
+async def _search(
+    session_factory: async_sessionmaker[AsyncSession], setup: list[Select], stmt: Select
+) -> tuple[list[str], float]:
+    """Run `stmt` after the transaction-local `setup`; return SKUs and elapsed milliseconds."""
+    async with session_factory() as db:
+        for s in setup:
+            await db.execute(s)
+        start = time.perf_counter()
+        result = await db.execute(stmt)
+        skus = [p.sku for p in result.scalars()]
+        elapsed = (time.perf_counter() - start) * 1000
+    return skus, elapsed
+
+
+async def _measure(
+    session_factory: async_sessionmaker[AsyncSession],
+    name: str,
+    setup: list[Select],
+    stmts: list[Select],
+    runs: int,
+    truth: list[list[str]] | None,
+) -> tuple[SettingResult, list[list[str]]]:
+    latencies: list[float] = []
+    results: list[list[str]] = []
+    for stmt in stmts:
+        for _ in range(runs):
+            skus, elapsed = await _search(session_factory, setup, stmt)
+            latencies.append(elapsed)
+        results.append(skus)
+
+    p50, p95 = np.percentile(latencies, [50, 95])
+    if truth is None:
+        return SettingResult(name, p50, p95, None, None, 0), results
+
+    recalls = [
+        len(set(got) & set(exp)) / len(exp) for got, exp in zip(results, truth, strict=True) if exp
+    ]
+    short = sum(len(got) < len(exp) for got, exp in zip(results, truth, strict=True))
+    return (
+        SettingResult(
+            name,
+            p50,
+            p95,
+            float(np.mean(recalls)) if recalls else None,
+            min(recalls) if recalls else None,
+            short,
+        ),
+        results,
+    )
+
+
+def _print_report(results: list[SettingResult], n_queries: int, k: int) -> None:
+    print(f"\n  VECTOR SEARCH — {n_queries} queries, k={k}\n")
+    print(
+        f"  {'setting':<28} {'p50 ms':>8} {'p95 ms':>8} {f'recall@{k}':>10} {'min':>6} {'short':>6}"
+    )
+    for r in results:
+        recall = f"{r.recall:.3f}" if r.recall is not None else "—"
+        low = f"{r.min_recall:.2f}" if r.min_recall is not None else "—"
+        print(
+            f"  {r.name:<28} {r.p50_ms:>8.1f} {r.p95_ms:>8.1f} {recall:>10} {low:>6} {r.short:>6}"
+        )
+    print()
+
+
+def _save_report(results: list[SettingResult], n_queries: int, k: int, runs: int) -> Path:
+    RESULTS_DIR.mkdir(exist_ok=True)
+    timestamp = datetime.now(UTC).isoformat(timespec="seconds").replace(":", "-")
+    path = RESULTS_DIR / f"vector_{timestamp}.json"
+    data = {
+        "timestamp": timestamp,
+        "queries": n_queries,
+        "k": k,
+        "runs": runs,
+        "settings": [asdict(r) for r in results],
+    }
+    path.write_text(json.dumps(data, indent=2) + "\n")
+    return path
+
+
+async def main() -> int:
+    args = _parse_args()
+
+    if not backend_settings.ANTHROPIC_API_KEY:
+        logger.error("ANTHROPIC_API_KEY not set — cannot parse eval queries")
+        return 1
+    if not backend_settings.OPENAI_API_KEY:
+        logger.error("OPENAI_API_KEY not set — cannot embed eval queries")
+        return 1
+
+    queries = load_queries()
+    if args.split != "all":
+        queries = [q for q in queries if q.split == args.split]
+    prepared = await _prepare([q.query for q in queries])
+
+    def statements(rerank: int | None = None) -> list[Select]:
+        # Same filters as the eval pipeline run (available_online=False)
+        return [
+            similar_stmt(i, v, available_online=False, limit=args.k, rerank=rerank)
+            for i, v in prepared
+        ]
+
+    stmts = statements()
+    logger.info("Benchmarking {} searchable queries, {} run(s) each", len(stmts), args.runs)
+
+    session_factory = create_session_factory(settings.database_url)
+    exact, truth = await _measure(session_factory, "exact scan", [_EXACT], stmts, args.runs, None)
+    results = [exact]
+    for ef in args.ef_search:
+        for name, setup in (
+            (f"hnsw ef={ef}", [hnsw_settings(ef)]),
+            (f"hnsw ef={ef} no iterative", [hnsw_settings(ef), _NO_ITERATIVE]),
+        ):
+            result, _ = await _measure(session_factory, name, setup, stmts, args.runs, truth)
+            results.append(result)
+    for rerank in args.rerank:
+        quantized = statements(rerank)
+        ef = max(backend_settings.HNSW_EF_SEARCH, rerank)
+        for name, setup in (
+            (f"prefix scan rerank={rerank}", [_EXACT]),
+            (f"prefix hnsw rerank={rerank}", [hnsw_settings(ef)]),
+        ):
+            result, _ = await _measure(session_factory, name, setup, quantized, args.runs, truth)
+            results.append(result)
+
+    _print_report(results, len(stmts), args.k)
+    path = _save_report(results, len(stmts), args.k, args.runs)
+    logger.info("Saved report to {}", path)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,261 @@
+import asyncio
+import hashlib
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from typing import TYPE_CHECKING
+
+import numpy as np
+from loguru import logger
+from pydantic import BaseModel
+from redis.exceptions import RedisError
+
+from backend.metrics import embedding_cache_requests, response_cache_requests
+
+if TYPE_CHECKING:
+    from redis.asyncio import Redis
+
+
+def normalize_query(text: str) -> str:
+    """Cache key for free-text queries — case and whitespace don't change what's asked."""
+    return " ".join(text.casefold().split())
+
+
+class LRUCache[K, V]:
+    """Bounded in-process cache with least-recently-used eviction and optional TTL.
+
+    Not shared across workers — each uvicorn process keeps its own copy.
+    """
+
+    def __init__(self, maxsize: int, ttl: float | None = None) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[K, tuple[float, V]] = OrderedDict()
+
+    def get(self, key: K) -> V | None:
+        """Return the cached value, or None if absent or expired."""
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        stored_at, value = entry
+        if self.ttl is not None and time.monotonic() - stored_at > self.ttl:
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: K, value: V) -> None:
+        self._data[key] = (time.monotonic(), value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class ResponseCache[M: BaseModel]:
+    """Cache for whole API responses, keyed by catalog version and a normalized request key.
+
+    A version bump makes every older entry unreachable, so there's nothing to purge.
+    Lookups go through a bounded in-process LRU first, then — when `redis` is given —
+    a copy shared by every gunicorn worker. Concurrent misses on one key share a single
+    computation instead of stampeding the database.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        model: type[M],
+        *,
+        maxsize: int,
+        ttl: float,
+        redis: "Redis | None" = None,
+    ) -> None:
+        self.name = name
+        self.model = model
+        self.ttl = ttl
+        self.redis = redis
+        self._local: LRUCache[tuple, M] = LRUCache(maxsize=maxsize, ttl=ttl)
+        self._inflight: dict[tuple, asyncio.Future[M]] = {}
+
+    def _redis_key(self, version: int, key: tuple) -> str:
+        digest = hashlib.sha256(repr(key).encode()).hexdigest()[:32]
+        return f"response:{self.name}:{version}:{digest}"
+
+    async def _read_shared(self, version: int, key: tuple) -> M | None:
+        if self.redis is None:
+            return None
+        try:
+            raw = await self.redis.get(self._redis_key(version, key))
+        except RedisError as exc:
+            logger.opt(exception=exc).warning("Response cache read failed ({})", self.name)
+            return None
+        return self.model.model_validate_json(raw) if raw is not None else None
+
+    async def _write_shared(self, version: int, key: tuple, value: M) -> None:
+        if self.redis is None:
+            return
+        try:
+            await self.redis.set(
+                self._redis_key(version, key), value.model_dump_json(), ex=int(self.ttl)
+            )
+        except RedisError as exc:
+            logger.opt(exception=exc).warning("Response cache write failed ({})", self.name)
+
+    async def get_or_compute(
+        self, key: tuple, version: int, compute: Callable[[], Awaitable[M]]
+    ) -> M:
+        """Return the cached response for (version, key), computing it at most once."""
+        entry_key = (version, key)
+        value = self._local.get(entry_key)
+        if value is not None:
+            response_cache_requests.labels(cache=self.name, outcome="hit").inc()
+            return value
+        inflight = self._inflight.get(entry_key)
+        if inflight is not None:
+            response_cache_requests.labels(cache=self.name, outcome="coalesced").inc()
+            try:
+                # shield — a waiter giving up must not cancel the shared computation
+                return await asyncio.shield(inflight)
+            except asyncio.CancelledError:
+                if not inflight.cancelled() or asyncio.current_task().cancelling():
+                    raise
+            # Only the leader was cancelled, not this waiter — start over, taking the lead
+            # unless another waiter already has
+            return await self.get_or_compute(key, version, compute)
+
+        future: asyncio.Future[M] = asyncio.get_running_loop().create_future()
+        self._inflight[entry_key] = future
+        try:
+            value = await self._read_shared(version, key)
+            if value is not None:
+                response_cache_requests.labels(cache=self.name, outcome="shared_hit").inc()
+            else:
+                response_cache_requests.labels(cache=self.name, outcome="miss").inc()
+                value = await compute()
+                await self._write_shared(version, key, value)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as exc:
+            future.set_exception(exc)
+            # Mark retrieved — nobody may be waiting on it
+            future.exception()
+            raise
+        finally:
+            del self._inflight[entry_key]
+
+        self._local.set(entry_key, value)
+        future.set_result(value)
+        return value
+
+    def clear(self) -> None:
+        self._local.clear()
+
+    def __len__(self) -> int:
+        return len(self._local)
+
+
+class EmbeddingCache:
+    """Query embeddings keyed by model, dimensions and the normalized query text.
+
+    An in-process LRU with TTL first, then — when `redis` is given — a copy shared by every
+    worker, stored as raw float32 bytes (6 KB for 1536 dims instead of ~30 KB of JSON).
+    `redis` must not decode responses.
+    """
+
+    def __init__(
+        self,
+        *,
+        model: str,
+        dimensions: int,
+        maxsize: int,
+        ttl: float,
+        redis: "Redis | None" = None,
+    ) -> None:
+        self.model = model
+        self.dimensions = dimensions
+        self.ttl = ttl
+        self.redis = redis
+        self._local: LRUCache[str, list[float]] = LRUCache(maxsize=maxsize, ttl=ttl)
+
+    def _redis_key(self, normalized: str) -> str:
+        digest = hashlib.sha256(normalized.encode()).hexdigest()[:32]
+        return f"embedding:{self.model}:{self.dimensions}:{digest}"
+
+    async def _lookup(self, normalized: str) -> tuple[list[float] | None, str]:
+        vector = self._local.get(normalized)
+        if vector is not None:
+            return vector, "hit"
+        if self.redis is None:
+            return None, "miss"
+        try:
+            raw = await self.redis.get(self._redis_key(normalized))
+        except RedisError as exc:
+            logger.opt(exception=exc).warning("Embedding cache read failed")
+            return None, "miss"
+        # A vector stored under other dimensions can't share the key, but a truncated
+        # write could — treat anything of the wrong size as absent
+        if raw is None or len(raw) != self.dimensions * 4:
+            return None, "miss"
+        vector = np.frombuffer(raw, dtype=np.float32).tolist()
+        self._local.set(normalized, vector)
+        return vector, "shared_hit"
+
+    async def _store(self, normalized: str, vector: list[float]) -> None:
+        self._local.set(normalized, vector)
+        if self.redis is None:
+            return
+        try:
+            await self.redis.set(
+                self._redis_key(normalized),
+                np.asarray(vector, dtype=np.float32).tobytes(),
+                ex=int(self.ttl),
+            )
+        except RedisError as exc:
+            logger.opt(exception=exc).warning("Embedding cache write failed")
+
+    async def get_or_compute(
+        self, text: str, compute: Callable[[str], Awaitable[list[float]]]
+    ) -> tuple[list[float], bool]:
+        """Return (vector, whether it was cached), embedding `text` on a miss.
+
+        `compute` gets `text` as written; the vector is cached under its normalized form,
+        so later spellings of the same query reuse it.
+        """
+        normalized = normalize_query(text)
+        vector, outcome = await self._lookup(normalized)
+        embedding_cache_requests.labels(outcome=outcome).inc()
+        if vector is not None:
+            return vector, True
+        vector = await compute(text)
+        await self._store(normalized, vector)
+        return vector, False
+
+    async def warm(
+        self, texts: list[str], compute: Callable[[list[str]], Awaitable[list[list[float]]]]
+    ) -> int:
+        """Embed every text not cached yet with one batched `compute`. Returns how many.
+
+        Of several spellings of one query, the first is the one embedded.
+        """
+        spellings: dict[str, str] = {}
+        for text in texts:
+            spellings.setdefault(normalize_query(text), text)
+        missing = {n: t for n, t in spellings.items() if (await self._lookup(n))[0] is None}
+        if not missing:
+            return 0
+        vectors = await compute(list(missing.values()))
+        for normalized, vector in zip(missing, vectors, strict=True):
+            await self._store(normalized, vector)
+        return len(missing)
+
+    def clear(self) -> None:
+        self._local.clear()
+
+    def __len__(self) -> int:
+        return len(self._local)
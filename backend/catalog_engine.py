@@ -0,0 +1,423 @@
+import asyncio
+import random
+from collections.abc import Iterable, Sequence
+from datetime import UTC, datetime, timedelta
+from decimal import Decimal
+from typing import Any
+
+import numpy as np
+from loguru import logger
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from backend.repositories.catalog import get_version
+from backend.repositories.products import (
+    PRICE_BUCKET_EDGES,
+    WINE_FAMILY,
+    fetch_catalog_rows,
+    fetch_name_order,
+    sort_spec,
+)
+from backend.suggest import SuggestIndex
+
+# Columns answered by distinct-value facets
+FACET_COLUMNS = ("category", "country", "region", "grape")
+
+# Incremental refreshes re-read rows slightly older than the newest one already held,
+# so a write committed late with an earlier timestamp isn't missed.
+_REFRESH_OVERLAP = timedelta(minutes=5)
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+
+
+def _micros(value: datetime) -> int:
+    return (value - _EPOCH) // timedelta(microseconds=1)
+
+
+class _Dimension:
+    """Dictionary-encoded string column. Codes follow sorted value order; -1 is NULL."""
+
+    def __init__(self, values: list[str | None]) -> None:
+        self.values: list[str] = sorted({v for v in values if v is not None})
+        self.lookup: dict[str, int] = {v: i for i, v in enumerate(self.values)}
+        self.codes = np.fromiter(
+            (self.lookup[v] if v is not None else -1 for v in values),
+            dtype=np.int32,
+            count=len(values),
+        )
+
+    def equals(self, value: str) -> np.ndarray:
+        code = self.lookup.get(value)
+        if code is None:
+            return np.zeros(len(self.codes), dtype=bool)
+        return self.codes == code
+
+    def isin(self, values: Iterable[str]) -> np.ndarray:
+        codes = [self.lookup[v] for v in values if v in self.lookup]
+        return np.isin(self.codes, codes)
+
+
+def _pack(mask: np.ndarray) -> np.ndarray:
+    """Pack a boolean row mask into uint64 words (bit i of the bitmap = ordinal i)."""
+    packed = np.packbits(mask, bitorder="little")
+    packed = np.pad(packed, (0, -len(packed) % 8))
+    return packed.view(np.uint64)
+
+
+class _Bitmaps:
+    """One packed bitmap per facet value over product ordinals.
+
+    Counting a facet under a filter is an AND with the filter's bitmap plus a popcount —
+    all values of a dimension in one vectorized pass.
+    """
+
+    def __init__(self, values: list[str], rows: Iterable[np.ndarray], n: int) -> None:
+        self.values = values
+        self.bits = np.zeros((len(values), (n + 63) // 64), dtype=np.uint64)
+        for i, row in enumerate(rows):
+            self.bits[i] = _pack(row)
+
+    @classmethod
+    def from_codes(cls, values: list[str], codes: np.ndarray) -> "_Bitmaps":
+        return cls(values, (codes == i for i in range(len(values))), len(codes))
+
+    def counts(self, mask_bits: np.ndarray) -> np.ndarray:
+        """Matching rows per value for a packed filter mask."""
+        return np.bitwise_count(self.bits & mask_bits).sum(axis=1, dtype=np.int64)
+
+
+class CatalogSnapshot:
+    """Columnar copy of the active catalog at one version — answers queries with NumPy masks.
+
+    Only filter/sort columns are held; pages come back as SKUs and are hydrated from
+    Postgres by primary key. All queries are synchronous.
+
+    Names sort by the database collation, so the name order comes from Postgres
+    (`name_order`, every SKU in `alpha` order). Without a complete one, name-sorted pages
+    return None and are answered from SQL.
+    """
+
+    def __init__(
+        self, rows: list[Any], version: int, *, name_order: Sequence[str] | None = None
+    ) -> None:
+        self.version = version
+        self.skus: list[str] = sorted(r.sku for r in rows)
+        by_sku = {r.sku: r for r in rows}
+        ordered = [by_sku[sku] for sku in self.skus]
+        n = len(ordered)
+        self._index: dict[str, int] = {sku: i for i, sku in enumerate(self.skus)}
+        # skus are sorted, so the ordinal doubles as the sku rank for tie-breaks
+        self._sku_rank = np.arange(n, dtype=np.int64)
+
+        self.dimensions: dict[str, _Dimension] = {
+            col: _Dimension([getattr(r, col) for r in ordered]) for col in FACET_COLUMNS
+        }
+        self._names = _Dimension([r.name for r in ordered])
+        self.price = np.array(
+            [float(r.price) if r.price is not None else np.nan for r in ordered], dtype=np.float64
+        )
+        # Tri-state: -1 unknown, 0 not online, 1 online
+        self.online = np.array(
+            [-1 if r.online_availability is None else int(r.online_availability) for r in ordered],
+            dtype=np.int8,
+        )
+        self.updated_at = np.array([_micros(r.updated_at) for r in ordered], dtype=np.int64)
+        self.is_wine = np.array([r.category_family == WINE_FAMILY for r in ordered], dtype=bool)
+
+        # Store list as an inverted index: store id → ordinals carrying it
+        carriers: dict[str, list[int]] = {}
+        for i, r in enumerate(ordered):
+            for store_id in r.store_availability or ():
+                carriers.setdefault(store_id, []).append(i)
+        self._stores = {k: np.array(v, dtype=np.int32) for k, v in carriers.items()}
+
+        # Facet bitmaps — one per value of every facet dimension
+        self._bitmaps: dict[str, _Bitmaps] = {
+            col: _Bitmaps.from_codes(dim.values, dim.codes) for col, dim in self.dimensions.items()
+        }
+        store_ids = sorted(self._stores)
+        self._bitmaps["store"] = _Bitmaps(
+            store_ids, (self._carried_by([store_id]) for store_id in store_ids), n
+        )
+        self._bitmaps["online"] = _Bitmaps(["online"], [self.online == 1], n)
+        edges = np.array([float(e) for e in PRICE_BUCKET_EDGES])
+        # NaN prices digitize past the last edge — mask them out as -1
+        buckets = np.where(np.isnan(self.price), 0, np.digitize(self.price, edges)) - 1
+        self._bitmaps["price_bucket"] = _Bitmaps.from_codes(
+            [str(e) for e in PRICE_BUCKET_EDGES], buckets
+        )
+
+        self._orders: dict[tuple[str, bool], tuple[np.ndarray, np.ndarray]] = {}
+        # Only usable when it covers exactly the rows held — a row written between the two
+        # reads would otherwise land out of place
+        self._name_order: np.ndarray | None = None
+        if name_order is not None and sorted(name_order) == self.skus:
+            self._name_order = np.array([self._index[sku] for sku in name_order], dtype=np.int64)
+        self.suggest_index = SuggestIndex(ordered)
+
+    def __len__(self) -> int:
+        return len(self.skus)
+
+    # ── Filtering ────────────────────────────────────────────────
+
+    def _carried_by(self, store_ids: Iterable[str]) -> np.ndarray:
+        carried = np.zeros(len(self.skus), dtype=bool)
+        for store_id in store_ids:
+            ordinals = self._stores.get(store_id)
+            if ordinals is not None:
+                carried[ordinals] = True
+        return carried
+
+    def mask(
+        self,
+        *,
+        category: list[str] | None = None,
+        country: str | None = None,
+        region: str | None = None,
+        min_price: Decimal | None = None,
+        max_price: Decimal | None = None,
+        available: bool | None = None,
+        in_stores: list[str] | None = None,
+        wine_scope: bool = False,
+    ) -> np.ndarray:
+        """Boolean row mask — same semantics as repositories.products._apply_filters."""
+        mask = np.ones(len(self.skus), dtype=bool)
+        if available is not None:
+            mask &= self.online == int(available)
+        if in_stores is not None:
+            mask &= self._carried_by(in_stores)
+        if category is not None:
+            mask &= self.dimensions["category"].isin(category)
+        elif wine_scope:
+            mask &= self.is_wine
+        if country is not None:
+            mask &= self.dimensions["country"].equals(country)
+        if region is not None:
+            mask &= self.dimensions["region"].equals(region)
+        # NaN comparisons are False — NULL prices drop out like they do in SQL
+        if min_price is not None:
+            mask &= self.price >= float(min_price)
+        if max_price is not None:
+            mask &= self.price <= float(max_price)
+        return mask
+
+    def count(self, **filters: Any) -> int:
+        return int(np.count_nonzero(self.mask(**filters)))
+
+    # ── Sorting & pagination ─────────────────────────────────────
+
+    def _sort_values(self, column: str) -> np.ndarray:
+        """Float sort key per numeric row, NaN for NULL."""
+        if column == "price":
+            return self.price
+        return self.updated_at.astype(np.float64)
+
+    def _order(self, sort: str | None) -> tuple[np.ndarray, np.ndarray] | None:
+        """(ordinals in sort order, position of each ordinal) — built once per sort.
+
+        None for a name sort without the collation order from Postgres.
+        """
+        spec = sort_spec(sort)
+        if spec not in self._orders:
+            column, descending = spec
+            if column == "name":
+                if self._name_order is None:
+                    return None
+                order = self._name_order[::-1] if descending else self._name_order
+            else:
+                values = self._sort_values(column)
+                null = np.isnan(values)
+                # Postgres puts NULLs last ascending and first descending
+                if descending:
+                    primary = np.where(null, -np.inf, -values)
+                    tie = -self._sku_rank
+                else:
+                    primary = np.where(null, np.inf, values)
+                    tie = self._sku_rank
+                order = np.lexsort((tie, primary))
+            position = np.empty_like(order)
+            position[order] = np.arange(len(order))
+            self._orders[spec] = (order, position)
+        return self._orders[spec]
+
+    def _matches_sort_value(self, ordinal: int, sort: str | None, value: Any) -> bool:
+        column, _ = sort_spec(sort)
+        if column == "price":
+            current = self.price[ordinal]
+            return np.isnan(current) if value is None else float(value) == current
+        if column == "updated_at":
+            return value is not None and _micros(value) == self.updated_at[ordinal]
+        code = self._names.codes[ordinal]
+        if value is None:
+            return code < 0
+        return code >= 0 and self._names.values[code] == value
+
+    def find_page(
+        self,
+        offset: int,
+        limit: int,
+        *,
+        sort: str | None = None,
+        after: tuple[Any, str] | None = None,
+        **filters: Any,
+    ) -> list[str] | None:
+        """Return the SKUs of one page, in sort order.
+
+        Returns None when a keyset cursor points at a row that has since changed or
+        disappeared, or for a name sort without the Postgres order — the caller should
+        answer that page from SQL instead.
+        """
+        ordered = self._order(sort)
+        if ordered is None:
+            return None
+        order, position = ordered
+        hits = order[self.mask(**filters)[order]]
+        if after is None:
+            return [self.skus[i] for i in hits[offset : offset + limit]]
+
+        value, sku = after
+        ordinal = self._index.get(sku)
+        if ordinal is None or not self._matches_sort_value(ordinal, sort, value):
+            return None
+        start = int(np.searchsorted(position[hits], position[ordinal], side="right"))
+        return [self.skus[i] for i in hits[start : start + limit]]
+
+    def random_sku(self, rng: random.Random | None = None, **filters: Any) -> str | None:
+        picks = self.random_skus(1, rng, **filters)
+        return picks[0] if picks else None
+
+    def random_skus(self, n: int, rng: random.Random | None = None, **filters: Any) -> list[str]:
+        """Up to `n` distinct SKUs drawn uniformly from the matches."""
+        ordinals = np.flatnonzero(self.mask(**filters))
+        picks = (rng or random).sample(range(len(ordinals)), min(n, len(ordinals)))
+        return [self.skus[ordinals[p]] for p in picks]
+
+    # ── Facets ───────────────────────────────────────────────────
+
+    def facet_counts(self, dimension: str, **filters: Any) -> list[tuple[str, int]]:
+        """(value, count) for every value with matches, in value order.
+
+        Dimensions: category, country, region, grape, store, online, price_bucket.
+        """
+        bitmaps = self._bitmaps[dimension]
+        counts = bitmaps.counts(_pack(self.mask(**filters)))
+        return [(bitmaps.values[i], int(counts[i])) for i in np.flatnonzero(counts)]
+
+    def distinct_values(self, column: str, **filters: Any) -> list[str]:
+        return [value for value, _ in self.facet_counts(column, **filters)]
+
+    def distinct_values_by_count(self, column: str, **filters: Any) -> list[tuple[str, int]]:
+        """Distinct values with counts, count descending then value ascending."""
+        return self.facets_by_count((column,), **filters)[column]
+
+    def facets_by_count(
+        self, dimensions: Iterable[str], **filters: Any
+    ) -> dict[str, list[tuple[str, int]]]:
+        """distinct_values_by_count for several dimensions — the filter mask is packed once."""
+        mask_bits = _pack(self.mask(**filters))
+        table: dict[str, list[tuple[str, int]]] = {}
+        for dimension in dimensions:
+            bitmaps = self._bitmaps[dimension]
+            counts = bitmaps.counts(mask_bits)
+            present = np.flatnonzero(counts)
+            # lexsort: last key is primary — value indexes already follow value order
+            ranked = present[np.lexsort((present, -counts[present]))]
+            table[dimension] = [(bitmaps.values[i], int(counts[i])) for i in ranked]
+        return table
+
+    def price_histogram(self, **filters: Any) -> list[tuple[Decimal, Decimal | None, int]]:
+        """(lower, upper, count) for every PRICE_BUCKET_EDGES bucket, empty ones included."""
+        counts = self._bitmaps["price_bucket"].counts(_pack(self.mask(**filters)))
+        uppers = [*PRICE_BUCKET_EDGES[1:], None]
+        return [
+            (lower, upper, int(c))
+            for lower, upper, c in zip(PRICE_BUCKET_EDGES, uppers, counts, strict=True)
+        ]
+
+    def price_range(self, **filters: Any) -> tuple[Decimal, Decimal] | None:
+        prices = self.price[self.mask(**filters)]
+        prices = prices[~np.isnan(prices)]
+        if not len(prices):
+            return None
+        return Decimal(f"{prices.min():.2f}"), Decimal(f"{prices.max():.2f}")
+
+
+class CatalogEngine:
+    """Holds the current snapshot and refreshes it in the background on version bumps.
+
+    While the snapshot lags the catalog version (or before the first load), get()
+    returns None and callers fall back to the SQL repositories.
+    """
+
+    def __init__(self) -> None:
+        self.snapshot: CatalogSnapshot | None = None
+        self._session_factory: async_sessionmaker[AsyncSession] | None = None
+        self._rows: dict[str, Any] = {}
+        self._refresh_task: asyncio.Task | None = None
+
+    @property
+    def started(self) -> bool:
+        return self._session_factory is not None
+
+    def start(self, session_factory: async_sessionmaker[AsyncSession]) -> None:
+        """Enable the engine and begin the initial load. Until it lands, callers use SQL."""
+        self._session_factory = session_factory
+        self._schedule_refresh()
+
+    async def stop(self) -> None:
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            await asyncio.gather(self._refresh_task, return_exceptions=True)
+        self._session_factory = None
+        self._refresh_task = None
+        self.snapshot = None
+        self._rows = {}
+
+    def get(self, version: int) -> CatalogSnapshot | None:
+        """Return the snapshot if it matches `version`, else kick off a refresh and return None."""
+        if self.snapshot is not None and self.snapshot.version == version:
+            return self.snapshot
+        if self.started:
+            self._schedule_refresh()
+        return None
+
+    def _schedule_refresh(self) -> None:
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self.refresh())
+
+    async def refresh(self) -> None:
+        """Pull rows changed since the last load and rebuild the snapshot."""
+        if self._session_factory is None:
+            return
+        since = None
+        if self._rows:
+            since = max(r.updated_at for r in self._rows.values()) - _REFRESH_OVERLAP
+        try:
+            async with self._session_factory() as db:
+                # Read the version first — the snapshot is never labelled newer than its data
+                version = await get_version(db)
+                changed = await fetch_catalog_rows(db, since=since)
+                name_order = await fetch_name_order(db)
+        except Exception as exc:
+            logger.opt(exception=exc).warning("Catalog engine refresh failed — serving from SQL")
+            return
+
+        for row in changed:
+            if row.delisted_at is None:
+                self._rows[row.sku] = row
+            else:
+                self._rows.pop(row.sku, None)
+        rows = list(self._rows.values())
+        # Building ~40k rows of columns takes tens of ms — keep it off the event loop
+        self.snapshot = await asyncio.to_thread(
+            CatalogSnapshot, rows, version, name_order=name_order
+        )
+        logger.info(
+            "Catalog engine loaded version {} ({} products, {} changed)",
+            version,
+            len(rows),
+            len(changed),
+        )
+
+
+# Module-level singleton — started in the app lifespan, cold (None) everywhere else.
+catalog_engine = CatalogEngine()
@@ -0,0 +1,51 @@
+import hashlib
+from datetime import UTC, datetime
+from email.utils import format_datetime, parsedate_to_datetime
+
+from fastapi import Request, Response, status
+
+
+def strong_etag(*parts: object) -> str:
+    """Quoted strong entity tag over the values that fully determine a representation."""
+    digest = hashlib.blake2b("\x1f".join(map(str, parts)).encode(), digest_size=12).hexdigest()
+    return f'"{digest}"'
+
+
+def validators(etag: str, last_modified: datetime | None, max_age: int) -> dict[str, str]:
+    """ETag, Last-Modified and Cache-Control headers for a conditional-GET response.
+
+    `private` — every route sits behind auth, so shared caches mustn't store the body;
+    browsers and the bot revalidate after `max_age` seconds.
+    """
+    headers = {"ETag": etag, "Cache-Control": f"private, max-age={max_age}, must-revalidate"}
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(last_modified.astimezone(UTC), usegmt=True)
+    return headers
+
+
+def is_not_modified(request: Request, etag: str, last_modified: datetime | None) -> bool:
+    """Evaluate If-None-Match, else If-Modified-Since, against the current validators.
+
+    If-None-Match wins when both are sent (RFC 9110 §13.2.2). Tags compare weakly, as
+    the RFC requires for GET, so a proxy that weakened our ETag still revalidates.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return "*" in tags or etag in tags
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is None or last_modified is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False  # unparseable dates are ignored, per the RFC
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=UTC)
+    # HTTP dates have whole-second precision
+    return last_modified.replace(microsecond=0) <= since
+
+
+def not_modified(headers: dict[str, str]) -> Response:
+    """Bodyless 304 carrying the same validators a 200 would have."""
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 SERVICE_NAME = "backend"
@@ -8,6 +10,7 @@ MAX_LIMIT = 100
 MAX_SEARCH_LENGTH = 200
 MAX_FILTER_LENGTH = 100
 MAX_SKU_LENGTH = 50
+MAX_CURSOR_LENGTH = 500
 MAX_USER_ID_LENGTH = 100
 MAX_ACK_BATCH_SIZE = 100
 
@@ -17,6 +20,20 @@ MAX_SAQ_STORE_ID_LENGTH = 20
 
 DEFAULT_RECOMMENDATION_LIMIT = 5
 
+DEFAULT_SUGGEST_LIMIT = 8
+MAX_SUGGEST_LIMIT = 20
+MIN_SUGGEST_PREFIX = 2
+
+MAX_BATCH_SKUS = 200
+
+# Cache-Control max-age (seconds) on conditional-GET endpoints — clients revalidate after
+FACETS_MAX_AGE = 60
+PRODUCT_MAX_AGE = 300
+NEARBY_MAX_AGE = 300
+
+DEFAULT_RANDOM_SAMPLE = 5
+MAX_RANDOM_SAMPLE = 20
+
 CONTEXT_WINDOW_TURNS = 5
 
 ROLE_USER = "user"
@@ -96,5 +113,81 @@ class BackendSettings(BaseSettings):
     FRONTEND_URL: str = ""
     BACKEND_URL: str = ""
 
+    # How GET /products computes `total`:
+    #   exact — count(*) OVER () window on the page query (one round trip, full scan)
+    #   cached — exact count memoized per filter set until the scraper bumps the catalog version
+    #   estimated — planner row estimate for unfiltered listings (wine scope at most); exact
+    #     when the estimate is small or any filter is set
+    PRODUCT_COUNT_STRATEGY: Literal["exact", "cached", "estimated"] = "cached"
+
+    # Keep a columnar copy of the active catalog in each worker (a few MB) and answer
+    # listing, facet and random queries from it. Falls back to SQL while it's loading.
+    CATALOG_ENGINE_ENABLED: bool = True
+
+    # Cache facets and first listing pages per catalog version — a scraper run invalidates them.
+    RESPONSE_CACHE_ENABLED: bool = True
+    # Also share cached responses across gunicorn workers through Redis (REDIS_URL).
+    RESPONSE_CACHE_REDIS: bool = False
+
+    # Cache query embeddings per normalized semantic query — a hit skips the OpenAI call.
+    EMBEDDING_CACHE_ENABLED: bool = True
+    # Also share them across workers through Redis (REDIS_URL), as float32 bytes.
+    EMBEDDING_CACHE_REDIS: bool = False
+    # At startup, pre-embed this many of the most frequent recent semantic queries (0 = off).
+    EMBEDDING_CACHE_WARM: int = 200
+
+    # Reuse parsed intents for repeated standalone queries (no conversation history).
+    INTENT_CACHE_ENABLED: bool = True
+
+    # While Haiku parses the intent, embed the raw query and retrieve under the default wine
+    # scope. Kept when the parsed semantic_query (and, for retrieval, the filters) match.
+    SPECULATIVE_PIPELINE: bool = False
+
+    # Latency budget for one recommendation or chat turn (seconds), spent by its stages in
+    # order. Each stage is also capped on its own; one that runs out degrades instead of
+    # failing — intent to the raw query, curation to no reasons, sommelier to its fallback
+    # message. Embedding has nothing to degrade to, so its timeout fails the request.
+    LATENCY_BUDGET: float = 12.0
+    INTENT_TIMEOUT: float = 3.0
+    EMBED_TIMEOUT: float = 2.0
+    CURATION_TIMEOUT: float = 8.0
+    SOMMELIER_TIMEOUT: float = 10.0
+    # Send a duplicate intent or embedding call once the first outlives the p95 of that
+    # stage's recent calls; the first answer wins and the other is cancelled.
+    HEDGE_REQUESTS: bool = False
+
+    # Queue recommendation log rows and bulk-insert them in the background, instead of one
+    # INSERT inside every request. log_id still comes back — ids are drawn from the sequence
+    # a batch at a time. A full queue drops rows (and returns no log_id) rather than block.
+    # Trade-off: a row is no longer committed with its request. A worker killed before its
+    # next flush (up to RECOMMENDATION_LOG_FLUSH_MS, or a queue's worth of rows) loses them,
+    # and a failed batch insert isn't retried — the log_ids already returned then name no
+    # row. Turn off where every recommendation must be logged.
+    RECOMMENDATION_LOG_WRITE_BEHIND: bool = True
+    RECOMMENDATION_LOG_BATCH_SIZE: int = 50
+    RECOMMENDATION_LOG_FLUSH_MS: int = 500
+    RECOMMENDATION_LOG_QUEUE_SIZE: int = 1000
+
+    # Where find_similar ranks by embedding:
+    #   pgvector — in Postgres, on the HNSW index
+    #   memory — a float32 copy of active embeddings in each worker (~6 KB per product),
+    #     refreshed on catalog version bumps; pgvector serves while it's loading
+    VECTOR_SEARCH_BACKEND: Literal["pgvector", "memory"] = "pgvector"
+
+    # HNSW vector search (pgvector): candidate list size per query — raised to the number of
+    # rows find_similar asks for when that's larger. Higher = better recall, slower.
+    HNSW_EF_SEARCH: int = 100
+    # Iterative scan cap: tuples visited before a selectively filtered search gives up.
+    HNSW_MAX_SCAN_TUPLES: int = 20_000
+
+    # Quantized pgvector search: rank on embedding_prefix (256-d, half precision, ~0.5 KB a
+    # row) first, then re-rank this many closest on the full embedding.
+    VECTOR_QUANTIZED_SEARCH: bool = False
+    VECTOR_RERANK_CANDIDATES: int = 300
+
+    # Weight of embedding cosine similarity in the diversity reranker's redundancy check,
+    # next to producer (1.5), grape (1.0), country (0.5)... 0 = attributes only.
+    RERANK_EMBEDDING_WEIGHT: float = 0.0
+
 
 backend_settings = BackendSettings()
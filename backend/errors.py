@@ -4,7 +4,13 @@ from fastapi.responses import JSONResponse
 from loguru import logger
 from sqlalchemy.exc import SQLAlchemyError
 
-from backend.exceptions import ConflictError, ForbiddenError, InvalidCredentialsError, NotFoundError
+from backend.exceptions import (
+    ConflictError,
+    ForbiddenError,
+    InvalidCredentialsError,
+    InvalidCursorError,
+    NotFoundError,
+)
 
 
 def register_exception_handlers(app: FastAPI) -> None:
@@ -44,6 +50,14 @@ def register_exception_handlers(app: FastAPI) -> None:
             content={"detail": str(exc)},
         )
 
+    @app.exception_handler(InvalidCursorError)
+    async def invalid_cursor_handler(request: Request, exc: InvalidCursorError) -> JSONResponse:
+        logger.warning("{} {} — {}", request.method, request.url.path, exc)
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={"detail": str(exc)},
+        )
+
     @app.exception_handler(SQLAlchemyError)
     async def db_error_handler(request: Request, exc: SQLAlchemyError) -> JSONResponse:
         logger.opt(exception=exc).error("{} {} — DB error", request.method, request.url.path)
@@ -22,3 +22,7 @@ class InvalidCredentialsError(Exception):
 
 class ForbiddenError(Exception):
     """Raised when an authenticated user is not allowed to perform an action."""
+
+
+class InvalidCursorError(Exception):
+    """Raised when a pagination cursor is malformed or was issued for another sort order."""
@@ -0,0 +1,151 @@
+import asyncio
+from collections import deque
+from datetime import UTC, datetime
+from typing import Any
+
+from loguru import logger
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from backend.config import backend_settings
+from backend.metrics import recommendation_log_writes
+from backend.repositories.recommendations import allocate_log_ids, insert_logs
+
+
+class RecommendationLogWriter:
+    """Write-behind buffer for RecommendationLog rows, bulk-inserted off the request path.
+
+    submit() hands out an id drawn ahead of time from the table's sequence (a block per
+    round trip, on the submitting request's own session), so clients still get a log_id
+    the row will carry. A background task inserts queued rows every
+    RECOMMENDATION_LOG_BATCH_SIZE rows or RECOMMENDATION_LOG_FLUSH_MS, whichever comes
+    first, and flushes the rest on stop().
+    Rows are lost only if the worker dies with them queued or their insert fails.
+    """
+
+    def __init__(self) -> None:
+        self._session_factory: async_sessionmaker[AsyncSession] | None = None
+        # None in the queue tells the worker to flush what it holds and exit
+        self._queue: asyncio.Queue[dict[str, Any] | None] | None = None
+        self._ids: deque[int] = deque()
+        self._id_lock: asyncio.Lock | None = None
+        self._flush_task: asyncio.Task | None = None
+
+    @property
+    def started(self) -> bool:
+        return self._session_factory is not None
+
+    def start(self, session_factory: async_sessionmaker[AsyncSession]) -> None:
+        """Begin buffering. Until then, callers write their log row inline."""
+        self._session_factory = session_factory
+        self._queue = asyncio.Queue(maxsize=backend_settings.RECOMMENDATION_LOG_QUEUE_SIZE)
+        self._id_lock = asyncio.Lock()
+        self._flush_task = asyncio.create_task(self._run(self._queue))
+
+    async def stop(self) -> None:
+        """Insert everything still queued, then stop.
+
+        The worker is asked to finish rather than cancelled, so an insert in flight
+        completes instead of being abandoned.
+        """
+        if self._flush_task is not None and self._queue is not None:
+            await self._queue.put(None)
+            await asyncio.gather(self._flush_task, return_exceptions=True)
+        if self._queue is not None:
+            # Rows submitted after the stop request
+            rest = [self._queue.get_nowait() for _ in range(self._queue.qsize())]
+            rest = [row for row in rest if row is not None]
+            if rest:
+                await self._flush(rest)
+        self._session_factory = None
+        self._queue = None
+        self._id_lock = None
+        self._flush_task = None
+        self._ids.clear()
+
+    async def submit(self, db: AsyncSession, **values: Any) -> int | None:
+        """Queue a row and return the id it will be inserted with — None if it was dropped.
+
+        When the id block runs out, the next one is drawn on `db`: nextval() ignores the
+        transaction, and borrowing a second pooled connection while every other request
+        waits on the lock could stall them all until the pool timeout.
+        """
+        if self._queue is None or self._id_lock is None:
+            return None
+        if self._queue.full():
+            recommendation_log_writes.labels(outcome="dropped").inc()
+            return None
+        try:
+            log_id = await self._next_id(db, self._id_lock)
+        except Exception as exc:
+            logger.opt(exception=exc).warning("Failed to allocate recommendation log ids")
+            recommendation_log_writes.labels(outcome="failed").inc()
+            return None
+        values.setdefault("created_at", datetime.now(UTC))
+        try:
+            self._queue.put_nowait({"id": log_id, **values})
+        except asyncio.QueueFull:
+            # Filled up while the id was being drawn — the id is skipped, as after a rollback
+            recommendation_log_writes.labels(outcome="dropped").inc()
+            return None
+        return log_id
+
+    async def _next_id(self, db: AsyncSession, lock: asyncio.Lock) -> int:
+        async with lock:
+            if not self._ids:
+                self._ids.extend(
+                    await allocate_log_ids(db, backend_settings.RECOMMENDATION_LOG_BATCH_SIZE)
+                )
+            return self._ids.popleft()
+
+    async def _run(self, queue: asyncio.Queue[dict[str, Any] | None]) -> None:
+        loop = asyncio.get_running_loop()
+        batch: list[dict[str, Any]] = []
+        stopping = False
+        try:
+            while not stopping:
+                row = await queue.get()
+                if row is None:
+                    return
+                batch.append(row)
+                deadline = loop.time() + backend_settings.RECOMMENDATION_LOG_FLUSH_MS / 1000
+                while len(batch) < backend_settings.RECOMMENDATION_LOG_BATCH_SIZE:
+                    try:
+                        async with asyncio.timeout_at(deadline):
+                            row = await queue.get()
+                    except TimeoutError:
+                        break
+                    if row is None:
+                        stopping = True
+                        break
+                    batch.append(row)
+                # Hand the rows over first — cancelled mid-insert, they must not be retried
+                flushing, batch = batch, []
+                await self._flush(flushing)
+        except asyncio.CancelledError:
+            # Only on teardown without stop() — insert what was collected
+            if batch:
+                await self._flush(batch)
+            raise
+
+    async def _flush(self, batch: list[dict[str, Any]]) -> None:
+        if self._session_factory is None:
+            return
+        try:
+            async with self._session_factory() as db:
+                await insert_logs(db, batch)
+                await db.commit()
+        except asyncio.CancelledError:
+            # Abandoned mid-insert — the rows may not have landed
+            recommendation_log_writes.labels(outcome="failed").inc(len(batch))
+            raise
+        except Exception as exc:
+            logger.opt(exception=exc).warning(
+                "Failed to write {} recommendation log rows", len(batch)
+            )
+            recommendation_log_writes.labels(outcome="failed").inc(len(batch))
+            return
+        recommendation_log_writes.labels(outcome="written").inc(len(batch))
+
+
+# Module-level singleton — started in the app lifespan when RECOMMENDATION_LOG_WRITE_BEHIND.
+log_writer = RecommendationLogWriter()
@@ -38,6 +38,26 @@ recommendation_pipeline_errors = Counter(
     "Unhandled errors in the recommendation pipeline",
 )
 
+stage_timeouts = Counter(
+    "coupette_stage_timeouts_total",
+    "LLM and embedding calls cut off by their latency budget, by stage",
+    ["stage"],
+)
+
+hedged_requests = Counter(
+    "coupette_hedged_requests_total",
+    "Duplicate calls sent after the first outlived its stage's recent p95 (fired), "
+    "and how many of them answered first (won)",
+    ["stage", "outcome"],
+)
+
+recommendation_log_writes = Counter(
+    "coupette_recommendation_log_writes_total",
+    "Write-behind recommendation log rows by outcome (written, dropped when the queue is "
+    "full, failed)",
+    ["outcome"],
+)
+
 # --- Intent routing ---
 
 intent_classifications = Counter(
@@ -46,6 +66,12 @@ intent_classifications = Counter(
     ["intent_type"],
 )
 
+intent_cache_requests = Counter(
+    "coupette_intent_cache_requests_total",
+    "Intent parse cache lookups by outcome (hit, miss) and resulting intent type",
+    ["outcome", "intent_type"],
+)
+
 # --- LLM API calls (all services) ---
 
 llm_tokens = Counter(
@@ -66,3 +92,19 @@ llm_errors = Counter(
     "Claude API failures by service",
     ["service"],
 )
+
+# --- Response cache ---
+
+response_cache_requests = Counter(
+    "coupette_response_cache_requests_total",
+    "Response cache lookups by cache and outcome (hit, shared_hit, coalesced, miss)",
+    ["cache", "outcome"],
+)
+
+# --- Query embedding cache ---
+
+embedding_cache_requests = Counter(
+    "coupette_embedding_cache_requests_total",
+    "Query embedding cache lookups by outcome (hit, shared_hit, miss)",
+    ["outcome"],
+)
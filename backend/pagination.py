@@ -0,0 +1,27 @@
+import base64
+import binascii
+import json
+
+from backend.exceptions import InvalidCursorError
+
+
+def encode_cursor(*values: str | None) -> str:
+    """Pack keyset values into an opaque, URL-safe cursor token."""
+    raw = json.dumps(values, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(token: str, size: int) -> list[str | None]:
+    """Unpack a cursor token. Raises InvalidCursorError if it doesn't hold `size` values."""
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        values = json.loads(raw)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as exc:
+        raise InvalidCursorError("Malformed pagination cursor") from exc
+    if (
+        not isinstance(values, list)
+        or len(values) != size
+        or not all(v is None or isinstance(v, str) for v in values)
+    ):
+        raise InvalidCursorError("Malformed pagination cursor")
+    return values
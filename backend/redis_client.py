@@ -14,6 +14,8 @@ _STATE_KEY = "oauth:state:{}"
 # Module-level singleton — mirrors db.py's engine pattern.
 # Created once at import, shared across all requests via get_redis().
 redis_client: Redis = Redis.from_url(backend_settings.REDIS_URL, decode_responses=True)
+# Same server, raw bytes in and out — for binary values such as float32 embeddings.
+redis_bytes_client: Redis = Redis.from_url(backend_settings.REDIS_URL)
 
 
 async def get_redis() -> Redis:
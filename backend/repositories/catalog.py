@@ -0,0 +1,11 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.db.models import CatalogState
+
+
+async def get_version(db: AsyncSession) -> int:
+    """Return the catalog version stamp — bumped by the scraper after every write run."""
+    stmt = select(CatalogState.version).where(CatalogState.id == 1)
+    result = await db.execute(stmt)
+    return result.scalar_one_or_none() or 0
@@ -1,26 +1,155 @@
+import json
+import random
+from collections.abc import Callable, Sequence
+from datetime import datetime
 from decimal import Decimal
+from typing import Any, NamedTuple
 
-from sqlalchemy import Column, Select, cast, func, or_, select
-from sqlalchemy.dialects.postgresql import ARRAY, array
+from sqlalchemy import (
+    Column,
+    ColumnElement,
+    Numeric,
+    Select,
+    String,
+    and_,
+    any_,
+    func,
+    literal,
+    or_,
+    select,
+    tuple_,
+)
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.dialects.postgresql.asyncpg import dialect as asyncpg_dialect
+from sqlalchemy.engine import Row
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.types import Text
+from sqlalchemy.orm import Bundle
 
-from core.categories import expand_family
-from core.db.models import Product
+from backend.schemas.product import ProductOut
+from core.db.models import Product, StoreInventory
+from core.db.search import search_query
 
-# Prefixes for wine scope — resolved once from core taxonomy
-_WINE_PREFIXES: list[str] = expand_family("vins", None)
+# Wine scope — one equality on the indexed family column instead of a prefix OR-chain
+WINE_FAMILY = "vins"
 
-_SORT_ORDERS = {
-    "recent": Product.updated_at.desc(),
-    "price_asc": Product.price.asc(),
-    "price_desc": Product.price.desc(),
-    "alpha": Product.name.asc(),
+# Price facet buckets — lower edges in CAD; the last bucket is open-ended
+PRICE_BUCKET_EDGES: tuple[Decimal, ...] = tuple(
+    Decimal(e) for e in (0, 15, 20, 25, 30, 40, 50, 75, 100, 200)
+)
+
+
+class ColumnRow(Bundle):
+    """Plain columns fetched as one named tuple — no ORM entity, identity map or tracking.
+
+    The first column must be a key: when it's NULL (the outer-joined side of a row
+    with no match) the whole bundle comes back as None, like an entity would.
+    """
+
+    def create_row_processor(
+        self, query: Select, procs: Sequence[Callable[[Row], Any]], labels: Sequence[str]
+    ) -> Callable[[Row], Row | None]:
+        make_row = super().create_row_processor(query, procs, labels)
+
+        def proc(row: Row) -> Row | None:
+            bundled = make_row(row)
+            return None if bundled[0] is None else bundled
+
+        return proc
+
+
+def product_row(*extra: str) -> ColumnRow:
+    """The ProductOut columns (sku first) plus `extra` ones — what read paths select."""
+    return ColumnRow("product", *(getattr(Product, f) for f in (*ProductOut.model_fields, *extra)))
+
+
+class _SortKey(NamedTuple):
+    column: Column
+    descending: bool
+
+
+# Every sort is tie-broken by sku so keyset cursors are unambiguous.
+# Backed by the partial (column, sku) indexes on active products — DESC sorts scan backwards.
+_SORT_KEYS: dict[str, _SortKey] = {
+    "recent": _SortKey(Product.updated_at, descending=True),
+    "price_asc": _SortKey(Product.price, descending=False),
+    "price_desc": _SortKey(Product.price, descending=True),
+    "alpha": _SortKey(Product.name, descending=False),
 }
+_DEFAULT_SORT = "alpha"
+
+# Ranks text-search matches; without a query it falls back to the default sort.
+# Offset-paginated only — the rank isn't a stored column a cursor could seek on.
+RELEVANCE_SORT = "relevance"
+
+
+def _sort_key(sort: str | None) -> _SortKey:
+    return _SORT_KEYS.get(sort or _DEFAULT_SORT, _SORT_KEYS[_DEFAULT_SORT])
+
+
+def _order_by(key: _SortKey) -> tuple[ColumnElement, ColumnElement]:
+    if key.descending:
+        return key.column.desc(), Product.sku.desc()
+    return key.column.asc(), Product.sku.asc()
+
+
+def _ordering(sort: str | None, q: str | None) -> tuple[ColumnElement, ...]:
+    if sort == RELEVANCE_SORT and q is not None:
+        rank = func.ts_rank_cd(Product.search_vector, search_query(q))
+        return rank.desc(), Product.sku.asc()
+    return _order_by(_sort_key(sort))
+
 
+def sort_spec(sort: str | None) -> tuple[str, bool]:
+    """Return (column name, descending) for a listing sort — shared with the catalog engine."""
+    key = _sort_key(sort)
+    return key.column.key, key.descending
 
-def _apply_filters(
-    stmt: Select,
+
+def sort_value(product: Row, sort: str | None) -> str | None:
+    """Serialize a product row's sort key for a keyset cursor (JSON-safe string or None)."""
+    value = getattr(product, _sort_key(sort).column.key)
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+def parse_sort_value(sort: str | None, raw: str | None) -> Any:
+    """Inverse of sort_value — raises ValueError (or ArithmeticError) on malformed input."""
+    if raw is None:
+        return None
+    python_type = _sort_key(sort).column.type.python_type
+    if python_type is datetime:
+        return datetime.fromisoformat(raw)
+    if python_type is Decimal:
+        return Decimal(raw)
+    return str(raw)
+
+
+def _keyset_segments(key: _SortKey, after: tuple[Any, str]) -> list[ColumnElement]:
+    """Predicates for the rows following `after`, in sort order.
+
+    Postgres sorts NULLs last in ASC and first in DESC. Splitting the remainder into a
+    non-NULL range and a NULL run keeps each segment a plain index range scan — a single
+    OR-ed predicate would fall back to a bitmap scan plus sort.
+    """
+    col = key.column
+    value, sku = after
+    nullable = col.expression.nullable
+    if key.descending:
+        if value is None:
+            return [and_(col.is_(None), Product.sku < sku), col.isnot(None)]
+        return [tuple_(col, Product.sku) < tuple_(value, sku)]
+    if value is None:
+        return [and_(col.is_(None), Product.sku > sku)]
+    segments = [tuple_(col, Product.sku) > tuple_(value, sku)]
+    if nullable:
+        segments.append(col.is_(None))
+    return segments
+
+
+def _filter_clauses(
     *,
     q: str | None = None,
     category: list[str] | None = None,
@@ -31,31 +160,43 @@ def _apply_filters(
     available: bool | None = None,
     in_stores: list[str] | None = None,
     wine_scope: bool = False,
-) -> Select:
-    """Append WHERE clauses for each non-None filter."""
+) -> list[ColumnElement[bool]]:
+    """One predicate per non-None filter, plus the active-products one."""
     # Always exclude delisted products (page gone from SAQ sitemap)
-    stmt = stmt.where(Product.delisted_at.is_(None))
+    clauses: list[ColumnElement[bool]] = [Product.delisted_at.is_(None)]
     if available is not None:
-        stmt = stmt.where(Product.online_availability == available)
+        clauses.append(Product.online_availability == available)
     if in_stores is not None:
-        # JSONB ?| text[] — "does the array contain any of these values?"
-        # Uses the existing GIN index on store_availability
-        stmt = stmt.where(Product.store_availability.op("?|")(cast(array(in_stores), ARRAY(Text))))
+        # Semi-join on the normalized inventory — a primary-key range scan per store
+        carried = select(StoreInventory.sku).where(StoreInventory.saq_store_id.in_(in_stores))
+        clauses.append(Product.sku.in_(carried))
     if q is not None:
-        stmt = stmt.where(Product.name.ilike(f"%{q}%"))
+        # Full-text over the weighted French document, plus name substring for partial words —
+        # both sides are GIN-indexed, so the OR plans as a BitmapOr
+        clauses.append(
+            or_(
+                Product.search_vector.op("@@")(search_query(q)),
+                Product.name.ilike(f"%{q}%"),
+            )
+        )
     if category is not None:
-        stmt = stmt.where(Product.category.in_(category))
+        clauses.append(Product.category.in_(category))
     elif wine_scope:
-        stmt = stmt.where(or_(*(Product.category.startswith(prefix) for prefix in _WINE_PREFIXES)))
+        clauses.append(Product.category_family == WINE_FAMILY)
     if country is not None:
-        stmt = stmt.where(Product.country == country)
+        clauses.append(Product.country == country)
     if region is not None:
-        stmt = stmt.where(Product.region == region)
+        clauses.append(Product.region == region)
     if min_price is not None:
-        stmt = stmt.where(Product.price >= min_price)
+        clauses.append(Product.price >= min_price)
     if max_price is not None:
-        stmt = stmt.where(Product.price <= max_price)
-    return stmt
+        clauses.append(Product.price <= max_price)
+    return clauses
+
+
+def _apply_filters(stmt: Select, **filters: Any) -> Select:
+    """Append WHERE clauses for each non-None filter."""
+    return stmt.where(*_filter_clauses(**filters))
 
 
 async def count(
@@ -89,6 +230,45 @@ async def count(
     return result.scalar_one()
 
 
+async def estimate_count(
+    db: AsyncSession,
+    *,
+    q: str | None = None,
+    category: list[str] | None = None,
+    country: str | None = None,
+    region: str | None = None,
+    min_price: Decimal | None = None,
+    max_price: Decimal | None = None,
+    available: bool | None = None,
+    in_stores: list[str] | None = None,
+    wine_scope: bool = False,
+) -> int:
+    """Return the planner's row estimate for the given filters — no table scan.
+
+    Accuracy depends on ANALYZE statistics; ILIKE and JSONB predicates estimate poorly.
+    """
+    stmt = _apply_filters(
+        select(Product.sku),
+        q=q,
+        category=category,
+        country=country,
+        region=region,
+        min_price=min_price,
+        max_price=max_price,
+        available=available,
+        in_stores=in_stores,
+        wine_scope=wine_scope,
+    )
+    # EXPLAIN can't take bind parameters — inline them (values are quoted by the compiler)
+    sql = str(stmt.compile(dialect=asyncpg_dialect(), compile_kwargs={"literal_binds": True}))
+    conn = await db.connection()
+    result = await conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {sql}")
+    plan = result.scalar_one()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
 async def find_by_sku(db: AsyncSession, sku: str) -> Product | None:
     """Return a single non-delisted product by SKU, or None if not found."""
     stmt = select(Product).where(Product.sku == sku).where(Product.delisted_at.is_(None))
@@ -96,12 +276,91 @@ async def find_by_sku(db: AsyncSession, sku: str) -> Product | None:
     return result.scalar_one_or_none()
 
 
+async def find_updated_at(db: AsyncSession, sku: str) -> datetime | None:
+    """Return updated_at of a non-delisted product, or None if not found."""
+    stmt = select(Product.updated_at).where(Product.sku == sku).where(Product.delisted_at.is_(None))
+    result = await db.execute(stmt)
+    return result.scalar_one_or_none()
+
+
+def _sku_any(skus: list[str]) -> ColumnElement[bool]:
+    """sku = ANY(:skus) — one array parameter however many SKUs, so one cached plan."""
+    return Product.sku == any_(literal(skus, ARRAY(String)))
+
+
+async def find_by_skus(db: AsyncSession, skus: list[str]) -> list[Row]:
+    """Return product rows for the given non-delisted SKUs, in the order requested.
+
+    SKUs that don't exist (or were delisted) are skipped.
+    """
+    if not skus:
+        return []
+    stmt = select(product_row()).where(_sku_any(skus)).where(Product.delisted_at.is_(None))
+    result = await db.execute(stmt)
+    by_sku = {p.sku: p for p in result.scalars().all()}
+    return [by_sku[sku] for sku in skus if sku in by_sku]
+
+
+async def find_any_by_skus(db: AsyncSession, skus: list[str]) -> dict[str, Row]:
+    """Return {sku: product row} for the given SKUs, delisted ones included."""
+    if not skus:
+        return {}
+    result = await db.execute(select(product_row("delisted_at")).where(_sku_any(skus)))
+    return {p.sku: p for p in result.scalars().all()}
+
+
+async def fetch_catalog_rows(db: AsyncSession, since: datetime | None = None) -> list[Any]:
+    """Return the filter/sort/suggest columns the in-memory catalog engine indexes.
+
+    Without `since`, every active product. With `since`, every product updated at or
+    after it — delisted ones included so the engine can drop them.
+    """
+    stmt = select(
+        Product.sku,
+        Product.name,
+        Product.category,
+        Product.category_family,
+        Product.country,
+        Product.region,
+        Product.grape,
+        Product.producer,
+        Product.appellation,
+        Product.price,
+        Product.online_availability,
+        Product.store_availability,
+        Product.updated_at,
+        Product.delisted_at,
+    )
+    if since is None:
+        stmt = stmt.where(Product.delisted_at.is_(None))
+    else:
+        stmt = stmt.where(Product.updated_at >= since)
+    result = await db.execute(stmt)
+    return list(result.all())
+
+
+async def fetch_name_order(db: AsyncSession) -> list[str]:
+    """SKUs of every active product in `alpha` listing order, as Postgres sorts them.
+
+    Names sort by the database collation, which Python can't reproduce — the catalog
+    engine takes this order as given so its pages and cursors agree with find_page.
+    """
+    stmt = (
+        select(Product.sku)
+        .where(Product.delisted_at.is_(None))
+        .order_by(*_order_by(_SORT_KEYS["alpha"]))
+    )
+    result = await db.execute(stmt)
+    return list(result.scalars().all())
+
+
 async def find_page(
     db: AsyncSession,
     offset: int,
     limit: int,
     *,
     sort: str | None = None,
+    after: tuple[Any, str] | None = None,
     q: str | None = None,
     category: list[str] | None = None,
     country: str | None = None,
@@ -111,10 +370,13 @@ async def find_page(
     available: bool | None = None,
     in_stores: list[str] | None = None,
     wine_scope: bool = False,
-) -> list[Product]:
-    """Return a page of products with optional filters and sorting."""
-    order = _SORT_ORDERS.get(sort, Product.name)
-    stmt = select(Product).order_by(order).offset(offset).limit(limit)
+) -> list[Row]:
+    """Return a page of product rows with optional filters and sorting.
+
+    With `after` (sort value, sku of the previous page's last row), seeks past that row
+    instead of skipping `offset` rows — cost stays flat however deep the page is.
+    """
+    stmt = select(product_row()).order_by(*_ordering(sort, q))
     stmt = _apply_filters(
         stmt,
         q=q,
@@ -127,51 +389,117 @@ async def find_page(
         in_stores=in_stores,
         wine_scope=wine_scope,
     )
-    result = await db.execute(stmt)
-    return list(result.scalars().all())
+    if after is None:
+        result = await db.execute(stmt.offset(offset).limit(limit))
+        return list(result.scalars().all())
 
+    rows: list[Row] = []
+    for predicate in _keyset_segments(_sort_key(sort), after):
+        result = await db.execute(stmt.where(predicate).limit(limit - len(rows)))
+        rows.extend(result.scalars().all())
+        if len(rows) >= limit:
+            break
+    return rows
 
-async def get_distinct_values(
+
+async def find_page_with_total(
     db: AsyncSession,
-    column: Column,
+    offset: int,
+    limit: int,
     *,
+    sort: str | None = None,
+    q: str | None = None,
     category: list[str] | None = None,
+    country: str | None = None,
+    region: str | None = None,
+    min_price: Decimal | None = None,
+    max_price: Decimal | None = None,
     available: bool | None = None,
     in_stores: list[str] | None = None,
     wine_scope: bool = False,
-) -> list[str]:
-    """Return sorted distinct non-null values for a product column (active products only)."""
-    stmt = select(column).where(column.isnot(None))
+) -> tuple[list[Row], int | None]:
+    """Return an offset page of product rows plus the exact filtered total in a single round trip.
+
+    count(*) OVER () is evaluated before LIMIT/OFFSET, so every row carries the full
+    total. Total is None when the page is empty (offset past the end) — the caller
+    has to count separately in that case.
+    """
+    total_col = func.count().over().label("total")
+    stmt = select(product_row(), total_col).order_by(*_ordering(sort, q))
     stmt = _apply_filters(
-        stmt, category=category, available=available, in_stores=in_stores, wine_scope=wine_scope
+        stmt,
+        q=q,
+        category=category,
+        country=country,
+        region=region,
+        min_price=min_price,
+        max_price=max_price,
+        available=available,
+        in_stores=in_stores,
+        wine_scope=wine_scope,
     )
-    stmt = stmt.distinct().order_by(column)
-    result = await db.execute(stmt)
-    return list(result.scalars().all())
+    result = await db.execute(stmt.offset(offset).limit(limit))
+    rows = result.all()
+    if not rows:
+        return [], None
+    return [row[0] for row in rows], rows[0][1]
 
 
-async def get_distinct_values_by_count(
+def _random_run(
+    limit: int,
+    *,
+    at_least: float | None = None,
+    below: float | None = None,
+    **filters: Any,
+) -> Select:
+    """Product rows in random_key order from a threshold — an index seek, not a full sort."""
+    stmt = select(product_row()).order_by(Product.random_key).limit(limit)
+    if at_least is not None:
+        stmt = stmt.where(Product.random_key >= at_least)
+    if below is not None:
+        stmt = stmt.where(Product.random_key < below)
+    return _apply_filters(stmt, **filters)
+
+
+async def find_random(
     db: AsyncSession,
-    column: Column,
     *,
     category: list[str] | None = None,
+    country: str | None = None,
+    region: str | None = None,
+    min_price: Decimal | None = None,
+    max_price: Decimal | None = None,
     available: bool | None = None,
     in_stores: list[str] | None = None,
     wine_scope: bool = False,
-) -> list[tuple[str, int]]:
-    """Return distinct non-null values with counts, sorted by count descending."""
-    cnt = func.count().label("cnt")
-    stmt = select(column, cnt).where(column.isnot(None))
-    stmt = _apply_filters(
-        stmt, category=category, available=available, in_stores=in_stores, wine_scope=wine_scope
+) -> Row | None:
+    """Return a single random product row matching the given filters, or None.
+
+    Seeks to the first random_key at or above a uniform threshold, wrapping around to
+    the lowest key when the threshold lands past the last match.
+    """
+    filters = dict(
+        category=category,
+        country=country,
+        region=region,
+        min_price=min_price,
+        max_price=max_price,
+        available=available,
+        in_stores=in_stores,
+        wine_scope=wine_scope,
     )
-    stmt = stmt.group_by(column).order_by(cnt.desc(), column)
-    result = await db.execute(stmt)
-    return [(row[0], row[1]) for row in result.all()]
+    threshold = random.random()  # noqa: S311
+    for at_least in (threshold, None):
+        result = await db.execute(_random_run(1, at_least=at_least, **filters))
+        product = result.scalar_one_or_none()
+        if product is not None:
+            return product
+    return None
 
 
-async def find_random(
+async def find_random_sample(
     db: AsyncSession,
+    n: int,
     *,
     category: list[str] | None = None,
     country: str | None = None,
@@ -181,11 +509,14 @@ async def find_random(
     available: bool | None = None,
     in_stores: list[str] | None = None,
     wine_scope: bool = False,
-) -> Product | None:
-    """Return a single random product matching the given filters, or None."""
-    stmt = select(Product).order_by(func.random()).limit(1)
-    stmt = _apply_filters(
-        stmt,
+) -> list[Row]:
+    """Return up to `n` distinct random product rows matching the given filters.
+
+    One run of consecutive random_key values from a uniform threshold, wrapping around.
+    Each pick is uniform, but picks that are neighbours in the shuffle order tend to come
+    back together — the in-memory catalog samples independently when it's warm.
+    """
+    filters = dict(
         category=category,
         country=country,
         region=region,
@@ -195,25 +526,135 @@ async def find_random(
         in_stores=in_stores,
         wine_scope=wine_scope,
     )
-    result = await db.execute(stmt)
-    return result.scalar_one_or_none()
+    threshold = random.random()  # noqa: S311
+    result = await db.execute(_random_run(n, at_least=threshold, **filters))
+    products = list(result.scalars().all())
+    if len(products) < n:
+        result = await db.execute(_random_run(n - len(products), below=threshold, **filters))
+        products.extend(result.scalars().all())
+    return products
+
+
+# Dimensions counted by get_facet_rows, in GROUPING() argument order
+_FACET_DIMENSIONS = ("category", "country", "region", "grape", "price_bucket")
+
 
+class FacetRows(NamedTuple):
+    """Every SQL facet dimension as (value, count) rows, count descending."""
 
-async def get_price_range(
+    categories: list[tuple[str, int]]
+    countries: list[tuple[str, int]]
+    regions: list[tuple[str, int]]
+    grapes: list[tuple[str, int]]
+    price_range: tuple[Decimal, Decimal] | None
+    # (lower, upper, count) for every PRICE_BUCKET_EDGES bucket, empty ones included
+    price_histogram: list[tuple[Decimal, Decimal | None, int]]
+    # Store and online counts ignore their own filter — "how many if I pick it"
+    stores: list[tuple[str, int]]
+    online_count: int
+
+
+def _by_count(rows: list[tuple[str, int]]) -> list[tuple[str, int]]:
+    return sorted(rows, key=lambda r: (-r[1], r[0]))
+
+
+async def get_facet_rows(
     db: AsyncSession,
     *,
     category: list[str] | None = None,
     available: bool | None = None,
     in_stores: list[str] | None = None,
     wine_scope: bool = False,
-) -> tuple[Decimal, Decimal] | None:
-    """Return (min, max) price for active products, or None if no prices exist."""
-    stmt = select(func.min(Product.price), func.max(Product.price)).where(Product.price.isnot(None))
-    stmt = _apply_filters(
-        stmt, category=category, available=available, in_stores=in_stores, wine_scope=wine_scope
+) -> FacetRows:
+    """Count every facet dimension over one filtered CTE, plus store counts.
+
+    Categories ignore the category and availability filters — the chip list shows all of
+    them — and the online count ignores `available`, so the CTE flags each row with every
+    scope and each aggregate FILTERs on the one it needs. GROUPING SETS yields one group
+    per value of each dimension and one for the whole CTE, and GROUPING() says which
+    dimension a group belongs to. Stores are counted by a second statement over
+    store_inventory: joined into the CTE, it would repeat each product once per store.
+    """
+    all_categories = and_(*_filter_clauses(wine_scope=wine_scope))
+    scoped = and_(
+        *_filter_clauses(
+            category=category, available=available, in_stores=in_stores, wine_scope=wine_scope
+        )
+    )
+    online_scope = and_(
+        *_filter_clauses(category=category, in_stores=in_stores, wine_scope=wine_scope)
+    )
+    edges = literal(list(PRICE_BUCKET_EDGES), ARRAY(Numeric))
+    base = (
+        select(
+            Product.category,
+            Product.country,
+            Product.region,
+            Product.grape,
+            Product.price,
+            # 1-based bucket index; 0 below the first edge, NULL without a price
+            func.width_bucket(Product.price, edges).label("price_bucket"),
+            Product.online_availability,
+            all_categories.label("all_categories"),
+            scoped.label("scoped"),
+            online_scope.label("online_scope"),
+        )
+        .where(or_(all_categories, scoped, online_scope))
+        .cte("facet_base")
     )
+    dims = [base.c[d] for d in _FACET_DIMENSIONS]
+    stmt = select(
+        func.grouping(*dims),
+        *dims,
+        func.count().filter(base.c.all_categories),
+        func.count().filter(base.c.scoped),
+        func.min(base.c.price).filter(base.c.scoped),
+        func.max(base.c.price).filter(base.c.scoped),
+        func.count().filter(base.c.online_scope, base.c.online_availability.is_(True)),
+    ).group_by(func.grouping_sets(*(tuple_(d) for d in dims), tuple_()))
     result = await db.execute(stmt)
-    row = result.one()
-    if row[0] is None:
-        return None
-    return (row[0], row[1])
+
+    # GROUPING() sets the bit of every argument left out of the group, first one highest
+    n = len(dims)
+    whole = (1 << n) - 1
+    dimension_of = {whole ^ (1 << (n - 1 - i)): i for i in range(n)}
+    values: dict[str, list[tuple[Any, int]]] = {d: [] for d in _FACET_DIMENSIONS}
+    low: Decimal | None = None
+    high: Decimal | None = None
+    online_count = 0
+    for grouping, *keys, n_all, n_scoped, min_price, max_price, n_online in result.all():
+        if grouping == whole:
+            online_count = n_online
+            continue
+        i = dimension_of[grouping]
+        dim, value = _FACET_DIMENSIONS[i], keys[i]
+        cnt = n_all if dim == "category" else n_scoped
+        if value is not None and cnt:
+            values[dim].append((value, cnt))
+        if dim == "price_bucket" and min_price is not None:
+            low = min_price if low is None else min(low, min_price)
+            high = max_price if high is None else max(high, max_price)
+
+    stores_stmt = (
+        select(StoreInventory.saq_store_id, func.count())
+        .join(Product, Product.sku == StoreInventory.sku)
+        .where(*_filter_clauses(category=category, available=available, wine_scope=wine_scope))
+        .group_by(StoreInventory.saq_store_id)
+    )
+    stores = (await db.execute(stores_stmt)).all()
+
+    bucket_counts = dict(values["price_bucket"])
+    uppers = [*PRICE_BUCKET_EDGES[1:], None]
+    return FacetRows(
+        categories=_by_count(values["category"]),
+        countries=_by_count(values["country"]),
+        regions=_by_count(values["region"]),
+        grapes=_by_count(values["grape"]),
+        price_range=(low, high) if low is not None else None,
+        price_histogram=[
+            (lower, upper, bucket_counts.get(i, 0))
+            for i, (lower, upper) in enumerate(zip(PRICE_BUCKET_EDGES, uppers, strict=True), 1)
+        ],
+        stores=_by_count([(store_id, cnt) for store_id, cnt in stores]),
+        online_count=online_count,
+    )
@@ -1,18 +1,29 @@
-from sqlalchemy import or_, select
+from collections.abc import Sequence
+from datetime import datetime
+from operator import attrgetter
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+from sqlalchemy import Select, func, insert, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import undefer
 
-from backend.config import DEFAULT_RECOMMENDATION_LIMIT
+from backend.config import DEFAULT_RECOMMENDATION_LIMIT, backend_settings
 from backend.metrics import recommendation_candidates
+from backend.repositories.products import WINE_FAMILY
 from backend.schemas.recommendation import IntentResult
-from core.categories import expand_family
-from core.db.models import Product
+from core.db.models import Product, RecommendationLog
+from core.embedding_client import embedding_prefix
 
-# Default to wine categories when intent has no category filter
-_WINE_PREFIXES: list[str] = expand_family("vins", None)
+if TYPE_CHECKING:
+    from backend.vector_engine import VectorIndex
 
 # Over-fetch multiplier — fetch more candidates than needed, then rerank for diversity
 _DIVERSITY_POOL = 5
 
+# SKUs per embedding read — keeps each result set (and its vector parsing) small
+_EMBEDDING_CHUNK = 500
+
 
 async def find_similar(
     db: AsyncSession,
@@ -23,15 +34,90 @@ async def find_similar(
     available_online: bool = True,
     in_store: str | None = None,
     limit: int = DEFAULT_RECOMMENDATION_LIMIT,
+    index: "VectorIndex | None" = None,
 ) -> list[Product]:
-    """Return products matching structured filters, ranked by embedding similarity."""
+    """Return products matching structured filters, ranked by embedding similarity.
+
+    With an in-memory `index` the nearest neighbours are found there and only the
+    candidates are read from Postgres; otherwise pgvector ranks them. With
+    RERANK_EMBEDDING_WEIGHT set, the candidates' embeddings also feed the diversity rerank.
+    """
+    # Over-fetch for producer diversity, then deduplicate
+    pool = limit * _DIVERSITY_POOL
+    weight = backend_settings.RERANK_EMBEDDING_WEIGHT
+    if index is not None:
+        skus = index.search(
+            intent,
+            query_embedding,
+            exclude_skus=exclude_skus,
+            available_online=available_online,
+            in_store=in_store,
+            limit=pool,
+        )
+        candidates = await _find_active_in_order(db, skus)
+        embeddings = index.vectors([p.sku for p in candidates]) if weight else None
+    else:
+        rerank = None
+        if backend_settings.VECTOR_QUANTIZED_SEARCH:
+            rerank = max(backend_settings.VECTOR_RERANK_CANDIDATES, pool)
+        await db.execute(hnsw_settings(max(backend_settings.HNSW_EF_SEARCH, rerank or pool)))
+        stmt = similar_stmt(
+            intent,
+            query_embedding,
+            exclude_skus=exclude_skus,
+            available_online=available_online,
+            in_store=in_store,
+            limit=pool,
+            rerank=rerank,
+        )
+        if weight:
+            stmt = stmt.options(undefer(Product.embedding))
+        result = await db.execute(stmt)
+        candidates = list(result.scalars().all())
+        embeddings = np.array([p.embedding for p in candidates]) if weight else None
+    recommendation_candidates.observe(len(candidates))
+
+    return _rerank(candidates, limit, embeddings=embeddings, embedding_weight=weight)
+
+
+def hnsw_settings(ef_search: int) -> Select:
+    """Transaction-local pgvector settings for the next HNSW scan.
+
+    ef_search bounds how many candidates one index scan returns, filters applied after —
+    alone, a selective filter (country + price + category) would leave a handful of rows.
+    Iterative scan keeps walking the graph until `ef_search` rows pass the filters or
+    HNSW_MAX_SCAN_TUPLES is hit. strict_order: _rerank scores by position, so the
+    candidates must come back in exact distance order.
+    """
+    return select(
+        func.set_config("hnsw.ef_search", str(ef_search), True),
+        func.set_config("hnsw.iterative_scan", "strict_order", True),
+        func.set_config("hnsw.max_scan_tuples", str(backend_settings.HNSW_MAX_SCAN_TUPLES), True),
+    )
+
+
+def similar_stmt(
+    intent: IntentResult,
+    query_embedding: list[float],
+    *,
+    exclude_skus: list[str] | None = None,
+    available_online: bool = True,
+    in_store: str | None = None,
+    limit: int,
+    rerank: int | None = None,
+) -> Select:
+    """The filtered nearest-neighbour query behind find_similar — `limit` rows, closest first.
+
+    With `rerank`, a first pass ranks the filtered rows on embedding_prefix and keeps that
+    many; only those are read at full precision and ordered exactly.
+    """
     stmt = select(Product).where(Product.delisted_at.is_(None)).where(Product.embedding.isnot(None))
 
     if intent.categories:
         stmt = stmt.where(Product.category.in_(intent.categories))
     else:
         # No category from intent → default to wines (same as product list scope=wine)
-        stmt = stmt.where(or_(*(Product.category.startswith(p) for p in _WINE_PREFIXES)))
+        stmt = stmt.where(Product.category_family == WINE_FAMILY)
     if intent.country is not None:
         stmt = stmt.where(Product.country == intent.country)
     if intent.min_price is not None:
@@ -50,112 +136,220 @@ async def find_similar(
         stmt = stmt.where(Product.online_availability.is_(True))
     if in_store is not None:
         stmt = stmt.where(Product.store_availability.contains([in_store]))
-    # Over-fetch for producer diversity, then deduplicate
-    stmt = stmt.order_by(Product.embedding.cosine_distance(query_embedding)).limit(
-        limit * _DIVERSITY_POOL
+    if rerank is None:
+        return stmt.order_by(Product.embedding.cosine_distance(query_embedding)).limit(limit)
+
+    # MATERIALIZED: the planner must finish the cheap pass before touching full vectors
+    first_pass = (
+        stmt.with_only_columns(Product.sku)
+        .order_by(Product.embedding_prefix.cosine_distance(embedding_prefix(query_embedding)))
+        .limit(rerank)
+        .cte("first_pass")
+        .prefix_with("MATERIALIZED")
+    )
+    return (
+        select(Product)
+        .join(first_pass, Product.sku == first_pass.c.sku)
+        .order_by(Product.embedding.cosine_distance(query_embedding))
+        .limit(limit)
+    )
+
+
+async def _find_active_in_order(db: AsyncSession, skus: list[str]) -> list[Product]:
+    """Load products by SKU in the given order — ones delisted since the index was built drop."""
+    if not skus:
+        return []
+    result = await db.execute(
+        select(Product).where(Product.sku.in_(skus)).where(Product.delisted_at.is_(None))
+    )
+    by_sku = {p.sku: p for p in result.scalars().all()}
+    return [by_sku[sku] for sku in skus if sku in by_sku]
+
+
+async def fetch_vector_rows(db: AsyncSession) -> list[Any]:
+    """Return the embedding hash and filter columns of every active, embedded product.
+
+    The in-memory vector engine diffs the hashes against what it holds and only reads
+    the embeddings that changed (fetch_embeddings).
+    """
+    stmt = (
+        select(
+            Product.sku,
+            Product.last_embedded_hash,
+            Product.category,
+            Product.category_family,
+            Product.country,
+            Product.grape,
+            Product.price,
+            Product.online_availability,
+            Product.store_availability,
+        )
+        .where(Product.delisted_at.is_(None))
+        .where(Product.embedding.isnot(None))
     )
+    result = await db.execute(stmt)
+    return list(result.all())
+
+
+async def fetch_embeddings(db: AsyncSession, skus: Sequence[str]) -> list[Any]:
+    """Return (sku, last_embedded_hash, embedding) for the given products that have one."""
+    rows: list[Any] = []
+    for i in range(0, len(skus), _EMBEDDING_CHUNK):
+        stmt = (
+            select(Product.sku, Product.last_embedded_hash, Product.embedding)
+            .where(Product.sku.in_(skus[i : i + _EMBEDDING_CHUNK]))
+            .where(Product.embedding.isnot(None))
+        )
+        result = await db.execute(stmt)
+        rows.extend(result.all())
+    return rows
+
 
+async def find_frequent_semantic_queries(
+    db: AsyncSession, limit: int, *, since: datetime
+) -> list[str]:
+    """Most frequent semantic queries logged since `since`, most frequent first.
+
+    Queries differing only in case count together, under their most common spelling.
+    """
+    written = RecommendationLog.parsed_intent["semantic_query"].astext
+    semantic = func.lower(written)
+    cnt = func.count().label("cnt")
+    stmt = (
+        select(func.mode().within_group(written), cnt)
+        .where(RecommendationLog.created_at >= since)
+        .where(semantic != "")
+        .group_by(semantic)
+        .order_by(cnt.desc())
+        .limit(limit)
+    )
     result = await db.execute(stmt)
-    candidates = list(result.scalars().all())
-    recommendation_candidates.observe(len(candidates))
+    return [row[0] for row in result.all()]
 
-    return _rerank(candidates, limit)
+
+async def allocate_log_ids(db: AsyncSession, n: int) -> list[int]:
+    """Draw `n` ids from the recommendation_logs sequence in one round trip.
+
+    nextval() is never rolled back, so the ids are this caller's whether or not it commits.
+    """
+    sequence = func.pg_get_serial_sequence(RecommendationLog.__tablename__, "id")
+    series = func.generate_series(1, n).table_valued("n")
+    result = await db.execute(select(func.nextval(sequence)).select_from(series))
+    return list(result.scalars().all())
+
+
+async def insert_logs(db: AsyncSession, rows: list[dict[str, Any]]) -> None:
+    """Bulk-insert RecommendationLog rows (ids included) as one executemany. Caller commits."""
+    await db.execute(insert(RecommendationLog), rows)
 
 
 # Redundancy penalty weight — higher = more diversity, lower = more relevance
 _DIVERSITY_LAMBDA = 0.5
 
+# Attributes compared between wines and their weights — each only counts when both have it
+_REDUNDANCY_WEIGHTS = (
+    ("producer", 1.5),  # same producer is a strong signal of redundancy
+    ("taste_tag", 1.0),  # same taste profile tag = similar flavor experience
+    ("country", 0.5),  # same country = less geographic diversity
+    ("grape", 1.0),  # same grape = less varietal diversity
+    ("region", 1.0),  # same region = very similar terroir
+    ("category", 0.75),  # same category (e.g. all whites) = less type diversity
+)
+_redundancy_attributes = attrgetter(*(attr for attr, _ in _REDUNDANCY_WEIGHTS))
+
+# A selected wine overlapping more than this counts as similar; each one boosts the penalty
+_SIMILAR_OVERLAP = 0.3
+_SIMILAR_BOOST = 0.2
+
+
+class _Redundancy:
+    """How redundant every candidate is with the wines selected so far.
 
-def _rerank(candidates: list[Product], limit: int) -> list[Product]:
+    Attributes are integer codes (one row per attribute, -1 = missing), so adding a
+    selected wine compares it against all candidates at once. With `embeddings`, cosine
+    similarity (floored at 0) is one more weighted check next to the attributes.
+    """
+
+    def __init__(
+        self,
+        candidates: Sequence[Any],
+        embeddings: np.ndarray | None = None,
+        embedding_weight: float = 0.0,
+    ) -> None:
+        n = len(candidates)
+        codes = []
+        for values in zip(*map(_redundancy_attributes, candidates), strict=True):
+            seen: dict[Any, int] = {}
+            codes.append([seen.setdefault(v, len(seen)) if v else -1 for v in values])
+        self.codes = np.array(codes, dtype=np.int32).reshape(len(_REDUNDANCY_WEIGHTS), n)
+        self.present = (self.codes >= 0).astype(np.float64)
+        # Weight of each attribute where the candidate has it, 0 where it doesn't
+        self.weights = self.present * np.array([w for _, w in _REDUNDANCY_WEIGHTS])[:, None]
+        self.embeddings = None
+        if embeddings is not None and embedding_weight > 0:
+            self.embeddings = embeddings
+            norms = np.sqrt(np.einsum("ij,ij->i", embeddings, embeddings))
+            self.norms = np.where(norms > 0, norms, 1)
+        self.embedding_weight = embedding_weight
+        # Highest overlap with any selected wine, and how many selected wines are similar
+        self.worst = np.zeros(n)
+        self.similar = np.zeros(n)
+
+    def add(self, j: int) -> None:
+        """Account for candidate `j` having been selected."""
+        # Weights of the attributes both wines have, and of those they share (-1 never
+        # matches: j's missing attributes weigh 0)
+        shared = self.weights[:, j]
+        checks = shared @ self.present
+        overlap = shared @ (self.codes == self.codes[:, j : j + 1])
+        if self.embeddings is not None:
+            checks += self.embedding_weight
+            cosine = (self.embeddings @ self.embeddings[j]) / (self.norms * self.norms[j])
+            overlap += self.embedding_weight * np.maximum(cosine, 0.0)
+        penalty = np.divide(overlap, checks, out=np.zeros_like(overlap), where=checks > 0)
+        np.maximum(self.worst, penalty, out=self.worst)
+        self.similar += penalty > _SIMILAR_OVERLAP
+
+    @property
+    def penalty(self) -> np.ndarray:
+        """Per-candidate penalty: the max overlap, boosted by how many selected are similar.
+
+        0 before anything is selected; can exceed 1.0.
+        """
+        return self.worst * (1.0 + _SIMILAR_BOOST * self.similar)
+
+
+def _rerank(
+    candidates: list[Product],
+    limit: int,
+    *,
+    embeddings: np.ndarray | None = None,
+    embedding_weight: float = 0.0,
+) -> list[Product]:
     """Greedy MMR-style selection: balance relevance (embedding rank) with diversity.
 
     Each candidate gets a score = relevance_score - λ * redundancy_penalty.
     Relevance score decays with position (1st candidate = 1.0, last = ~0.0).
-    Redundancy penalty increases when a candidate shares attributes with already-selected wines.
+    Redundancy penalty increases when a candidate shares attributes with already-selected
+    wines (or, given their `embeddings`, is close to them).
     """
     if len(candidates) <= limit:
         return candidates
 
     n = len(candidates)
-    selected: list[Product] = []
-    remaining = list(range(n))
+    relevance = 1.0 - np.arange(n) / n
+    redundancy = _Redundancy(candidates, embeddings, embedding_weight)
 
     # Always pick the top-ranked candidate first (highest embedding similarity)
-    selected_idx = remaining.pop(0)
-    selected.append(candidates[selected_idx])
-
-    while len(selected) < limit and remaining:
-        best_score = -float("inf")
-        best_idx_pos = 0
-
-        for pos, idx in enumerate(remaining):
-            candidate = candidates[idx]
-            relevance = 1.0 - (idx / n)
-            redundancy = _redundancy_penalty(candidate, selected)
-            score = relevance - _DIVERSITY_LAMBDA * redundancy
-            if score > best_score:
-                best_score = score
-                best_idx_pos = pos
-
-        chosen = remaining.pop(best_idx_pos)
-        selected.append(candidates[chosen])
+    chosen = [0]
+    while True:
+        # Selected candidates score -inf from here on
+        relevance[chosen[-1]] = -np.inf
+        if len(chosen) == limit:
+            break
+        redundancy.add(chosen[-1])
+        score = relevance - _DIVERSITY_LAMBDA * redundancy.penalty
+        # argmax takes the first of equal scores — the better-ranked candidate
+        chosen.append(int(np.argmax(score)))
 
-    return selected
-
-
-def _redundancy_penalty(candidate: Product, selected: list[Product]) -> float:
-    """Score measuring how redundant this candidate is with already-selected wines.
-
-    Base overlap is 0-1 per selected wine, boosted by how many are similar (can exceed 1.0).
-    """
-    if not selected:
-        return 0.0
-
-    penalties: list[float] = []
-    for s in selected:
-        overlap = 0.0
-        checks = 0.0
-
-        # Same producer is a strong signal of redundancy
-        if candidate.producer and s.producer:
-            checks += 1.5
-            if candidate.producer == s.producer:
-                overlap += 1.5
-
-        # Same taste profile tag = similar flavor experience
-        if candidate.taste_tag and s.taste_tag:
-            checks += 1.0
-            if candidate.taste_tag == s.taste_tag:
-                overlap += 1.0
-
-        # Same country = less geographic diversity
-        if candidate.country and s.country:
-            checks += 0.5
-            if candidate.country == s.country:
-                overlap += 0.5
-
-        # Same grape = less varietal diversity
-        if candidate.grape and s.grape:
-            checks += 1.0
-            if candidate.grape == s.grape:
-                overlap += 1.0
-
-        # Same region = very similar terroir
-        if candidate.region and s.region:
-            checks += 1.0
-            if candidate.region == s.region:
-                overlap += 1.0
-
-        # Same category (e.g. all whites) = less type diversity
-        if candidate.category and s.category:
-            checks += 0.75
-            if candidate.category == s.category:
-                overlap += 0.75
-
-        penalties.append(overlap / checks if checks > 0 else 0.0)
-
-    # Accumulating penalty: each additional similar wine makes the next one less desirable
-    # max overlap provides the base, boosted by how many selected wines are similar
-    max_p = max(penalties)
-    similar_count = sum(1 for p in penalties if p > 0.3)
-    return max_p * (1.0 + 0.2 * similar_count)
+    return [candidates[i] for i in chosen]
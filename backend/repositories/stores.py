@@ -1,7 +1,8 @@
-from sqlalchemy import delete, select
+from sqlalchemy import delete, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from core.db.models import Store, UserStorePreference
+from backend.repositories.products import WINE_FAMILY
+from core.db.models import Product, Store, StoreInventory, UserStorePreference
 
 
 async def get_all_stores(db: AsyncSession) -> list[Store]:
@@ -18,6 +19,23 @@ async def get_store_by_id(db: AsyncSession, saq_store_id: str) -> Store | None:
     return result.scalar_one_or_none()
 
 
+async def count_inventory(db: AsyncSession, store_ids: list[str]) -> dict[str, tuple[int, int]]:
+    """Return {store_id: (active products, active wines)} — stores carrying nothing are absent."""
+    stmt = (
+        select(
+            StoreInventory.saq_store_id,
+            func.count(),
+            func.count().filter(Product.category_family == WINE_FAMILY),
+        )
+        .join(Product, Product.sku == StoreInventory.sku)
+        .where(StoreInventory.saq_store_id.in_(store_ids))
+        .where(Product.delisted_at.is_(None))
+        .group_by(StoreInventory.saq_store_id)
+    )
+    result = await db.execute(stmt)
+    return {store_id: (products, wines) for store_id, products, wines in result.all()}
+
+
 async def get_user_stores(
     db: AsyncSession, user_id: str
 ) -> list[tuple[UserStorePreference, Store]]:
@@ -1,8 +1,10 @@
 from datetime import date
 
 from sqlalchemy import select
+from sqlalchemy.engine import Row
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from backend.repositories.products import ColumnRow
 from core.db.models import Product, TastingNote
 
 
@@ -33,9 +35,30 @@ async def find_by_user(
     user_id: str | None,
     limit: int,
     offset: int,
-) -> list[tuple[TastingNote, Product | None]]:
+) -> list[tuple[Row, Row | None]]:
+    note = ColumnRow(
+        "note",
+        TastingNote.id,
+        TastingNote.sku,
+        TastingNote.rating,
+        TastingNote.notes,
+        TastingNote.pairing,
+        TastingNote.tasted_at,
+        TastingNote.created_at,
+        TastingNote.updated_at,
+    )
+    product = ColumnRow(
+        "product",
+        Product.sku,
+        Product.name,
+        Product.image,
+        Product.category,
+        Product.region,
+        Product.grape,
+        Product.price,
+    )
     stmt = (
-        select(TastingNote, Product)
+        select(note, product)
         .outerjoin(Product, TastingNote.sku == Product.sku)
         .where(TastingNote.user_id == user_id)
         .order_by(TastingNote.tasted_at.desc(), TastingNote.created_at.desc())
@@ -2,9 +2,11 @@ from datetime import UTC, datetime
 
 from sqlalchemy import and_, select, update
 from sqlalchemy import delete as sa_delete
+from sqlalchemy.engine import Row
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.config import MAX_ACK_BATCH_SIZE
+from backend.repositories.products import ColumnRow, product_row
 from core.db.models import Product, StockEvent, Store, UserStorePreference, Watch
 
 
@@ -16,10 +18,11 @@ async def create(db: AsyncSession, user_id: str, sku: str) -> Watch:
     return watch
 
 
-async def find_by_user(db: AsyncSession, user_id: str) -> list[tuple[Watch, Product | None]]:
-    """Return all watches for a user, with their product data (LEFT JOIN)."""
+async def find_by_user(db: AsyncSession, user_id: str) -> list[tuple[Row, Row | None]]:
+    """Return (watch row, product row) for all of a user's watches (LEFT JOIN)."""
+    watch = ColumnRow("watch", Watch.id, Watch.user_id, Watch.sku, Watch.created_at)
     stmt = (
-        select(Watch, Product)
+        select(watch, product_row())
         .outerjoin(Product, Watch.sku == Product.sku)
         .where(Watch.user_id == user_id)
         .order_by(Watch.created_at.desc())
@@ -0,0 +1,67 @@
+import asyncio
+from collections.abc import AsyncIterator
+from typing import Any
+
+from fastapi.responses import JSONResponse, StreamingResponse
+from loguru import logger
+from pydantic import BaseModel
+from pydantic_core import to_json
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+class ModelJSONResponse(JSONResponse):
+    """JSON response for already-built pydantic models, serialized straight to bytes.
+
+    Returning one from a route skips FastAPI's response_model pass (validate again,
+    jsonable_encoder, json.dumps) — keep response_model on the route for the OpenAPI
+    schema. Output matches it: Decimal as a string, datetimes in ISO 8601.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return to_json(content)
+
+
+class EventStreamResponse(StreamingResponse):
+    """Server-sent events from (event name, pydantic model) pairs, each flushed as it comes.
+
+    Payloads serialize like ModelJSONResponse. The status is already sent when a later
+    stage fails, so a failure rolls back `db` — nothing from the request is committed —
+    and ends the stream with an `error` event instead. A client disconnecting mid-stream
+    rolls it back too, so no half-finished exchange is saved.
+    """
+
+    def __init__(self, events: AsyncIterator[tuple[str, BaseModel]], db: AsyncSession) -> None:
+        super().__init__(
+            self._render(events, db),
+            media_type="text/event-stream",
+            # Proxies must pass each event through as it's written
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+
+    @staticmethod
+    async def _render(
+        events: AsyncIterator[tuple[str, BaseModel]], db: AsyncSession
+    ) -> AsyncIterator[bytes]:
+        try:
+            async for event, data in events:
+                yield b"event: " + event.encode() + b"\ndata: " + to_json(data) + b"\n\n"
+        except (asyncio.CancelledError, GeneratorExit):
+            # Starlette cancels the body on disconnect without raising, and get_db would
+            # then commit whatever the stream had written so far
+            await db.rollback()
+            raise
+        except Exception as exc:
+            logger.opt(exception=exc).error("Event stream failed")
+            await db.rollback()
+            yield b"event: error\ndata: " + to_json({"detail": "Internal Server Error"}) + b"\n\n"
+
+
+def from_row[M: BaseModel](model: type[M], row: Any, **values: Any) -> M:
+    """Build `model` from a DB row's attributes without validating them.
+
+    Only for rows whose columns already have the model's types — a typed SELECT, not
+    user input. `values` override or add fields; fields the row lacks take their
+    defaults, as with from_attributes.
+    """
+    fields = {f: getattr(row, f) for f in model.model_fields if f not in values and hasattr(row, f)}
+    return model.model_construct(**fields, **values)
@@ -1,6 +1,6 @@
 from datetime import datetime
 from decimal import Decimal
-from typing import Any
+from typing import Any, Literal
 
 from pydantic import BaseModel, ConfigDict, Field
 
@@ -34,11 +34,36 @@ class ProductOut(BaseModel):
     updated_at: datetime
 
 
+class ProductBatchOut(BaseModel):
+    # Active products in request order
+    products: list[ProductOut]
+    # Requested SKUs not in the catalog, and ones delisted from SAQ
+    missing: list[str] = []
+    delisted: list[str] = []
+
+
 class PaginatedOut(BaseModel):
     products: list[ProductOut]
     total: int
+    # False when `total` is a planner estimate (PRODUCT_COUNT_STRATEGY=estimated)
+    total_exact: bool = True
     limit: int
     offset: int
+    # Opaque keyset token for the next page — None on the last page
+    next_cursor: str | None = None
+
+
+class SuggestionOut(BaseModel):
+    kind: Literal["product", "producer", "region", "grape", "appellation"]
+    text: str
+    sku: str | None = None  # products only
+    count: int  # products under this value — 1 for a product
+
+
+class SuggestOut(BaseModel):
+    suggestions: list[SuggestionOut]
+    # Query actually matched when the typo fallback rewrote the prefix
+    corrected: str | None = None
 
 
 class PriceRange(BaseModel):
@@ -58,16 +83,31 @@ class CategoryFamilyOut(BaseModel):
     children: list[str]  # group keys
 
 
-class CountryFacet(BaseModel):
+class FacetCount(BaseModel):
     name: str
     count: int
 
 
+class PriceBucket(BaseModel):
+    min: Decimal
+    max: Decimal | None  # None on the open-ended top bucket
+    count: int
+
+
 class FacetsOut(BaseModel):
     categories: list[str]
     grouped_categories: list[CategoryGroupOut]
     category_families: list[CategoryFamilyOut]
-    countries: list[CountryFacet]
+    countries: list[FacetCount]
     regions: list[str]
     grapes: list[str]
     price_range: PriceRange | None
+    # Count descending, like countries
+    category_counts: list[FacetCount] = []
+    region_counts: list[FacetCount] = []
+    grape_counts: list[FacetCount] = []
+    # Count descending — like online_count, ignores its own filter
+    store_counts: list[FacetCount] = []
+    online_count: int | None = None
+    # Every bucket, empty ones included — the price slider's histogram
+    price_histogram: list[PriceBucket] = []
@@ -38,3 +38,24 @@ class RecommendationOut(BaseModel):
     intent: IntentResult
     summary: str
     log_id: int | None = None
+
+
+class RecommendationProductsOut(BaseModel):
+    """Streamed as soon as retrieval ranks the wines — reasons follow."""
+
+    products: list[ProductOut]
+
+
+class RecommendationReasonOut(BaseModel):
+    """One wine's reason (index into the streamed products), sent as curation writes it."""
+
+    index: int
+    reason: str
+
+
+class RecommendationSummaryOut(BaseModel):
+    summary: str
+
+
+# Server-sent event name and payload: intent, products, reason, summary, done
+RecommendationEvent = tuple[str, BaseModel]
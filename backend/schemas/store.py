@@ -24,6 +24,8 @@ class StoreWithDistance(StoreOut):
     """Store enriched with computed Haversine distance from a query point."""
 
     distance_km: float
+    product_count: int = 0  # active products in stock
+    wine_count: int = 0
 
 
 class UserStorePreferenceIn(BaseModel):
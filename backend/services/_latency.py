@@ -0,0 +1,136 @@
+import asyncio
+import statistics
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable
+from typing import Literal
+
+from backend.config import backend_settings
+from backend.metrics import hedged_requests, stage_timeouts
+
+Stage = Literal["intent", "embed", "curation", "sommelier"]
+
+# Hedge only once this many recent latencies back the p95
+_HEDGE_MIN_SAMPLES = 20
+_HEDGE_WINDOW = 200
+
+
+def _stage_caps() -> dict[Stage, float]:
+    return {
+        "intent": backend_settings.INTENT_TIMEOUT,
+        "embed": backend_settings.EMBED_TIMEOUT,
+        "curation": backend_settings.CURATION_TIMEOUT,
+        "sommelier": backend_settings.SOMMELIER_TIMEOUT,
+    }
+
+
+class LatencyBudget:
+    """What's left of one request's LATENCY_BUDGET, spent by its stages in order."""
+
+    def __init__(self, seconds: float | None = None) -> None:
+        if seconds is None:
+            seconds = backend_settings.LATENCY_BUDGET
+        self._deadline = time.monotonic() + seconds
+
+    def remaining(self) -> float:
+        return max(0.0, self._deadline - time.monotonic())
+
+    def timeout(self, stage: Stage) -> float:
+        """Seconds `stage` may take: its own cap, or less if the request is running out."""
+        return min(_stage_caps()[stage], self.remaining())
+
+
+class _LatencyWindow:
+    """Durations of a service's recent successful calls."""
+
+    def __init__(self) -> None:
+        self._samples: deque[float] = deque(maxlen=_HEDGE_WINDOW)
+
+    def observe(self, seconds: float) -> None:
+        self._samples.append(seconds)
+
+    def p95(self) -> float | None:
+        if len(self._samples) < _HEDGE_MIN_SAMPLES:
+            return None
+        return statistics.quantiles(self._samples, n=20)[-1]
+
+
+_windows: dict[Stage, _LatencyWindow] = {}
+
+
+def clear_latency_windows() -> None:
+    """Forget every recorded call latency — used by tests."""
+    _windows.clear()
+
+
+async def call_with_deadline[T](
+    call: Callable[[], Awaitable[T]],
+    *,
+    stage: Stage,
+    timeout: float | None,
+    hedge: bool = False,
+) -> T:
+    """Await `call()` for at most `timeout` seconds; raises TimeoutError past it.
+
+    With `hedge` and HEDGE_REQUESTS, a call still running after the p95 of the stage's
+    recent calls gets a duplicate — the first to succeed wins, the other is cancelled.
+    """
+    window = _windows.setdefault(stage, _LatencyWindow())
+    delay = window.p95() if hedge and backend_settings.HEDGE_REQUESTS else None
+    try:
+        async with asyncio.timeout(timeout):
+            if delay is None:
+                t0 = time.monotonic()
+                result = await call()
+                window.observe(time.monotonic() - t0)
+                return result
+            return await _hedged(call, stage, window, delay)
+    except TimeoutError:
+        stage_timeouts.labels(stage=stage).inc()
+        raise
+
+
+async def _hedged[T](
+    call: Callable[[], Awaitable[T]], stage: Stage, window: _LatencyWindow, delay: float
+) -> T:
+    t0 = t_hedge = time.monotonic()
+    primary = asyncio.ensure_future(call())
+    tasks = [primary]
+    try:
+        done, _ = await asyncio.wait(tasks, timeout=delay)
+        if not done:
+            hedged_requests.labels(stage=stage, outcome="fired").inc()
+            t_hedge = time.monotonic()
+            tasks.append(asyncio.ensure_future(call()))
+        pending = set(tasks)
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is not None:
+                    continue
+                if task is primary:
+                    window.observe(time.monotonic() - t0)
+                else:
+                    hedged_requests.labels(stage=stage, outcome="won").inc()
+                    window.observe(time.monotonic() - t_hedge)
+                return task.result()
+        # Both failed — surface the original call's error
+        return primary.result()
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def within_deadline[T](deadline: float | None, awaitable: Awaitable[T]) -> T:
+    """Await one step of a longer exchange against an absolute loop-time deadline.
+
+    For generators, where a timeout can't span a yield — it would cancel the consumer.
+    """
+    async with asyncio.timeout_at(deadline):
+        return await awaitable
+
+
+def deadline_after(timeout: float | None) -> float | None:
+    """Loop-time deadline `timeout` seconds from now, for within_deadline."""
+    return None if timeout is None else asyncio.get_running_loop().time() + timeout
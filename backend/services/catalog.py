@@ -0,0 +1,43 @@
+from datetime import UTC, datetime
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.cache import LRUCache
+from backend.repositories.catalog import get_version
+
+# Short memo so hot endpoints don't pay a round trip per request just to read the stamp —
+# a scraper run becomes visible at most this many seconds late.
+_VERSION_TTL = 5.0  # seconds
+
+_version_memo: LRUCache[None, int] = LRUCache(maxsize=1, ttl=_VERSION_TTL)
+
+# When this process first saw each recent version — the Last-Modified of catalog responses
+_first_seen: LRUCache[int, datetime] = LRUCache(maxsize=8)
+
+
+async def catalog_version(db: AsyncSession) -> int:
+    """Return the current catalog version, memoized for a few seconds per process."""
+    version = _version_memo.get(None)
+    if version is None:
+        version = await get_version(db)
+        _version_memo.set(None, version)
+    return version
+
+
+def catalog_last_modified(version: int) -> datetime:
+    """Return when this process first saw `version`.
+
+    Never earlier than the scraper write that produced it, so If-Modified-Since stays
+    safe. Each worker has its own clock for this; a restart only makes it later.
+    """
+    seen = _first_seen.get(version)
+    if seen is None:
+        seen = datetime.now(UTC)
+        _first_seen.set(version, seen)
+    return seen
+
+
+def reset_catalog_version() -> None:
+    """Forget the memoized version — used by tests."""
+    _version_memo.clear()
+    _first_seen.clear()
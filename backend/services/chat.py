@@ -1,3 +1,6 @@
+import dataclasses
+from collections.abc import AsyncIterator
+
 from loguru import logger
 from pydantic import ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -12,9 +15,10 @@ from backend.schemas.chat import (
     ChatSessionDetailOut,
     ChatSessionOut,
 )
-from backend.schemas.recommendation import RecommendationOut
+from backend.schemas.recommendation import IntentResult, RecommendationEvent, RecommendationOut
+from backend.services._latency import LatencyBudget
 from backend.services.intent import parse_intent
-from backend.services.recommendations import recommend
+from backend.services.recommendations import recommend, recommend_stream
 from backend.services.sommelier import sommelier_chat
 from core.db.models import ChatMessage, ChatSession
 
@@ -99,6 +103,56 @@ async def create_session(
     return ChatSessionOut.model_validate(session)
 
 
+@dataclasses.dataclass(slots=True)
+class _TurnContext:
+    """What a new message needs from the session's earlier ones."""
+
+    exclude_skus: list[str] | None
+    conversation_history: str | None
+    # Last 2 turns for the intent parser, so follow-ups ("what about lighter?") resolve
+    recent_turns: str | None
+
+
+async def _turn_context(db: AsyncSession, session_id: int) -> _TurnContext:
+    # Fetch history before intent classification so follow-up queries resolve correctly
+    prior_messages = await chat_repo.find_messages(db, session_id)
+    exclude_skus, conversation_history = _extract_multi_turn_context(prior_messages)
+    # Coerce empty string → None once; all callers receive None for a fresh session
+    return _TurnContext(
+        exclude_skus=exclude_skus or None,
+        conversation_history=conversation_history or None,
+        # 4 lines: user + assistant x2
+        recent_turns="\n".join(conversation_history.splitlines()[-4:]) or None,
+    )
+
+
+async def _reply_without_products(
+    intent: IntentResult, message: str, context: _TurnContext, budget: LatencyBudget
+) -> str:
+    """Answer a non-recommendation intent — off_topic skips history entirely."""
+    if intent.intent_type == "wine_chat":
+        return await sommelier_chat(
+            message,
+            conversation_history=context.conversation_history,
+            timeout=budget.timeout("sommelier"),
+        )
+    return NON_WINE_MESSAGE
+
+
+async def _save_reply(
+    db: AsyncSession, session_id: int, content: str | RecommendationOut
+) -> ChatMessageOut:
+    response_text = content.model_dump_json() if isinstance(content, RecommendationOut) else content
+    assistant_msg = await chat_repo.create_message(db, session_id, "assistant", response_text)
+    return ChatMessageOut(
+        message_id=assistant_msg.id,
+        session_id=session_id,
+        role="assistant",
+        content=content,
+        created_at=assistant_msg.created_at,
+    )
+
+
 async def send_message(
     db: AsyncSession,
     user_id: int,
@@ -110,51 +164,84 @@ async def send_message(
 
     # Save user message
     await chat_repo.create_message(db, session_id, "user", message)
-
-    # Fetch history before intent classification so follow-up queries resolve correctly
-    prior_messages = await chat_repo.find_messages(db, session_id)
-    exclude_skus, conversation_history_str = _extract_multi_turn_context(prior_messages)
-    # Coerce empty string → None once; all callers receive None for a fresh session
-    conversation_history: str | None = conversation_history_str or None
-    exclude_skus_opt: list[str] | None = exclude_skus or None
-
-    # Pass last 2 turns (4 lines: user + assistant x2) to intent parser
-    # so follow-ups ("what about lighter?") resolve correctly
-    last_2_turns = "\n".join(conversation_history_str.splitlines()[-4:]) or None
+    context = await _turn_context(db, session_id)
 
     # Classify intent — Claude picks one of three tools
-    intent = await parse_intent(message, conversation_history=last_2_turns)
+    # One latency budget for the whole turn, intent parsing included
+    budget = LatencyBudget()
+    intent = await parse_intent(
+        message, conversation_history=context.recent_turns, timeout=budget.timeout("intent")
+    )
     intent_classifications.labels(intent_type=intent.intent_type).inc()
 
-    # Route based on intent_type — off_topic skips history entirely
     content: str | RecommendationOut
-    if intent.intent_type == "off_topic":
-        content = NON_WINE_MESSAGE
-    elif intent.intent_type == "wine_chat":
-        content = await sommelier_chat(message, conversation_history=conversation_history)
-    elif intent.intent_type == "recommendation":
+    if intent.intent_type == "recommendation":
         content = await recommend(
             db,
             message,
             user_id=f"web:{user_id}",
-            exclude_skus=exclude_skus_opt,
-            conversation_history=conversation_history,
+            exclude_skus=context.exclude_skus,
+            conversation_history=context.conversation_history,
             intent=intent,
+            budget=budget,
         )
     else:
-        content = NON_WINE_MESSAGE
+        content = await _reply_without_products(intent, message, context, budget)
 
-    # Save assistant response
-    response_text = content.model_dump_json() if isinstance(content, RecommendationOut) else content
-    assistant_msg = await chat_repo.create_message(db, session_id, "assistant", response_text)
+    return await _save_reply(db, session_id, content)
 
-    return ChatMessageOut(
-        message_id=assistant_msg.id,
-        session_id=session_id,
-        role="assistant",
-        content=content,
-        created_at=assistant_msg.created_at,
+
+async def stream_message(
+    db: AsyncSession,
+    user_id: int,
+    session_id: int,
+    message: str,
+) -> AsyncIterator[RecommendationEvent]:
+    """send_message as events: recommend_stream's stages, then the saved `message`.
+
+    Ownership is checked (and the user message saved) before this returns, so those
+    errors still become HTTP responses; everything else happens as the events are read.
+    EventStreamResponse rolls the user message back if the stream ends before the reply.
+    """
+    await _get_owned_session(db, user_id, session_id)
+    await chat_repo.create_message(db, session_id, "user", message)
+    return _message_events(db, user_id, session_id, message)
+
+
+async def _message_events(
+    db: AsyncSession,
+    user_id: int,
+    session_id: int,
+    message: str,
+) -> AsyncIterator[RecommendationEvent]:
+    context = await _turn_context(db, session_id)
+    # One latency budget for the whole turn, intent parsing included
+    budget = LatencyBudget()
+    intent = await parse_intent(
+        message, conversation_history=context.recent_turns, timeout=budget.timeout("intent")
     )
+    intent_classifications.labels(intent_type=intent.intent_type).inc()
+
+    content: str | RecommendationOut = NON_WINE_MESSAGE
+    if intent.intent_type == "recommendation":
+        async for event, data in recommend_stream(
+            db,
+            message,
+            user_id=f"web:{user_id}",
+            exclude_skus=context.exclude_skus,
+            conversation_history=context.conversation_history,
+            intent=intent,
+            budget=budget,
+        ):
+            if event == "done" and isinstance(data, RecommendationOut):
+                content = data
+            else:
+                yield event, data
+    else:
+        yield "intent", intent
+        content = await _reply_without_products(intent, message, context, budget)
+
+    yield "message", await _save_reply(db, session_id, content)
 
 
 async def list_sessions(
@@ -1,12 +1,20 @@
+import contextlib
 import dataclasses
 import time
+from collections.abc import AsyncIterator
+from typing import Any
 
 import anthropic
 from loguru import logger
 
 from backend.config import backend_settings
-from backend.metrics import llm_call_duration, llm_errors, observe_token_usage
+from backend.metrics import llm_call_duration, llm_errors, observe_token_usage, stage_timeouts
 from backend.services._anthropic import get_anthropic_client
+from backend.services._latency import (
+    call_with_deadline,
+    deadline_after,
+    within_deadline,
+)
 from core.db.models import Product
 
 _MODEL = "claude-haiku-4-5-20251001"
@@ -77,19 +85,49 @@ def _build_user_message(
     return "\n".join(parts)
 
 
+def _request_params(
+    query: str,
+    products: list[Product],
+    *,
+    conversation_history: str | None = None,
+) -> dict[str, Any]:
+    user_msg = _build_user_message(query, products, conversation_history=conversation_history)
+    return {
+        "model": _MODEL,
+        "max_tokens": 512,
+        "temperature": backend_settings.HAIKU_TEMPERATURE,
+        "system": _SYSTEM_PROMPT,
+        "messages": [{"role": "user", "content": user_msg}],
+        "tools": _TOOLS,
+        "tool_choice": {"type": "tool", "name": "explain"},
+    }
+
+
 @dataclasses.dataclass(slots=True)
 class ExplanationResult:
     reasons: list[str]
     summary: str
 
 
+@dataclasses.dataclass(slots=True)
+class ExplanationReason:
+    """One wine's finished reason, streamed before the rest of the explanation."""
+
+    index: int
+    reason: str
+
+
 async def explain_recommendations(
     query: str,
     products: list[Product],
     *,
     conversation_history: str | None = None,
+    timeout: float | None = None,
 ) -> ExplanationResult:
-    """Generate per-product reasons and a summary for a recommendation set."""
+    """Generate per-product reasons and a summary for a recommendation set.
+
+    Past `timeout` seconds the wines go out without reasons.
+    """
     n = len(products)
     if n == 0:
         return ExplanationResult(reasons=[], summary="")
@@ -99,24 +137,24 @@ async def explain_recommendations(
         return _fallback(n)
 
     client = get_anthropic_client()
-    user_msg = _build_user_message(query, products, conversation_history=conversation_history)
 
     try:
         t0 = time.monotonic()
-        response = await client.messages.create(
-            model=_MODEL,
-            max_tokens=512,
-            temperature=backend_settings.HAIKU_TEMPERATURE,
-            system=_SYSTEM_PROMPT,
-            messages=[{"role": "user", "content": user_msg}],
-            tools=_TOOLS,
-            tool_choice={"type": "tool", "name": "explain"},
+        response = await call_with_deadline(
+            lambda: client.messages.create(
+                **_request_params(query, products, conversation_history=conversation_history)
+            ),
+            stage="curation",
+            timeout=timeout,
         )
         llm_call_duration.labels(service="curation").observe(time.monotonic() - t0)
     except anthropic.APIError as exc:
         logger.opt(exception=exc).warning("Curation call failed — using fallback")
         llm_errors.labels(service="curation").inc()
         return _fallback(n)
+    except TimeoutError:
+        logger.warning("Curation call timed out after {}s — using fallback", timeout)
+        return _fallback(n)
 
     observe_token_usage("curation", response)
 
@@ -128,6 +166,82 @@ async def explain_recommendations(
     return _fallback(n)
 
 
+async def stream_explanations(
+    query: str,
+    products: list[Product],
+    *,
+    conversation_history: str | None = None,
+    timeout: float | None = None,
+) -> AsyncIterator[ExplanationReason | ExplanationResult]:
+    """explain_recommendations over the streaming API.
+
+    Yields an ExplanationReason as soon as the model finishes each one, then the full
+    ExplanationResult (padded the same way). If the stream breaks or outlasts `timeout`
+    seconds, reasons already sent are kept and the rest fall back to empty.
+    """
+    n = len(products)
+    if n == 0:
+        yield ExplanationResult(reasons=[], summary="")
+        return
+
+    if not backend_settings.ANTHROPIC_API_KEY:
+        logger.warning("ANTHROPIC_API_KEY not set — skipping curation")
+        yield _fallback(n)
+        return
+
+    client = get_anthropic_client()
+    tool_input: dict = {}
+    sent = 0
+
+    # Each read is bounded separately — a timeout spanning a yield would cancel the consumer
+    deadline = deadline_after(timeout)
+    try:
+        t0 = time.monotonic()
+        async with contextlib.AsyncExitStack() as stack:
+            stream = await within_deadline(
+                deadline,
+                stack.enter_async_context(
+                    client.messages.stream(
+                        **_request_params(
+                            query, products, conversation_history=conversation_history
+                        )
+                    )
+                ),
+            )
+            events = aiter(stream)
+            while (event := await within_deadline(deadline, anext(events, None))) is not None:
+                if event.type != "input_json" or not isinstance(event.snapshot, dict):
+                    continue
+                tool_input = event.snapshot
+                # The snapshot only holds complete strings — every listed reason is final
+                reasons = tool_input.get("reasons", [])[:n]
+                for i in range(sent, len(reasons)):
+                    yield ExplanationReason(index=i, reason=reasons[i])
+                sent = max(sent, len(reasons))
+            response = await within_deadline(deadline, stream.get_final_message())
+        llm_call_duration.labels(service="curation").observe(time.monotonic() - t0)
+    except (anthropic.APIError, TimeoutError) as exc:
+        if isinstance(exc, TimeoutError):
+            logger.warning("Curation stream timed out after {}s — using fallback", timeout)
+            stage_timeouts.labels(stage="curation").inc()
+        else:
+            logger.opt(exception=exc).warning("Curation stream failed — using fallback")
+            llm_errors.labels(service="curation").inc()
+        reasons = list(tool_input.get("reasons", [])[:sent])
+        yield _parse_tool_input({"reasons": reasons}, n)
+        return
+
+    observe_token_usage("curation", response)
+
+    for block in response.content:
+        if block.type == "tool_use" and block.name == "explain":
+            yield _parse_tool_input(block.input, n)
+            return
+
+    logger.warning("No tool_use block in curation response — using fallback")
+    yield _fallback(n)
+
+
 def _parse_tool_input(tool_input: dict, expected_count: int) -> ExplanationResult:
     reasons = tool_input.get("reasons", [])
     summary = tool_input.get("summary", "")
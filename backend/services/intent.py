@@ -1,13 +1,22 @@
+import hashlib
+import json
 import time
 from decimal import Decimal
 
 import anthropic
 from loguru import logger
 
+from backend.cache import LRUCache, normalize_query
 from backend.config import backend_settings
-from backend.metrics import llm_call_duration, llm_errors, observe_token_usage
+from backend.metrics import (
+    intent_cache_requests,
+    llm_call_duration,
+    llm_errors,
+    observe_token_usage,
+)
 from backend.schemas.recommendation import IntentResult, IntentType
 from backend.services._anthropic import get_anthropic_client
+from backend.services._latency import call_with_deadline
 from core.categories import CATEGORY_FAMILIES, CATEGORY_GROUPS
 
 _MODEL = "claude-haiku-4-5-20251001"
@@ -170,17 +179,50 @@ _TOOL_INTENT_MAP: dict[str, IntentType] = {
     "off_topic": "off_topic",
 }
 
+# Parsed intents for standalone queries — the call runs at temperature 0, so the same
+# query, model, prompt and tools always classify the same way. Any edit to those changes
+# the fingerprint in the key, so entries from an older prompt are never served.
+_INTENT_CACHE_SIZE = 1024
+_INTENT_CACHE_TTL = 24 * 3600  # seconds
+_PROMPT_FINGERPRINT = hashlib.sha256(
+    json.dumps([_MODEL, _SYSTEM_PROMPT, _TOOLS], sort_keys=True).encode()
+).hexdigest()[:16]
+_intent_cache: LRUCache[tuple[str, str], IntentResult] = LRUCache(
+    maxsize=_INTENT_CACHE_SIZE, ttl=_INTENT_CACHE_TTL
+)
 
-async def parse_intent(query: str, conversation_history: str | None = None) -> IntentResult:
+
+def clear_intent_cache() -> None:
+    """Drop every cached intent — used by tests."""
+    _intent_cache.clear()
+
+
+async def parse_intent(
+    query: str,
+    conversation_history: str | None = None,
+    *,
+    timeout: float | None = None,
+) -> IntentResult:
     """Classify a user query and extract search filters if applicable.
 
     Claude picks one of three tools (search_wines, wine_chat, off_topic).
-    Falls back to recommendation with raw query as semantic search on failure.
+    Falls back to recommendation with raw query as semantic search on failure, or when
+    the call takes longer than `timeout` seconds. Slow calls may be hedged.
+    Without conversation history the answer depends on the query alone, so repeats are
+    served from a cache; fallbacks after an API error are never cached.
     """
     if not backend_settings.ANTHROPIC_API_KEY:
         logger.warning("ANTHROPIC_API_KEY not set — returning raw query as semantic search")
         return IntentResult(semantic_query=query)
 
+    cache_key = None
+    if backend_settings.INTENT_CACHE_ENABLED and not conversation_history:
+        cache_key = (_PROMPT_FINGERPRINT, normalize_query(query))
+        cached = _intent_cache.get(cache_key)
+        if cached is not None:
+            intent_cache_requests.labels(outcome="hit", intent_type=cached.intent_type).inc()
+            return cached.model_copy(deep=True)
+
     client = get_anthropic_client()
 
     if conversation_history:
@@ -191,14 +233,19 @@ async def parse_intent(query: str, conversation_history: str | None = None) -> I
 
     try:
         t0 = time.monotonic()
-        response = await client.messages.create(
-            model=_MODEL,
-            max_tokens=256,
-            temperature=0,
-            system=_SYSTEM_PROMPT,
-            messages=messages,
-            tools=_TOOLS,
-            tool_choice={"type": "auto"},
+        response = await call_with_deadline(
+            lambda: client.messages.create(
+                model=_MODEL,
+                max_tokens=256,
+                temperature=0,
+                system=_SYSTEM_PROMPT,
+                messages=messages,
+                tools=_TOOLS,
+                tool_choice={"type": "auto"},
+            ),
+            stage="intent",
+            timeout=timeout,
+            hedge=True,
         )
         llm_call_duration.labels(service="intent").observe(time.monotonic() - t0)
     except anthropic.APIError as exc:
@@ -207,9 +254,23 @@ async def parse_intent(query: str, conversation_history: str | None = None) -> I
         )
         llm_errors.labels(service="intent").inc()
         return IntentResult(semantic_query=query)
+    except TimeoutError:
+        logger.warning(
+            "Claude intent parsing timed out after {}s — falling back to raw query", timeout
+        )
+        return IntentResult(semantic_query=query)
 
     observe_token_usage("intent", response)
 
+    result = _intent_from_response(response, query)
+    if cache_key is not None:
+        intent_cache_requests.labels(outcome="miss", intent_type=result.intent_type).inc()
+        _intent_cache.set(cache_key, result.model_copy(deep=True))
+    return result
+
+
+def _intent_from_response(response: anthropic.types.Message, query: str) -> IntentResult:
+    """Turn Claude's tool choice into an IntentResult."""
     for block in response.content:
         if block.type == "tool_use" and block.name in _TOOL_INTENT_MAP:
             intent_type = _TOOL_INTENT_MAP[block.name]
@@ -1,32 +1,163 @@
-import asyncio
+from datetime import datetime
 from decimal import Decimal
+from typing import Any
 
+from sqlalchemy.engine import Row
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-from backend.exceptions import NotFoundError
+from backend.cache import LRUCache, ResponseCache
+from backend.catalog_engine import CatalogSnapshot, catalog_engine
+from backend.config import backend_settings
+from backend.exceptions import InvalidCursorError, NotFoundError
+from backend.pagination import decode_cursor, encode_cursor
+from backend.redis_client import redis_client
 from backend.repositories.products import (
+    RELEVANCE_SORT,
     count,
+    estimate_count,
+    find_any_by_skus,
     find_by_sku,
+    find_by_skus,
     find_page,
+    find_page_with_total,
     find_random,
-    get_distinct_values,
-    get_distinct_values_by_count,
-    get_price_range,
+    find_random_sample,
+    find_updated_at,
+    get_facet_rows,
+    parse_sort_value,
+    sort_value,
 )
+from backend.responses import from_row
 from backend.schemas.product import (
     CategoryFamilyOut,
     CategoryGroupOut,
-    CountryFacet,
+    FacetCount,
     FacetsOut,
     PaginatedOut,
+    PriceBucket,
     PriceRange,
+    ProductBatchOut,
     ProductOut,
+    SuggestionOut,
+    SuggestOut,
 )
+from backend.services.catalog import catalog_version
 from core.categories import CATEGORY_FAMILIES, CATEGORY_GROUPS, group_facets
-from core.db.models import Product
 
 _GROUP_ORDER = {k: i for i, k in enumerate(CATEGORY_GROUPS)}
 
+# Cursor payload: [sort, sort value, sku]
+_CURSOR_SIZE = 3
+
+# Counts keyed by (normalized filters, catalog version). The TTL is only a safety net for
+# a missed version bump — normally entries go stale by key, not by age.
+_COUNT_CACHE_SIZE = 1024
+_COUNT_CACHE_TTL = 3600  # seconds
+_count_cache: LRUCache[tuple, int] = LRUCache(maxsize=_COUNT_CACHE_SIZE, ttl=_COUNT_CACHE_TTL)
+
+# Below this many rows an exact count is cheap — don't serve a fuzzy estimate for it.
+_ESTIMATE_EXACT_BELOW = 1000
+
+# Whole facets / first-page responses, keyed like the count cache. Same TTL safety net.
+_RESPONSE_CACHE_SIZE = 256
+_shared_tier = redis_client if backend_settings.RESPONSE_CACHE_REDIS else None
+_facets_cache: ResponseCache[FacetsOut] = ResponseCache(
+    "facets", FacetsOut, maxsize=_RESPONSE_CACHE_SIZE, ttl=_COUNT_CACHE_TTL, redis=_shared_tier
+)
+_listing_cache: ResponseCache[PaginatedOut] = ResponseCache(
+    "listing", PaginatedOut, maxsize=_RESPONSE_CACHE_SIZE, ttl=_COUNT_CACHE_TTL, redis=_shared_tier
+)
+
+
+def _decode_product_cursor(token: str, sort: str | None) -> tuple[Any, str]:
+    """Decode a /products cursor into (sort value, sku). Raises InvalidCursorError."""
+    cursor_sort, raw_value, sku = decode_cursor(token, _CURSOR_SIZE)
+    if cursor_sort != (sort or "") or sku is None:
+        raise InvalidCursorError("Pagination cursor does not match the requested sort")
+    try:
+        return parse_sort_value(sort, raw_value), sku
+    except (ValueError, ArithmeticError) as exc:
+        raise InvalidCursorError("Malformed pagination cursor") from exc
+
+
+def _count_key(filters: dict[str, Any]) -> tuple:
+    """Normalize filters so equivalent requests share a cache entry."""
+    q = filters["q"]
+    return (
+        q.strip().lower() if q else None,
+        tuple(sorted(filters["category"])) if filters["category"] is not None else None,
+        filters["country"],
+        filters["region"],
+        filters["min_price"],
+        filters["max_price"],
+        filters["available"],
+        tuple(sorted(filters["in_stores"])) if filters["in_stores"] is not None else None,
+        filters["wine_scope"],
+    )
+
+
+async def _cached_count(db: AsyncSession, filters: dict[str, Any]) -> int:
+    key = (_count_key(filters), await catalog_version(db))
+    total = _count_cache.get(key)
+    if total is None:
+        total = await count(db, **filters)
+        _count_cache.set(key, total)
+    return total
+
+
+def clear_count_cache() -> None:
+    """Drop every memoized count — used by tests."""
+    _count_cache.clear()
+
+
+def clear_response_caches() -> None:
+    """Drop every cached facets and listing response — used by tests."""
+    _facets_cache.clear()
+    _listing_cache.clear()
+
+
+def _is_broad(filters: dict[str, Any]) -> bool:
+    """No filters beyond the wine scope — the only sets the planner estimates well."""
+    return all(value in (None, []) for key, value in filters.items() if key != "wine_scope")
+
+
+async def _sql_page(
+    db: AsyncSession,
+    offset: int,
+    limit: int,
+    sort: str | None,
+    after: tuple[Any, str] | None,
+    filters: dict[str, Any],
+) -> tuple[list[Row], int, bool]:
+    """Fetch product rows and their total from Postgres. Returns (rows, total, total_exact)."""
+    strategy = backend_settings.PRODUCT_COUNT_STRATEGY
+    total: int | None = None
+    if strategy == "exact" and after is None:
+        rows, total = await find_page_with_total(db, offset, limit, sort=sort, **filters)
+    else:
+        rows = await find_page(db, offset, limit, sort=sort, after=after, **filters)
+    if total is not None:
+        return rows, total, True
+
+    if strategy == "cached":
+        return rows, await _cached_count(db, filters), True
+    if strategy == "estimated" and _is_broad(filters):
+        estimate = await estimate_count(db, **filters)
+        if estimate >= _ESTIMATE_EXACT_BELOW:
+            return rows, estimate, False
+    return rows, await count(db, **filters), True
+
+
+def _facet_counts(rows: list[tuple[str, int]]) -> list[FacetCount]:
+    return [FacetCount(name=name, count=cnt) for name, cnt in rows]
+
+
+async def _catalog_snapshot(db: AsyncSession) -> CatalogSnapshot | None:
+    """Return the in-memory catalog if it's warm for the current version, else None."""
+    if not catalog_engine.started:
+        return None
+    return catalog_engine.get(await catalog_version(db))
+
 
 async def get_product(db: AsyncSession, sku: str) -> ProductOut:
     """Fetch a single product by SKU. Raises NotFoundError if not found."""
@@ -36,12 +167,42 @@ async def get_product(db: AsyncSession, sku: str) -> ProductOut:
     return ProductOut.model_validate(product)
 
 
+async def get_product_updated_at(db: AsyncSession, sku: str) -> datetime:
+    """Last write to a product, for its validators. Raises NotFoundError if not found."""
+    updated_at = await find_updated_at(db, sku)
+    if updated_at is None:
+        raise NotFoundError("Product", sku)
+    return updated_at
+
+
+async def get_products_batch(db: AsyncSession, skus: list[str]) -> ProductBatchOut:
+    """Fetch many products in one query, in request order (duplicates collapsed).
+
+    Unknown and delisted SKUs are reported instead of raising.
+    """
+    requested = list(dict.fromkeys(skus))
+    by_sku = await find_any_by_skus(db, requested)
+    products: list[ProductOut] = []
+    missing: list[str] = []
+    delisted: list[str] = []
+    for sku in requested:
+        product = by_sku.get(sku)
+        if product is None:
+            missing.append(sku)
+        elif product.delisted_at is not None:
+            delisted.append(sku)
+        else:
+            products.append(from_row(ProductOut, product))
+    return ProductBatchOut(products=products, missing=missing, delisted=delisted)
+
+
 async def list_products(
     db: AsyncSession,
     limit: int,
     offset: int,
     *,
     sort: str | None = None,
+    cursor: str | None = None,
     q: str | None = None,
     category: list[str] | None = None,
     country: str | None = None,
@@ -52,7 +213,17 @@ async def list_products(
     in_stores: list[str] | None = None,
     wine_scope: bool = False,
 ) -> PaginatedOut:
-    """Fetch a paginated list of products, optionally filtered and sorted."""
+    """Fetch a paginated list of products, optionally filtered and sorted.
+
+    A `cursor` (from a previous page's next_cursor) takes precedence over `offset`.
+    How `total` is computed follows PRODUCT_COUNT_STRATEGY; `total_exact` is False only
+    when a planner estimate was returned (unfiltered listings only). First pages without
+    a text query are served from the response cache until the catalog version changes.
+    """
+    ranked = sort == RELEVANCE_SORT and q is not None
+    if ranked and cursor is not None:
+        raise InvalidCursorError("Relevance-sorted searches are paginated with offset")
+    after = _decode_product_cursor(cursor, sort) if cursor is not None else None
     filters = dict(
         q=q,
         category=category,
@@ -64,14 +235,70 @@ async def list_products(
         in_stores=in_stores,
         wine_scope=wine_scope,
     )
-    total = await count(db, **filters)
-    rows = await find_page(db, offset, limit, sort=sort, **filters)
+    # Deep pages and search-as-you-type rarely repeat — they'd only churn the cache
+    if not backend_settings.RESPONSE_CACHE_ENABLED or after is not None or offset or q:
+        return await _list_products(db, limit, offset, sort, after, filters)
+    return await _listing_cache.get_or_compute(
+        (_count_key(filters), sort or "", limit),
+        await catalog_version(db),
+        lambda: _list_products(db, limit, offset, sort, after, filters),
+    )
 
+
+async def _list_products(
+    db: AsyncSession,
+    limit: int,
+    offset: int,
+    sort: str | None,
+    after: tuple[Any, str] | None,
+    filters: dict[str, Any],
+) -> PaginatedOut:
+    rows: list[Row] | None = None
+    q = filters["q"]
+    # The in-memory engine has no text search — q always goes to SQL
+    snapshot = await _catalog_snapshot(db) if q is None else None
+    if snapshot is not None:
+        engine_filters = {k: v for k, v in filters.items() if k != "q"}
+        # One extra row tells us whether a next page exists
+        skus = snapshot.find_page(offset, limit + 1, sort=sort, after=after, **engine_filters)
+        if skus is not None:
+            rows = await find_by_skus(db, skus)
+            total, total_exact = snapshot.count(**engine_filters), True
+    if rows is None:
+        rows, total, total_exact = await _sql_page(db, offset, limit + 1, sort, after, filters)
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    next_cursor = None
+    # Rank order can't be resumed by keyset — relevance pages go by offset
+    if has_more and not (sort == RELEVANCE_SORT and q is not None):
+        last = rows[-1]
+        next_cursor = encode_cursor(sort or "", sort_value(last, sort), last.sku)
+
+    # Rows are typed by the SELECT — no need to validate each product again
     return PaginatedOut(
-        products=[ProductOut.model_validate(r) for r in rows],
+        products=[from_row(ProductOut, r) for r in rows],
         total=total,
+        total_exact=total_exact,
         limit=limit,
-        offset=offset,
+        offset=0 if after is not None else offset,
+        next_cursor=next_cursor,
+    )
+
+
+def get_suggestions(prefix: str, limit: int) -> SuggestOut:
+    """Typeahead suggestions from the in-memory catalog — never queries Postgres.
+
+    Reads the engine's latest snapshot without a version check, so suggestions may trail
+    a scraper run until another endpoint triggers the refresh. Empty while it's cold.
+    """
+    snapshot = catalog_engine.snapshot
+    if snapshot is None:
+        return SuggestOut(suggestions=[])
+    suggestions, corrected = snapshot.suggest_index.suggest(prefix, limit)
+    return SuggestOut(
+        suggestions=[SuggestionOut.model_validate(s._asdict()) for s in suggestions],
+        corrected=corrected,
     )
 
 
@@ -88,8 +315,7 @@ async def get_random_product(
     wine_scope: bool = False,
 ) -> ProductOut:
     """Fetch a single random product matching filters. Raises NotFoundError if none."""
-    product = await find_random(
-        db,
+    filters = dict(
         category=category,
         country=country,
         region=region,
@@ -99,11 +325,54 @@ async def get_random_product(
         in_stores=in_stores,
         wine_scope=wine_scope,
     )
+    product = None
+    snapshot = await _catalog_snapshot(db)
+    if snapshot is not None:
+        sku = snapshot.random_sku(**filters)
+        if sku is None:
+            raise NotFoundError("Product", "no product matches the given filters")
+        product = await find_by_sku(db, sku)
+    # Cold engine, or the pick was delisted since the snapshot — let SQL choose
+    if product is None:
+        product = await find_random(db, **filters)
     if product is None:
         raise NotFoundError("Product", "no product matches the given filters")
     return ProductOut.model_validate(product)
 
 
+async def get_random_products(
+    db: AsyncSession,
+    n: int,
+    *,
+    category: list[str] | None = None,
+    country: str | None = None,
+    region: str | None = None,
+    min_price: Decimal | None = None,
+    max_price: Decimal | None = None,
+    available: bool | None = None,
+    in_stores: list[str] | None = None,
+    wine_scope: bool = False,
+) -> list[ProductOut]:
+    """Fetch up to `n` distinct random products matching filters — empty when none match."""
+    filters = dict(
+        category=category,
+        country=country,
+        region=region,
+        min_price=min_price,
+        max_price=max_price,
+        available=available,
+        in_stores=in_stores,
+        wine_scope=wine_scope,
+    )
+    snapshot = await _catalog_snapshot(db)
+    if snapshot is not None:
+        # Picks delisted since the snapshot are dropped rather than replaced
+        products = await find_by_skus(db, snapshot.random_skus(n, **filters))
+    else:
+        products = await find_random_sample(db, n, **filters)
+    return [from_row(ProductOut, p) for p in products]
+
+
 async def get_facets(
     session_factory: async_sessionmaker[AsyncSession],
     *,
@@ -111,32 +380,82 @@ async def get_facets(
     available: bool | None = None,
     in_stores: list[str] | None = None,
     wine_scope: bool = False,
+    version: int | None = None,
+) -> FacetsOut:
+    """Fetch distinct filter values with counts and price range for active products.
+
+    A warm catalog engine answers every dimension from its bitmap index without touching
+    the pool; otherwise get_facet_rows does, with the same shape.
+    Responses are cached per filter set until the catalog version changes — pass
+    `version` when the caller has already read it.
+    """
+    if version is None:
+        async with session_factory() as s:
+            version = await catalog_version(s)
+    if not backend_settings.RESPONSE_CACHE_ENABLED:
+        return await _compute_facets(
+            session_factory, version, category, available, in_stores, wine_scope
+        )
+    key = (
+        tuple(sorted(category)) if category is not None else None,
+        available,
+        tuple(sorted(in_stores)) if in_stores is not None else None,
+        wine_scope,
+    )
+    return await _facets_cache.get_or_compute(
+        key,
+        version,
+        lambda: _compute_facets(
+            session_factory, version, category, available, in_stores, wine_scope
+        ),
+    )
+
+
+async def _compute_facets(
+    session_factory: async_sessionmaker[AsyncSession],
+    version: int,
+    category: list[str] | None,
+    available: bool | None,
+    in_stores: list[str] | None,
+    wine_scope: bool,
 ) -> FacetsOut:
-    """Fetch distinct filter values and price range for active products."""
     availability_filters = dict(
         available=available,
         in_stores=in_stores,
         wine_scope=wine_scope,
     )
 
-    # Each query gets its own session — asyncio.gather needs independent connections.
-    async def _run(fn, *args, **kwargs):
-        async with session_factory() as s:
-            return await fn(s, *args, **kwargs)
-
-    #! Order must match destructuring — tests mock by position
+    snapshot = catalog_engine.get(version) if catalog_engine.started else None
     # * Categories skip availability filters — chip list shows all categories
     # regardless of online/in-store toggles.
-    categories, country_rows, regions, grapes, price_result = await asyncio.gather(
-        _run(get_distinct_values, Product.category, wine_scope=wine_scope),
-        _run(
-            get_distinct_values_by_count, Product.country, category=category, **availability_filters
-        ),
-        _run(get_distinct_values, Product.region, category=category, **availability_filters),
-        _run(get_distinct_values, Product.grape, category=category, **availability_filters),
-        _run(get_price_range, category=category, **availability_filters),
-    )
-    countries = [CountryFacet(name=name, count=cnt) for name, cnt in country_rows]
+    if snapshot is not None:
+        category_rows = snapshot.distinct_values_by_count("category", wine_scope=wine_scope)
+        table = snapshot.facets_by_count(
+            ("country", "region", "grape"), category=category, **availability_filters
+        )
+        country_rows, region_rows, grape_rows = table["country"], table["region"], table["grape"]
+        price_result = snapshot.price_range(category=category, **availability_filters)
+        price_buckets = snapshot.price_histogram(category=category, **availability_filters)
+        # Store and online counts ignore their own filter — they answer "how many if I pick it"
+        store_rows = snapshot.distinct_values_by_count(
+            "store", category=category, available=available, wine_scope=wine_scope
+        )
+        online_count = sum(
+            cnt
+            for _, cnt in snapshot.facet_counts(
+                "online", category=category, in_stores=in_stores, wine_scope=wine_scope
+            )
+        )
+    else:
+        # One connection — every dimension but stores from the same filtered CTE
+        async with session_factory() as s:
+            facet_rows = await get_facet_rows(s, category=category, **availability_filters)
+        category_rows, country_rows = facet_rows.categories, facet_rows.countries
+        region_rows, grape_rows = facet_rows.regions, facet_rows.grapes
+        price_result = facet_rows.price_range
+        price_buckets = facet_rows.price_histogram
+        store_rows, online_count = facet_rows.stores, facet_rows.online_count
+    categories = sorted(name for name, _ in category_rows)
 
     # Build grouped categories — preserves CATEGORY_GROUPS definition order
     grouped = group_facets(categories)
@@ -163,8 +482,16 @@ async def get_facets(
         categories=categories,
         grouped_categories=grouped_categories,
         category_families=category_families,
-        countries=countries,
-        regions=regions,
-        grapes=grapes,
+        countries=_facet_counts(country_rows),
+        regions=sorted(name for name, _ in region_rows),
+        grapes=sorted(name for name, _ in grape_rows),
         price_range=PriceRange(min=price_result[0], max=price_result[1]) if price_result else None,
+        category_counts=_facet_counts(category_rows),
+        region_counts=_facet_counts(region_rows),
+        grape_counts=_facet_counts(grape_rows),
+        store_counts=_facet_counts(store_rows),
+        online_count=online_count,
+        price_histogram=[
+            PriceBucket(min=lower, max=upper, count=cnt) for lower, upper, cnt in price_buckets
+        ],
     )
@@ -1,26 +1,106 @@
+import asyncio
 import time
+from collections.abc import AsyncIterator, Awaitable
+from datetime import UTC, datetime, timedelta
 
 from loguru import logger
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-from backend.config import NON_WINE_MESSAGE
+from backend.cache import EmbeddingCache, normalize_query
+from backend.config import NON_WINE_MESSAGE, backend_settings
+from backend.log_writer import log_writer
 from backend.metrics import (
     intent_classifications,
     recommendation_duration,
     recommendation_pipeline_errors,
 )
-from backend.repositories.recommendations import find_similar
+from backend.redis_client import redis_bytes_client
+from backend.repositories.recommendations import find_frequent_semantic_queries, find_similar
 from backend.schemas.product import ProductOut
 from backend.schemas.recommendation import (
     IntentResult,
+    RecommendationEvent,
     RecommendationOut,
     RecommendationProductOut,
+    RecommendationProductsOut,
+    RecommendationReasonOut,
+    RecommendationSummaryOut,
 )
+from backend.services._latency import LatencyBudget, call_with_deadline
 from backend.services._openai import get_openai_client
-from backend.services.curation import explain_recommendations
+from backend.services.catalog import catalog_version
+from backend.services.curation import (
+    ExplanationReason,
+    ExplanationResult,
+    explain_recommendations,
+    stream_explanations,
+)
 from backend.services.intent import parse_intent
-from core.db.models import RecommendationLog
-from core.embedding_client import async_embed_query
+from backend.vector_engine import VectorIndex, vector_engine
+from core.db.models import Product, RecommendationLog
+from core.embedding_client import async_create_embeddings, async_embed_query
+from core.embedding_constants import EMBEDDING_DIMENSIONS, EMBEDDING_MODEL
+
+# Query embeddings, keyed by model and dimensions too — switching either is a clean miss.
+# The TTL only bounds memory churn: a given model always embeds a text the same way.
+_EMBEDDING_CACHE_SIZE = 2048
+_EMBEDDING_CACHE_TTL = 7 * 24 * 3600  # seconds
+_embedding_cache = EmbeddingCache(
+    model=EMBEDDING_MODEL,
+    dimensions=EMBEDDING_DIMENSIONS,
+    maxsize=_EMBEDDING_CACHE_SIZE,
+    ttl=_EMBEDDING_CACHE_TTL,
+    redis=redis_bytes_client if backend_settings.EMBEDDING_CACHE_REDIS else None,
+)
+# Startup warm-up looks this far back in the recommendation log
+_WARM_WINDOW = timedelta(days=30)
+
+
+def clear_embedding_cache() -> None:
+    """Drop every cached query embedding — used by tests."""
+    _embedding_cache.clear()
+
+
+async def _embed_query(text: str, *, timeout: float | None = None) -> tuple[list[float], bool]:
+    """Embed a semantic query through the cache. Returns (vector, cache hit).
+
+    The OpenAI call may be hedged; past `timeout` seconds it raises TimeoutError.
+    """
+
+    def compute(t: str) -> Awaitable[list[float]]:
+        return call_with_deadline(
+            lambda: async_embed_query(t, client=get_openai_client()),
+            stage="embed",
+            timeout=timeout,
+            hedge=True,
+        )
+
+    if not backend_settings.EMBEDDING_CACHE_ENABLED:
+        return await compute(text), False
+    return await _embedding_cache.get_or_compute(text, compute)
+
+
+async def warm_embedding_cache(session_factory: async_sessionmaker[AsyncSession]) -> None:
+    """Pre-embed the most frequent recent semantic queries in one batched call.
+
+    Run in the background at startup — failures are logged, never raised.
+    """
+    try:
+        async with session_factory() as db:
+            queries = await find_frequent_semantic_queries(
+                db,
+                backend_settings.EMBEDDING_CACHE_WARM,
+                since=datetime.now(UTC) - _WARM_WINDOW,
+            )
+        embedded = await _embedding_cache.warm(
+            queries, lambda texts: async_create_embeddings(texts, client=get_openai_client())
+        )
+    except Exception as exc:
+        logger.opt(exception=exc).warning("Embedding cache warm-up failed")
+        return
+    logger.info(
+        "Embedding cache warmed: {} of {} frequent queries embedded", embedded, len(queries)
+    )
 
 
 async def _write_log(
@@ -35,8 +115,19 @@ async def _write_log(
 ) -> int | None:
     """Write a RecommendationLog row. Returns the log ID, or None on failure.
 
-    Does not commit — get_db handles session lifecycle.
+    With the write-behind writer running, the row is queued and inserted after the
+    response. Otherwise it's flushed here; get_db commits it with the request.
     """
+    if log_writer.started:
+        return await log_writer.submit(
+            db,
+            user_id=user_id,
+            query=query,
+            parsed_intent=parsed_intent,
+            returned_skus=returned_skus,
+            product_count=product_count,
+            latency_ms=latency_ms,
+        )
     try:
         log = RecommendationLog(
             user_id=user_id,
@@ -58,6 +149,128 @@ def _time_ms(start: float) -> int:
     return int((time.monotonic() - start) * 1000)
 
 
+async def _vector_index(db: AsyncSession) -> VectorIndex | None:
+    """Return the in-memory vector index if it's warm for the current catalog version."""
+    if not vector_engine.started:
+        return None
+    return vector_engine.get(await catalog_version(db))
+
+
+# IntentResult fields find_similar filters on — speculative retrieval assumes the defaults
+_SEARCH_FILTERS = {"categories", "min_price", "max_price", "country", "exclude_grapes"}
+_DEFAULT_FILTERS = IntentResult().model_dump(include=_SEARCH_FILTERS)
+
+
+class _Speculation:
+    """Embedding and default-scope retrieval for the raw query, run while parse_intent runs.
+
+    settle() keeps what the parsed intent can use and drops the rest; close() stops what's
+    left when the request ends early. Only the retrieval touches the session — in a
+    savepoint, so a failure leaves the transaction usable — and the pipeline must settle
+    before querying `db` itself.
+    """
+
+    def __init__(
+        self,
+        db: AsyncSession,
+        query: str,
+        *,
+        exclude_skus: list[str] | None,
+        available_online: bool,
+        in_store: str | None,
+        embed_timeout: float,
+    ) -> None:
+        self.query = query
+        self.vector: list[float] | None = None
+        self.cached = False
+        self.products: list[Product] | None = None
+        self.embed_ms = 0
+        self.search_ms = 0
+        self._want_search = True
+        self._searching = False
+        self._task = asyncio.create_task(
+            self._run(
+                db,
+                exclude_skus=exclude_skus,
+                available_online=available_online,
+                in_store=in_store,
+                embed_timeout=embed_timeout,
+            )
+        )
+
+    async def _run(
+        self,
+        db: AsyncSession,
+        *,
+        exclude_skus: list[str] | None,
+        available_online: bool,
+        in_store: str | None,
+        embed_timeout: float,
+    ) -> None:
+        t0 = time.monotonic()
+        try:
+            self.vector, self.cached = await _embed_query(self.query, timeout=embed_timeout)
+        finally:
+            self.embed_ms = _time_ms(t0)
+        if not self._want_search:
+            return
+        self._searching = True
+        t0 = time.monotonic()
+        try:
+            async with db.begin_nested():
+                self.products = await find_similar(
+                    db,
+                    IntentResult(),
+                    self.vector,
+                    exclude_skus=exclude_skus,
+                    available_online=available_online,
+                    in_store=in_store,
+                    index=await _vector_index(db),
+                )
+        finally:
+            self.search_ms = _time_ms(t0)
+
+    async def settle(
+        self, intent: IntentResult | None
+    ) -> tuple[tuple[list[float], bool] | None, list[Product] | None]:
+        """Return the (vector, cache hit) and products `intent` can reuse, None for each not.
+
+        Work nobody needs is cancelled while it's still an API call; a retrieval already
+        running is waited for, since it holds the session.
+        """
+        same_text = intent is not None and normalize_query(
+            intent.semantic_query
+        ) == normalize_query(self.query)
+        self._want_search = (
+            same_text and intent.model_dump(include=_SEARCH_FILTERS) == _DEFAULT_FILTERS
+        )
+        if not same_text and not self._searching:
+            self._task.cancel()
+        (outcome,) = await asyncio.gather(self._task, return_exceptions=True)
+        if isinstance(outcome, Exception):
+            logger.opt(exception=outcome).warning("Speculative recommendation work failed")
+
+        embedding = (self.vector, self.cached) if same_text and self.vector is not None else None
+        products = self.products if self._want_search else None
+        return embedding, products
+
+    async def close(self) -> None:
+        """Stop whatever is still running, waiting out a retrieval that holds the session."""
+        if self._task.done():
+            return
+        self._want_search = False
+        if not self._searching:
+            self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+
+    def record(self, latency: dict[str, int], *, used_embedding: bool, used_search: bool) -> None:
+        """Flag which stages came from speculation and how many ms of it were thrown away."""
+        latency["embed_speculative"] = int(used_embedding)
+        latency["search_speculative"] = int(used_search)
+        latency["embed_wasted"] = 0 if used_embedding else self.embed_ms
+        latency["search_wasted"] = 0 if used_search else self.search_ms
+
+
 async def recommend(
     db: AsyncSession,
     query: str,
@@ -68,59 +281,163 @@ async def recommend(
     available_online: bool = True,
     in_store: str | None = None,
     intent: IntentResult | None = None,
+    budget: LatencyBudget | None = None,
 ) -> RecommendationOut:
     """Full recommendation pipeline: parse intent → embed → retrieve → explain.
 
-    If `intent` is provided (pre-parsed by caller), skip intent parsing.
+    If `intent` is provided (pre-parsed by caller), skip intent parsing. Otherwise, with
+    SPECULATIVE_PIPELINE, embedding and retrieval start on the raw query in parallel.
+    Stages share `budget` (a fresh LATENCY_BUDGET by default) — see recommend_stream.
+    """
+    result: RecommendationOut | None = None
+    async for event, data in recommend_stream(
+        db,
+        query,
+        user_id=user_id,
+        exclude_skus=exclude_skus,
+        conversation_history=conversation_history,
+        available_online=available_online,
+        in_store=in_store,
+        intent=intent,
+        budget=budget,
+        stream_curation=False,
+    ):
+        if event == "done" and isinstance(data, RecommendationOut):
+            result = data
+    if result is None:
+        raise RuntimeError("Recommendation pipeline ended without a result")
+    return result
+
+
+async def recommend_stream(
+    db: AsyncSession,
+    query: str,
+    *,
+    user_id: str | None = None,
+    exclude_skus: list[str] | None = None,
+    conversation_history: str | None = None,
+    available_online: bool = True,
+    in_store: str | None = None,
+    intent: IntentResult | None = None,
+    budget: LatencyBudget | None = None,
+    stream_curation: bool = True,
+) -> AsyncIterator[RecommendationEvent]:
+    """The recommendation pipeline as (event, payload) pairs, each sent as its stage ends.
+
+    intent → products (ranked, before curation starts) → one reason per wine → summary
+    → done (the logged RecommendationOut). A non-wine intent goes straight to done.
+    Without `stream_curation` the reasons all come after one blocking curation call.
+
+    Each LLM and embedding call gets what's left of `budget`, up to its stage's cap. A
+    slow intent falls back to the raw query and slow curation to no reasons; a slow
+    embedding fails the request.
     """
     t_start = time.monotonic()
+    if budget is None:
+        budget = LatencyBudget()
     latency: dict[str, int] = {}
     skus: list[str] = []
+    speculation: _Speculation | None = None
 
     try:
         if intent is None:
+            if backend_settings.SPECULATIVE_PIPELINE:
+                speculation = _Speculation(
+                    db,
+                    query,
+                    exclude_skus=exclude_skus,
+                    available_online=available_online,
+                    in_store=in_store,
+                    embed_timeout=budget.timeout("embed"),
+                )
             t0 = time.monotonic()
-            intent = await parse_intent(query)
+            intent = await parse_intent(query, timeout=budget.timeout("intent"))
             latency["intent"] = _time_ms(t0)
             recommendation_duration.labels(stage="intent").observe(latency["intent"] / 1000)
             intent_classifications.labels(intent_type=intent.intent_type).inc()
 
+        embedding, products = None, None
+        if speculation is not None:
+            embedding, products = await speculation.settle(
+                intent if intent.intent_type == "recommendation" else None
+            )
+            speculation.record(
+                latency, used_embedding=embedding is not None, used_search=products is not None
+            )
+        yield "intent", intent
+
         if intent.intent_type != "recommendation":
-            return RecommendationOut(products=[], intent=intent, summary=NON_WINE_MESSAGE)
+            yield (
+                "done",
+                RecommendationOut(products=[], intent=intent, summary=NON_WINE_MESSAGE),
+            )
+            return
 
         t0 = time.monotonic()
-        vector = await async_embed_query(intent.semantic_query, client=get_openai_client())
-        latency["embed"] = _time_ms(t0)
+        if embedding is not None:
+            vector, cached = embedding
+            latency["embed"] = speculation.embed_ms
+        else:
+            vector, cached = await _embed_query(
+                intent.semantic_query, timeout=budget.timeout("embed")
+            )
+            latency["embed"] = _time_ms(t0)
+        # 1 when the vector came from the embedding cache — separates hits in the log
+        latency["embed_cached"] = int(cached)
         recommendation_duration.labels(stage="embed").observe(latency["embed"] / 1000)
 
         t0 = time.monotonic()
-        products = await find_similar(
-            db,
-            intent,
-            vector,
-            exclude_skus=exclude_skus,
-            available_online=available_online,
-            in_store=in_store,
-        )
-        latency["search"] = _time_ms(t0)
+        if products is not None:
+            latency["search"] = speculation.search_ms
+        else:
+            products = await find_similar(
+                db,
+                intent,
+                vector,
+                exclude_skus=exclude_skus,
+                available_online=available_online,
+                in_store=in_store,
+                index=await _vector_index(db),
+            )
+            latency["search"] = _time_ms(t0)
         recommendation_duration.labels(stage="retrieval").observe(latency["search"] / 1000)
 
+        skus = [p.sku for p in products]
+        ranked = [ProductOut.model_validate(p) for p in products]
+        # Time to first product — what a streaming client waits before it can render
+        latency["to_products"] = _time_ms(t_start)
+        yield "products", RecommendationProductsOut(products=ranked)
+
         t0 = time.monotonic()
-        explanation = await explain_recommendations(
-            query, products, conversation_history=conversation_history
-        )
+        if stream_curation:
+            explanation = ExplanationResult(reasons=[""] * len(products), summary="")
+            async for part in stream_explanations(
+                query,
+                products,
+                conversation_history=conversation_history,
+                timeout=budget.timeout("curation"),
+            ):
+                if isinstance(part, ExplanationReason):
+                    yield "reason", RecommendationReasonOut(index=part.index, reason=part.reason)
+                else:
+                    explanation = part
+        else:
+            explanation = await explain_recommendations(
+                query,
+                products,
+                conversation_history=conversation_history,
+                timeout=budget.timeout("curation"),
+            )
+            for index, reason in enumerate(explanation.reasons):
+                yield "reason", RecommendationReasonOut(index=index, reason=reason)
         latency["curation"] = _time_ms(t0)
         recommendation_duration.labels(stage="llm").observe(latency["curation"] / 1000)
-
-        skus = [p.sku for p in products]
+        yield "summary", RecommendationSummaryOut(summary=explanation.summary)
 
         result = RecommendationOut(
             products=[
-                RecommendationProductOut(
-                    product=ProductOut.model_validate(p),
-                    reason=explanation.reasons[i],
-                )
-                for i, p in enumerate(products)
+                RecommendationProductOut(product=product, reason=explanation.reasons[i])
+                for i, product in enumerate(ranked)
             ],
             intent=intent,
             summary=explanation.summary,
@@ -129,6 +446,11 @@ async def recommend(
         logger.opt(exception=exc).error("Recommendation pipeline failed")
         recommendation_pipeline_errors.inc()
         raise
+    finally:
+        if speculation is not None:
+            # Free the session (and stop paying for the embedding) before it goes back —
+            # also when the request is cancelled or the stream closed mid-parse
+            await speculation.close()
 
     latency["total"] = _time_ms(t_start)
     recommendation_duration.labels(stage="total").observe(latency["total"] / 1000)
@@ -142,4 +464,4 @@ async def recommend(
         latency_ms=latency,
     )
     result.log_id = log_id
-    return result
+    yield "done", result
@@ -6,6 +6,7 @@ from loguru import logger
 from backend.config import backend_settings
 from backend.metrics import llm_call_duration, llm_errors, observe_token_usage
 from backend.services._anthropic import get_anthropic_client
+from backend.services._latency import call_with_deadline
 
 _MODEL = "claude-haiku-4-5-20251001"
 
@@ -54,8 +55,12 @@ async def sommelier_chat(
     query: str,
     *,
     conversation_history: str | None = None,
+    timeout: float | None = None,
 ) -> str:
-    """Answer a freeform wine question via Claude. Returns plain text."""
+    """Answer a freeform wine question via Claude. Returns plain text.
+
+    Returns the fallback message if the call takes longer than `timeout` seconds.
+    """
     if not backend_settings.ANTHROPIC_API_KEY:
         logger.warning("ANTHROPIC_API_KEY not set — returning fallback")
         return _FALLBACK_MESSAGE
@@ -64,18 +69,25 @@ async def sommelier_chat(
 
     try:
         t0 = time.monotonic()
-        response = await client.messages.create(
-            model=_MODEL,
-            max_tokens=_MAX_TOKENS,
-            temperature=backend_settings.HAIKU_TEMPERATURE,
-            system=_SYSTEM_PROMPT,
-            messages=_build_messages(query, conversation_history=conversation_history),
+        response = await call_with_deadline(
+            lambda: client.messages.create(
+                model=_MODEL,
+                max_tokens=_MAX_TOKENS,
+                temperature=backend_settings.HAIKU_TEMPERATURE,
+                system=_SYSTEM_PROMPT,
+                messages=_build_messages(query, conversation_history=conversation_history),
+            ),
+            stage="sommelier",
+            timeout=timeout,
         )
         llm_call_duration.labels(service="sommelier").observe(time.monotonic() - t0)
     except anthropic.APIError as exc:
         logger.opt(exception=exc).warning("Sommelier chat call failed — returning fallback")
         llm_errors.labels(service="sommelier").inc()
         return _FALLBACK_MESSAGE
+    except TimeoutError:
+        logger.warning("Sommelier chat call timed out after {}s — returning fallback", timeout)
+        return _FALLBACK_MESSAGE
 
     observe_token_usage("sommelier", response)
 
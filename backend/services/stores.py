@@ -1,11 +1,14 @@
 import math
+from typing import Any
 
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.exceptions import ConflictError, NotFoundError
 from backend.repositories import stores as repo
+from backend.schemas.product import PaginatedOut
 from backend.schemas.store import StoreOut, StoreWithDistance, UserStorePreferenceOut
+from backend.services.products import list_products
 
 # Store types not open to regular consumers
 EXCLUDED_STORE_TYPES = {"SAQ Restauration", "Vin en vrac"}
@@ -28,7 +31,8 @@ async def get_nearby_stores(
 ) -> list[StoreWithDistance]:
     """Return the nearest stores to the given coordinates, sorted by distance.
 
-    Stores without GPS coordinates are excluded.
+    Stores without GPS coordinates are excluded. Each carries its in-stock product
+    and wine counts from the store inventory.
     """
     stores = await repo.get_all_stores(db)
     results: list[StoreWithDistance] = []
@@ -41,7 +45,27 @@ async def get_nearby_stores(
         store_data = StoreOut.model_validate(store).model_dump()
         results.append(StoreWithDistance(**store_data, distance_km=dist))
     results.sort(key=lambda s: s.distance_km)
-    return results[:limit]
+    results = results[:limit]
+    if results:
+        counts = await repo.count_inventory(db, [s.saq_store_id for s in results])
+        for store_out in results:
+            store_out.product_count, store_out.wine_count = counts.get(
+                store_out.saq_store_id, (0, 0)
+            )
+    return results
+
+
+async def list_store_products(
+    db: AsyncSession, saq_store_id: str, limit: int, offset: int, **filters: Any
+) -> PaginatedOut:
+    """List products in stock at one store. Raises NotFoundError for an unknown store.
+
+    Same filters, sorts and cursors as list_products, scoped through the store inventory.
+    """
+    store = await repo.get_store_by_id(db, saq_store_id)
+    if store is None:
+        raise NotFoundError("Store", saq_store_id)
+    return await list_products(db, limit, offset, in_stores=[saq_store_id], **filters)
 
 
 async def get_user_stores(db: AsyncSession, user_id: str) -> list[UserStorePreferenceOut]:
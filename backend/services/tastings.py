@@ -5,6 +5,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.exceptions import ForbiddenError, NotFoundError
 from backend.repositories import tastings as repo
+from backend.responses import from_row
 from backend.schemas.tasting import TastingOut, TastingRatingOut
 from core.db.models import TastingNote
 
@@ -44,15 +45,15 @@ async def list_tastings(
 ) -> list[TastingOut]:
     rows = await repo.find_by_user(db, user_id, limit, offset)
     return [
-        TastingOut.model_validate(note).model_copy(
-            update={
-                "product_name": product.name if product else None,
-                "product_image_url": product.image if product else None,
-                "product_category": product.category if product else None,
-                "product_region": product.region if product else None,
-                "product_grape": product.grape if product else None,
-                "product_price": f"{product.price:.2f}" if product and product.price else None,
-            }
+        from_row(
+            TastingOut,
+            note,
+            product_name=product.name if product else None,
+            product_image_url=product.image if product else None,
+            product_category=product.category if product else None,
+            product_region=product.region if product else None,
+            product_grape=product.grape if product else None,
+            product_price=f"{product.price:.2f}" if product and product.price else None,
         )
         for note, product in rows
     ]
@@ -5,6 +5,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from backend.exceptions import ConflictError, NotFoundError
 from backend.repositories import products as products_repo
 from backend.repositories import watches as repo
+from backend.responses import from_row
 from backend.schemas.product import ProductOut
 from backend.schemas.watch import NotificationOut, WatchOut, WatchWithProduct
 
@@ -38,8 +39,8 @@ async def list_watches(db: AsyncSession, user_id: str) -> list[WatchWithProduct]
     rows = await repo.find_by_user(db, user_id)
     return [
         WatchWithProduct(
-            watch=WatchOut.model_validate(watch),
-            product=ProductOut.model_validate(product) if product else None,
+            watch=from_row(WatchOut, watch),
+            product=from_row(ProductOut, product) if product else None,
         )
         for watch, product in rows
     ]
@@ -0,0 +1,140 @@
+import re
+import unicodedata
+from bisect import bisect_left
+from collections import Counter
+from collections.abc import Iterable
+from typing import Any, NamedTuple
+
+import numpy as np
+
+# Facet-like columns offered as suggestions, with the product count under each value
+SUGGEST_KINDS = ("producer", "region", "grape", "appellation")
+
+# Typo fallback: minimum trigram similarity for a word to replace a query token
+_MIN_SIMILARITY = 0.3
+# Upper bound on corrections tried per token
+_MAX_CORRECTIONS = 3
+
+
+_COMBINING = re.compile(r"[\u0300-\u036f]")
+_SEPARATORS = re.compile(r"[\W_]+")
+
+
+def normalize(text: str) -> str:
+    """Lowercase, strip accents, turn every non-alphanumeric run into one space."""
+    decomposed = unicodedata.normalize("NFKD", text.lower())
+    return _SEPARATORS.sub(" ", _COMBINING.sub("", decomposed)).strip()
+
+
+def _trigrams(word: str, *, prefix: bool = False) -> set[str]:
+    """pg_trgm-style trigrams. A prefix isn't padded at the end — the word goes on."""
+    padded = f"  {word}" if prefix else f"  {word} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+class Suggestion(NamedTuple):
+    kind: str  # "product" or one of SUGGEST_KINDS
+    text: str
+    sku: str | None  # products only
+    count: int  # products under this value — 1 for a product
+
+
+class SuggestIndex:
+    """Typeahead over product names and facet values — built once per catalog snapshot.
+
+    Every word-start suffix of a normalized entry is a key in one sorted array, so a
+    prefix lookup is two bisects plus a vectorized rank of the hits. When the prefix
+    matches nothing, each query word is swapped for its nearest vocabulary words by
+    trigram similarity and the lookup is retried.
+    """
+
+    def __init__(self, rows: Iterable[Any]) -> None:
+        entries: list[Suggestion] = []
+        values: dict[str, Counter[str]] = {kind: Counter() for kind in SUGGEST_KINDS}
+        for r in rows:
+            if r.name:
+                entries.append(Suggestion("product", r.name, r.sku, 1))
+            for kind in SUGGEST_KINDS:
+                value = getattr(r, kind)
+                if value:
+                    values[kind][value] += 1
+        for kind in SUGGEST_KINDS:
+            entries.extend(Suggestion(kind, v, None, n) for v, n in values[kind].items())
+        self.entries = entries
+        self._counts = np.array([e.count for e in entries], dtype=np.int32)
+
+        keys: list[str] = []
+        key_entry: list[int] = []
+        key_offset: list[int] = []
+        vocabulary: set[str] = set()
+        for i, entry in enumerate(entries):
+            words = normalize(entry.text).split()
+            vocabulary.update(words)
+            for j in range(len(words)):
+                keys.append(" ".join(words[j:]))
+                key_entry.append(i)
+                key_offset.append(j)
+        order = sorted(range(len(keys)), key=keys.__getitem__)
+        self._keys = [keys[k] for k in order]
+        self._key_entry = np.array(key_entry, dtype=np.int32)[order]
+        self._key_start = np.array(key_offset, dtype=np.int32)[order] == 0
+
+        # Trigram inverted index over distinct words, for typo correction
+        self._words = sorted(vocabulary)
+        postings: dict[str, list[int]] = {}
+        for w, word in enumerate(self._words):
+            for gram in _trigrams(word):
+                postings.setdefault(gram, []).append(w)
+        self._postings = {g: np.array(ids, dtype=np.int32) for g, ids in postings.items()}
+        self._word_grams = np.array([len(_trigrams(word)) for word in self._words], dtype=np.int32)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def _lookup(self, prefix: str, limit: int) -> list[int]:
+        """Entry ids whose text has a word starting with `prefix`, best first."""
+        lo = bisect_left(self._keys, prefix)
+        hi = bisect_left(self._keys, prefix + "\uffff", lo)
+        if lo == hi:
+            return []
+        ids = self._key_entry[lo:hi]
+        # Matches at the start of the text first, then by product count
+        order = np.lexsort((-self._counts[ids], ~self._key_start[lo:hi]))
+        ranked = ids[order]
+        # First occurrence of each entry keeps its best rank
+        _, first = np.unique(ranked, return_index=True)
+        return ranked[np.sort(first)][:limit].tolist()
+
+    def _similar_words(self, token: str, *, prefix: bool) -> list[str]:
+        grams = _trigrams(token, prefix=prefix)
+        shared = np.zeros(len(self._words), dtype=np.int32)
+        for gram in grams:
+            ids = self._postings.get(gram)
+            if ids is not None:
+                shared[ids] += 1
+        similarity = shared / (len(grams) + self._word_grams - shared)
+        candidates = np.flatnonzero(similarity >= _MIN_SIMILARITY)
+        best = candidates[np.argsort(-similarity[candidates], kind="stable")]
+        return [self._words[w] for w in best[:_MAX_CORRECTIONS]]
+
+    def suggest(self, query: str, limit: int) -> tuple[list[Suggestion], str | None]:
+        """Return (suggestions, corrected query) — corrected is None for a direct match."""
+        prefix = normalize(query)
+        if not prefix:
+            return [], None
+        hits = self._lookup(prefix, limit)
+        if hits:
+            return [self.entries[i] for i in hits], None
+
+        # Typo fallback: correct each word, the last one as a prefix still being typed
+        tokens = prefix.split()
+        options = [
+            self._similar_words(t, prefix=i == len(tokens) - 1) or [t] for i, t in enumerate(tokens)
+        ]
+        # Only the most likely spelling of earlier words; try alternatives for the last one
+        for last in options[-1]:
+            candidate = " ".join([*(o[0] for o in options[:-1]), last])
+            hits = self._lookup(candidate, limit)
+            if hits:
+                return [self.entries[i] for i in hits], candidate
+        return [], None
@@ -1,3 +1,7 @@
+from datetime import UTC, datetime
+from decimal import Decimal
+from types import SimpleNamespace, UnionType
+from typing import get_origin
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import httpx
@@ -12,6 +16,7 @@ from backend.app import app  # noqa: E402
 from backend.auth import verify_admin, verify_auth  # noqa: E402
 from backend.config import ROLE_ADMIN, ROLE_USER  # noqa: E402
 from backend.db import get_db  # noqa: E402
+from backend.schemas.product import ProductOut  # noqa: E402
 
 # Shared test constants — used across test_auth, test_jwt_middleware, test_telegram_auth
 JWT_SECRET = "test-jwt-secret-key-for-unit-tests-32b"
@@ -45,6 +50,55 @@ def _mock_regular_user() -> MagicMock:
     return user
 
 
+# Timestamp given to every datetime field of _fake_product
+FAKE_TIMESTAMP = datetime(2025, 1, 1, tzinfo=UTC)
+
+# One dummy value per type — used to auto-populate _fake_product defaults
+_DUMMY_VALUES: dict[type, object] = {
+    str: "test",
+    Decimal: Decimal("9.99"),
+    float: 1.0,
+    int: 0,
+    bool: True,
+    list: [],
+}
+
+
+def _fake_product(**overrides):
+    """Build a fake Product object. Raises AttributeError on unknown attrs."""
+    defaults = {}
+    for name, field_info in ProductOut.model_fields.items():
+        annotation = field_info.annotation
+        # Unwrap Optional (str | None → str)
+        if isinstance(annotation, UnionType):
+            args = [a for a in annotation.__args__ if a is not type(None)]
+            annotation = args[0] if args else annotation
+        origin = get_origin(annotation)
+        defaults[name] = _DUMMY_VALUES.get(origin or annotation, FAKE_TIMESTAMP)
+    defaults.update(overrides)
+    return SimpleNamespace(**defaults)
+
+
+def _mock_session_factory() -> MagicMock:
+    """async_sessionmaker stand-in — `async with factory() as s` yields one AsyncMock session."""
+    session = AsyncMock()
+    factory = MagicMock()
+    factory.return_value.__aenter__ = AsyncMock(return_value=session)
+    factory.return_value.__aexit__ = AsyncMock(return_value=False)
+    return factory
+
+
+def _mock_settings(defaults: dict[str, object], /, **overrides: object) -> MagicMock:
+    """backend_settings stand-in with `defaults`, then `overrides`, set.
+
+    Set every flag the code under test reads — an unset MagicMock attribute is truthy.
+    """
+    settings = MagicMock()
+    for name, value in {**defaults, **overrides}.items():
+        setattr(settings, name, value)
+    return settings
+
+
 BASE_URL = "http://test"
 
 
@@ -105,6 +159,25 @@ def _reset_rate_limiter():
     yield
 
 
+@pytest.fixture(autouse=True)
+def _reset_product_caches():
+    """Clear memoized counts, responses, embeddings, intents, call latencies and catalog
+    version between tests."""
+    from backend.services._latency import clear_latency_windows
+    from backend.services.catalog import reset_catalog_version
+    from backend.services.intent import clear_intent_cache
+    from backend.services.products import clear_count_cache, clear_response_caches
+    from backend.services.recommendations import clear_embedding_cache
+
+    reset_catalog_version()
+    clear_count_cache()
+    clear_response_caches()
+    clear_embedding_cache()
+    clear_intent_cache()
+    clear_latency_windows()
+    yield
+
+
 @pytest.fixture(autouse=True)
 def _bypass_auth():
     """Bypass auth by default — tests that need real auth override this."""
@@ -222,6 +222,7 @@ async def test_jwt_unknown_user_returns_401(_real_auth_client):
         ("GET", "/api/stores/nearby?lat=45.5&lng=-73.6"),
         ("GET", "/api/watches?user_id=tg:1"),
         ("POST", "/api/recommendations"),
+        ("POST", "/api/recommendations/stream"),
     ],
 )
 async def test_protected_routes_reject_unauthenticated(unauthenticated_client, method, path):
@@ -0,0 +1,209 @@
+import asyncio
+from unittest.mock import AsyncMock
+
+import numpy as np
+import pytest
+from pydantic import BaseModel
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from backend.cache import EmbeddingCache, LRUCache, ResponseCache
+from backend.metrics import response_cache_requests
+
+
+class _Out(BaseModel):
+    value: int
+
+
+def _counter(outcome: str) -> float:
+    return response_cache_requests.labels(cache="test", outcome=outcome)._value.get()
+
+
+def test_lru_evicts_least_recently_used():
+    cache: LRUCache[str, int] = LRUCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert len(cache) == 2
+
+
+async def test_response_cache_keys_on_version():
+    cache = ResponseCache("test", _Out, maxsize=8, ttl=60)
+    compute = AsyncMock(side_effect=[_Out(value=1), _Out(value=2)])
+    hits_before = _counter("hit")
+
+    assert (await cache.get_or_compute(("k",), 1, compute)).value == 1
+    assert (await cache.get_or_compute(("k",), 1, compute)).value == 1
+    # A version bump makes the old entry unreachable
+    assert (await cache.get_or_compute(("k",), 2, compute)).value == 2
+
+    assert compute.await_count == 2
+    assert _counter("hit") == hits_before + 1
+
+
+async def test_concurrent_misses_share_one_computation():
+    cache = ResponseCache("test", _Out, maxsize=8, ttl=60)
+    release = asyncio.Event()
+    calls = 0
+
+    async def compute():
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return _Out(value=7)
+
+    tasks = [asyncio.create_task(cache.get_or_compute(("k",), 1, compute)) for _ in range(5)]
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*tasks)
+
+    assert calls == 1
+    assert {r.value for r in results} == {7}
+
+
+async def test_cancelled_leader_hands_over_to_a_waiter():
+    cache = ResponseCache("test", _Out, maxsize=8, ttl=60)
+    calls = 0
+
+    async def compute():
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            await asyncio.Event().wait()
+        return _Out(value=9)
+
+    leader = asyncio.create_task(cache.get_or_compute(("k",), 1, compute))
+    await asyncio.sleep(0)
+    waiters = [asyncio.create_task(cache.get_or_compute(("k",), 1, compute)) for _ in range(3)]
+    await asyncio.sleep(0)
+    leader.cancel()
+    results = await asyncio.gather(*waiters)
+
+    assert leader.cancelled()
+    assert {r.value for r in results} == {9}
+    # One waiter took over; the others coalesced onto it
+    assert calls == 2
+
+
+async def test_cancelled_waiter_does_not_retry():
+    cache = ResponseCache("test", _Out, maxsize=8, ttl=60)
+    release = asyncio.Event()
+
+    async def compute():
+        await release.wait()
+        return _Out(value=4)
+
+    leader = asyncio.create_task(cache.get_or_compute(("k",), 1, compute))
+    await asyncio.sleep(0)
+    waiter = asyncio.create_task(cache.get_or_compute(("k",), 1, compute))
+    await asyncio.sleep(0)
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+    release.set()
+    assert (await leader).value == 4
+
+
+async def test_failed_computation_is_not_cached():
+    cache = ResponseCache("test", _Out, maxsize=8, ttl=60)
+    compute = AsyncMock(side_effect=[RuntimeError("db down"), _Out(value=3)])
+
+    with pytest.raises(RuntimeError):
+        await cache.get_or_compute(("k",), 1, compute)
+    assert (await cache.get_or_compute(("k",), 1, compute)).value == 3
+
+
+async def test_shared_tier_read_skips_computation():
+    redis = AsyncMock()
+    redis.get.return_value = '{"value": 5}'
+    cache = ResponseCache("test", _Out, maxsize=8, ttl=60, redis=redis)
+    compute = AsyncMock()
+
+    result = await cache.get_or_compute(("k",), 4, compute)
+
+    assert result.value == 5
+    compute.assert_not_awaited()
+    assert redis.get.call_args.args[0].startswith("response:test:4:")
+
+
+async def test_shared_tier_written_on_miss():
+    redis = AsyncMock()
+    redis.get.return_value = None
+    cache = ResponseCache("test", _Out, maxsize=8, ttl=60, redis=redis)
+
+    await cache.get_or_compute(("k",), 4, AsyncMock(return_value=_Out(value=9)))
+
+    key, payload = redis.set.call_args.args
+    assert key == redis.get.call_args.args[0]
+    assert payload == '{"value":9}'
+    assert redis.set.call_args.kwargs["ex"] == 60
+
+
+async def test_shared_tier_errors_fall_back_to_computing():
+    redis = AsyncMock()
+    redis.get.side_effect = RedisConnectionError("unreachable")
+    redis.set.side_effect = RedisConnectionError("unreachable")
+    cache = ResponseCache("test", _Out, maxsize=8, ttl=60, redis=redis)
+
+    result = await cache.get_or_compute(("k",), 1, AsyncMock(return_value=_Out(value=1)))
+
+    assert result.value == 1
+    assert len(cache) == 1
+
+
+def _embedding_cache(redis=None) -> EmbeddingCache:
+    return EmbeddingCache(model="m", dimensions=3, maxsize=8, ttl=60, redis=redis)
+
+
+async def test_embedding_cache_normalizes_case_and_whitespace():
+    cache = _embedding_cache()
+    compute = AsyncMock(return_value=[0.5, 0.25, 0.125])
+
+    first = await cache.get_or_compute("  Rouge   Fruité", compute)
+    second = await cache.get_or_compute("rouge fruité", compute)
+
+    assert first == ([0.5, 0.25, 0.125], False)
+    assert second == ([0.5, 0.25, 0.125], True)
+    # The key is normalized, but the text embedded is the one the caller wrote
+    compute.assert_awaited_once_with("  Rouge   Fruité")
+
+
+async def test_embedding_cache_shares_float32_bytes():
+    redis = AsyncMock()
+    redis.get.return_value = None
+    writer = _embedding_cache(redis)
+    await writer.get_or_compute("boisé", AsyncMock(return_value=[0.5, -1.0, 2.0]))
+
+    key, payload = redis.set.call_args.args
+    assert key.startswith("embedding:m:3:")
+    assert payload == np.array([0.5, -1.0, 2.0], dtype=np.float32).tobytes()
+
+    # Another worker reads the bytes back instead of calling the API
+    redis.get.return_value = payload
+    compute = AsyncMock()
+    vector, cached = await _embedding_cache(redis).get_or_compute("Boisé", compute)
+    assert (vector, cached) == ([0.5, -1.0, 2.0], True)
+    compute.assert_not_awaited()
+
+
+async def test_embedding_cache_ignores_wrong_size_payload():
+    redis = AsyncMock()
+    redis.get.return_value = b"\x00" * 8
+    vector, cached = await _embedding_cache(redis).get_or_compute(
+        "x", AsyncMock(return_value=[1.0, 2.0, 3.0])
+    )
+    assert (vector, cached) == ([1.0, 2.0, 3.0], False)
+
+
+async def test_embedding_cache_warm_embeds_missing_in_one_batch():
+    cache = _embedding_cache()
+    await cache.get_or_compute("minéral", AsyncMock(return_value=[1.0, 0.0, 0.0]))
+    compute = AsyncMock(return_value=[[0.0, 1.0, 0.0], [0.0, 0.0, 1.0]])
+
+    embedded = await cache.warm(["minéral", "Tannique", "tannique", "sec"], compute)
+
+    assert embedded == 2
+    compute.assert_awaited_once_with(["Tannique", "sec"])
+    assert len(cache) == 3
@@ -0,0 +1,396 @@
+import random
+from datetime import UTC, datetime, timedelta
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+import pytest
+from fastapi import status
+
+from backend.app import app
+from backend.catalog_engine import (
+    PRICE_BUCKET_EDGES,
+    CatalogEngine,
+    CatalogSnapshot,
+    catalog_engine,
+)
+from backend.db import get_db, get_session_factory
+from backend.repositories.products import FacetRows
+from backend.services.products import get_random_product, list_products
+from backend.tests.conftest import _fake_product, _mock_session_factory, make_test_client
+from core.categories import classify_category
+
+NOW = datetime(2025, 1, 1, tzinfo=UTC)
+
+
+def _row(sku: str, **overrides):
+    defaults = {
+        "sku": sku,
+        "name": f"Wine {sku}",
+        "category": "Vin rouge",
+        "country": "France",
+        "region": None,
+        "grape": None,
+        "producer": None,
+        "appellation": None,
+        "price": Decimal("20.00"),
+        "online_availability": True,
+        "store_availability": None,
+        "updated_at": NOW,
+        "delisted_at": None,
+    }
+    defaults.update(overrides)
+    _, defaults["category_family"] = classify_category(defaults["category"])
+    return SimpleNamespace(**defaults)
+
+
+ROWS = [
+    _row("A1", name="Chablis", category="Vin blanc", region="Bourgogne", price=Decimal("30.50")),
+    _row("A2", name="Barolo", country="Italie", region="Piémont", price=Decimal("55.00")),
+    _row("A3", name=None, price=None, online_availability=False, store_availability=["23101"]),
+    _row("A4", name="Margaux", price=Decimal("30.50"), store_availability=["23101", "23102"]),
+    _row("A5", name="Cognac", category="Spiritueux", country="Portugal", price=Decimal("18.25")),
+    _row("A6", name="Barolo", country="Italie", price=None, updated_at=NOW + timedelta(days=1)),
+]
+
+
+def _pg_sorted(rows, attr: str, descending: bool) -> list[str]:
+    """Reference ordering with Postgres NULL placement and sku tie-break."""
+    present = sorted(
+        (r for r in rows if getattr(r, attr) is not None),
+        key=lambda r: (getattr(r, attr), r.sku),
+        reverse=descending,
+    )
+    nulls = sorted((r for r in rows if getattr(r, attr) is None), key=lambda r: r.sku)
+    if descending:
+        return [r.sku for r in reversed(nulls)] + [r.sku for r in present]
+    return [r.sku for r in present + nulls]
+
+
+@pytest.fixture()
+def snapshot() -> CatalogSnapshot:
+    return CatalogSnapshot(ROWS, version=3, name_order=_pg_sorted(ROWS, "name", False))
+
+
+# ── Filtering ────────────────────────────────────────────────────
+
+
+@pytest.mark.parametrize(
+    ("filters", "expected"),
+    [
+        ({}, 6),
+        ({"country": "Italie"}, 2),
+        ({"country": "Espagne"}, 0),
+        ({"category": ["Vin blanc", "Spiritueux"]}, 2),
+        ({"wine_scope": True}, 5),
+        ({"available": False}, 1),
+        ({"in_stores": ["23101"]}, 2),
+        ({"in_stores": ["99999"]}, 0),
+        ({"min_price": Decimal("30.50")}, 3),
+        ({"max_price": Decimal("20")}, 1),
+        ({"region": "Bourgogne", "category": ["Vin blanc"]}, 1),
+    ],
+)
+def test_count_matches_filter_semantics(snapshot, filters, expected):
+    assert snapshot.count(**filters) == expected
+
+
+# ── Sorting & pagination ─────────────────────────────────────────
+
+
+@pytest.mark.parametrize(
+    ("sort", "attr", "descending"),
+    [
+        (None, "name", False),
+        ("alpha", "name", False),
+        ("price_asc", "price", False),
+        ("price_desc", "price", True),
+        ("recent", "updated_at", True),
+    ],
+)
+def test_find_page_matches_postgres_order(snapshot, sort, attr, descending):
+    assert snapshot.find_page(0, 10, sort=sort) == _pg_sorted(ROWS, attr, descending)
+
+
+@pytest.mark.parametrize("sort", ["alpha", "price_asc", "price_desc", "recent"])
+def test_keyset_pages_match_offset_pages(snapshot, sort):
+    full = snapshot.find_page(0, 10, sort=sort)
+    by_sku = {r.sku: r for r in ROWS}
+    attr = {"alpha": "name", "price_asc": "price", "price_desc": "price"}.get(sort, "updated_at")
+
+    collected: list[str] = []
+    after = None
+    while True:
+        page = snapshot.find_page(0, 2, sort=sort, after=after)
+        if not page:
+            break
+        collected.extend(page)
+        last = by_sku[page[-1]]
+        after = (getattr(last, attr), last.sku)
+    assert collected == full
+
+
+def test_name_sort_follows_postgres_collation():
+    """Accents and case sort as the database collates them, not by codepoint."""
+    rows = [_row("C1", name="Érable"), _row("C2", name="abbaye"), _row("C3", name="Zinfandel")]
+    collated = CatalogSnapshot(rows, version=1, name_order=["C2", "C1", "C3"])
+    assert collated.find_page(0, 10, sort="alpha") == ["C2", "C1", "C3"]
+    assert collated.find_page(0, 10, sort="alpha", after=("abbaye", "C2")) == ["C1", "C3"]
+
+
+@pytest.mark.parametrize("name_order", [None, ["A1", "A2"]])
+def test_name_sort_left_to_sql_without_complete_name_order(name_order):
+    partial = CatalogSnapshot(ROWS, version=3, name_order=name_order)
+    assert partial.find_page(0, 10, sort="alpha") is None
+    assert partial.find_page(0, 10, sort="price_asc") == _pg_sorted(ROWS, "price", False)
+
+
+def test_keyset_returns_none_when_cursor_row_changed(snapshot):
+    assert snapshot.find_page(0, 2, sort="price_asc", after=(Decimal("99"), "A1")) is None
+    assert snapshot.find_page(0, 2, sort="price_asc", after=(Decimal("30.50"), "ZZ")) is None
+
+
+def test_find_page_applies_filters_and_offset(snapshot):
+    assert snapshot.find_page(1, 5, sort="alpha", country="France") == ["A4", "A3"]
+
+
+def test_random_sku_respects_filters(snapshot):
+    rng = random.Random(0)  # noqa: S311
+    picks = {snapshot.random_sku(rng, country="Italie") for _ in range(20)}
+    assert picks == {"A2", "A6"}
+    assert snapshot.random_sku(rng, country="Espagne") is None
+
+
+def test_random_skus_are_distinct_and_capped_by_matches(snapshot):
+    rng = random.Random(0)  # noqa: S311
+    picks = snapshot.random_skus(10, rng, wine_scope=True)
+    assert len(picks) == len(set(picks)) == snapshot.count(wine_scope=True)
+    assert snapshot.random_skus(3, rng, country="Espagne") == []
+
+
+# ── Facets ───────────────────────────────────────────────────────
+
+
+def test_distinct_values_sorted_and_filtered(snapshot):
+    assert snapshot.distinct_values("country") == ["France", "Italie", "Portugal"]
+    assert snapshot.distinct_values("region", wine_scope=True) == ["Bourgogne", "Piémont"]
+    assert snapshot.distinct_values("grape") == []
+
+
+def test_distinct_values_by_count_orders_by_count_then_value(snapshot):
+    assert snapshot.distinct_values_by_count("country") == [
+        ("France", 3),
+        ("Italie", 2),
+        ("Portugal", 1),
+    ]
+
+
+def test_facet_counts_cover_store_online_and_price_dimensions(snapshot):
+    assert snapshot.facet_counts("store") == [("23101", 2), ("23102", 1)]
+    assert snapshot.facet_counts("store", country="Italie") == []
+    assert snapshot.facet_counts("online", wine_scope=True) == [("online", 4)]
+    assert snapshot.facet_counts("category", country="France") == [
+        ("Vin blanc", 1),
+        ("Vin rouge", 2),
+    ]
+
+
+def test_facets_by_count_ranks_each_dimension(snapshot):
+    table = snapshot.facets_by_count(("country", "region", "store"), available=True)
+    assert table["country"] == [("France", 2), ("Italie", 2), ("Portugal", 1)]
+    assert table["region"] == [("Bourgogne", 1), ("Piémont", 1)]
+    assert table["store"] == [("23101", 1), ("23102", 1)]
+
+
+def test_price_histogram_includes_empty_buckets(snapshot):
+    histogram = snapshot.price_histogram()
+    assert len(histogram) == len(PRICE_BUCKET_EDGES)
+    assert histogram[-1] == (Decimal("200"), None, 0)
+    # NULL prices fall in no bucket
+    assert {lower: cnt for lower, _, cnt in histogram if cnt} == {
+        Decimal("15"): 1,
+        Decimal("30"): 2,
+        Decimal("50"): 1,
+    }
+
+
+def test_facet_counts_span_bitmap_words():
+    """Ordinals past the first 64-bit word are counted, and padding bits never are."""
+    rows = [_row(f"S{i:03d}", country="Italie" if i % 3 else "France") for i in range(130)]
+    big = CatalogSnapshot(rows, version=1)
+    assert big.facet_counts("country") == [("France", 44), ("Italie", 86)]
+    assert big.facet_counts("country", min_price=Decimal("99")) == []
+
+
+def test_price_range_ignores_null_prices(snapshot):
+    assert snapshot.price_range() == (Decimal("18.25"), Decimal("55.00"))
+    assert snapshot.price_range(in_stores=["23101"]) == (Decimal("30.50"), Decimal("30.50"))
+    assert snapshot.price_range(country="Espagne") is None
+
+
+# ── Engine lifecycle ─────────────────────────────────────────────
+
+
+async def test_refresh_merges_changed_rows_incrementally():
+    engine = CatalogEngine()
+    engine._session_factory = _mock_session_factory()
+    with (
+        patch("backend.catalog_engine.get_version", new_callable=AsyncMock) as mock_version,
+        patch("backend.catalog_engine.fetch_catalog_rows", new_callable=AsyncMock) as mock_fetch,
+        patch("backend.catalog_engine.fetch_name_order", new_callable=AsyncMock) as mock_names,
+    ):
+        mock_version.return_value = 1
+        mock_fetch.return_value = ROWS
+        mock_names.return_value = _pg_sorted(ROWS, "name", False)
+        await engine.refresh()
+        assert mock_fetch.call_args.kwargs["since"] is None
+
+        later = NOW + timedelta(days=2)
+        mock_version.return_value = 2
+        mock_fetch.return_value = [
+            _row("A1", delisted_at=later, updated_at=later),
+            _row("B1", name="Bandol", updated_at=later),
+        ]
+        mock_names.return_value = ["A2", "A6", "B1", "A5", "A4", "A3"]
+        await engine.refresh()
+
+    assert mock_fetch.call_args.kwargs["since"] < NOW + timedelta(days=1)
+    assert engine.get(2) is engine.snapshot
+    assert "A1" not in engine.snapshot.skus
+    assert "B1" in engine.snapshot.skus
+    assert len(engine.snapshot) == len(ROWS)
+    assert engine.snapshot.find_page(0, 3, sort="alpha") == ["A2", "A6", "B1"]
+
+
+async def test_get_returns_none_and_refreshes_on_version_change(snapshot):
+    engine = CatalogEngine()
+    engine.snapshot = snapshot
+    engine._session_factory = _mock_session_factory()
+    with patch.object(engine, "refresh", new_callable=AsyncMock) as mock_refresh:
+        assert engine.get(3) is snapshot
+        assert engine.get(4) is None
+        await engine._refresh_task
+    mock_refresh.assert_awaited_once()
+
+
+def test_get_is_cold_until_started():
+    assert CatalogEngine().get(0) is None
+
+
+# ── Service integration ──────────────────────────────────────────
+
+
+@pytest.fixture()
+def warm_engine(snapshot):
+    catalog_engine.snapshot = snapshot
+    catalog_engine._session_factory = _mock_session_factory()
+    mock_v = AsyncMock(return_value=snapshot.version)
+    with (
+        patch("backend.services.products.catalog_version", mock_v),
+        patch("backend.api.products.catalog_version", mock_v),
+    ):
+        yield
+    catalog_engine.snapshot = None
+    catalog_engine._session_factory = None
+
+
+async def test_list_products_served_from_engine(warm_engine):
+    hydrated = [_fake_product(sku=sku) for sku in ("A6", "A2")]
+    session = AsyncMock()
+    result = MagicMock()
+    result.scalars.return_value.all.return_value = hydrated
+    session.execute = AsyncMock(return_value=result)
+
+    page = await list_products(session, 20, 0, country="Italie")
+
+    assert page.total == 2
+    assert [p.sku for p in page.products] == ["A2", "A6"]
+    # Only the primary-key hydration query reaches Postgres
+    session.execute.assert_called_once()
+
+
+async def test_random_served_from_engine(warm_engine):
+    product = _fake_product(sku="A5")
+    with (
+        patch("backend.services.products.find_by_sku", new_callable=AsyncMock) as mock_find,
+        patch("backend.services.products.find_random", new_callable=AsyncMock) as mock_sql,
+    ):
+        mock_find.return_value = product
+        result = await get_random_product(AsyncMock(), country="Portugal")
+    assert result.sku == "A5"
+    assert mock_find.call_args.args[1] == "A5"
+    mock_sql.assert_not_called()
+
+
+async def test_random_not_found_from_engine(warm_engine):
+    app.dependency_overrides[get_db] = lambda: AsyncMock()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        resp = await client.get("/api/products/random?country=Espagne")
+    assert resp.status_code == status.HTTP_404_NOT_FOUND
+
+
+async def test_facets_served_from_engine(warm_engine):
+    factory = _mock_session_factory()
+    app.dependency_overrides[get_session_factory] = lambda: factory
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        resp = await client.get("/api/products/facets?in_stores=23101")
+    data = resp.json()
+    assert data["categories"] == ["Vin blanc", "Vin rouge"]
+    assert data["countries"] == [{"name": "France", "count": 2}]
+    assert data["price_range"] == {"min": "30.50", "max": "30.50"}
+    assert data["regions"] == []
+    # Store and online counts ignore their own filter
+    assert data["store_counts"] == [
+        {"name": "23101", "count": 2},
+        {"name": "23102", "count": 1},
+    ]
+    assert data["online_count"] == 1
+    assert [b["count"] for b in data["price_histogram"] if b["count"]] == [1]
+    # One session for the version check, none for the facet queries
+    assert factory.call_count == 1
+
+
+async def test_facets_from_sql_while_engine_lags_keep_store_counts(snapshot):
+    """Facets cached while the engine lags a version bump carry the same store counts."""
+    sql_rows = FacetRows(
+        categories=[("Vin rouge", 4), ("Spiritueux", 1), ("Vin blanc", 1)],
+        countries=[("France", 3)],
+        regions=[],
+        grapes=[],
+        price_range=(Decimal("18.25"), Decimal("55.00")),
+        price_histogram=[],
+        stores=[("23101", 2), ("23102", 1)],
+        online_count=5,
+    )
+    catalog_engine.snapshot = snapshot
+    catalog_engine._session_factory = _mock_session_factory()
+    factory = _mock_session_factory()
+    app.dependency_overrides[get_session_factory] = lambda: factory
+    try:
+        with (
+            patch("backend.services.products.catalog_version", AsyncMock(return_value=4)),
+            patch("backend.api.products.catalog_version", AsyncMock(return_value=4)),
+            patch.object(catalog_engine, "refresh", AsyncMock()),
+            patch(
+                "backend.services.products.get_facet_rows", AsyncMock(return_value=sql_rows)
+            ) as mock_sql,
+        ):
+            async with make_test_client() as client:
+                lagging = (await client.get("/api/products/facets")).json()
+                # The refresh lands; the version-4 entry cached above is served as is
+                catalog_engine.snapshot = CatalogSnapshot(ROWS, version=4)
+                warm = (await client.get("/api/products/facets")).json()
+    finally:
+        catalog_engine.snapshot = None
+        catalog_engine._session_factory = None
+
+    mock_sql.assert_awaited_once()
+    assert lagging["store_counts"] == [
+        {"name": "23101", "count": 2},
+        {"name": "23102", "count": 1},
+    ]
+    assert lagging["online_count"] == 5
+    assert warm == lagging
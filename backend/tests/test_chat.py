@@ -13,7 +13,12 @@ from backend.db import get_db
 from backend.exceptions import ForbiddenError, NotFoundError
 from backend.schemas.chat import ChatMessageOut, ChatSessionDetailOut
 from backend.schemas.recommendation import IntentResult, RecommendationOut
-from backend.services.chat import _build_message_out, _extract_multi_turn_context, send_message
+from backend.services.chat import (
+    _build_message_out,
+    _extract_multi_turn_context,
+    send_message,
+    stream_message,
+)
 from backend.tests.conftest import _mock_authenticated_user
 
 NOW = datetime(2026, 3, 12, 12, 0, 0, tzinfo=UTC)
@@ -113,6 +118,18 @@ async def test_send_message_not_owner():
     assert resp.status_code == status.HTTP_403_FORBIDDEN
 
 
+async def test_stream_message_session_not_found_before_streaming():
+    """404 — ownership is checked before the event stream starts."""
+    with patch("backend.api.chat.stream_message", new_callable=AsyncMock) as mock_stream:
+        mock_stream.side_effect = NotFoundError("ChatSession", "999")
+        async with _setup() as client:
+            resp = await client.post(
+                "/api/chat/sessions/999/messages/stream", json={"message": "hello"}
+            )
+
+    assert resp.status_code == status.HTTP_404_NOT_FOUND
+
+
 # --- GET /api/chat/sessions (list) ---
 
 
@@ -455,6 +472,68 @@ class TestSendMessageRouting:
 # --- _build_message_out ---
 
 
+class TestStreamMessage:
+    """stream_message() — recommend_stream's events, then the saved assistant message."""
+
+    @patch("backend.services.chat.chat_repo")
+    @patch("backend.services.chat.recommend_stream")
+    @patch("backend.services.chat.parse_intent", new_callable=AsyncMock)
+    async def test_recommendation_events_then_saved_message(
+        self,
+        mock_parse: AsyncMock,
+        mock_recommend_stream: AsyncMock,
+        mock_repo: AsyncMock,
+    ) -> None:
+        intent = IntentResult(intent_type="recommendation", semantic_query="bold red")
+        mock_parse.return_value = intent
+        rec = _fake_recommendation()
+
+        async def events(*_args, **_kwargs):
+            yield "intent", intent
+            yield "summary", rec
+            yield "done", rec
+
+        mock_recommend_stream.side_effect = events
+        mock_repo.find_by_id = AsyncMock(return_value=_fake_session(user_id=1))
+        mock_repo.find_messages = AsyncMock(return_value=[])
+        mock_repo.create_message = AsyncMock(
+            return_value=_fake_chat_message(2, "assistant", rec.model_dump_json())
+        )
+
+        db = AsyncMock()
+        stream = await stream_message(db, user_id=1, session_id=1, message="bold red")
+        # The user message is saved before any event is read
+        mock_repo.create_message.assert_called_once_with(db, 1, "user", "bold red")
+
+        events_out = [(event, data) async for event, data in stream]
+
+        assert [event for event, _ in events_out] == ["intent", "summary", "message"]
+        assert mock_recommend_stream.call_args.kwargs["intent"] is intent
+        assert isinstance(events_out[-1][1].content, RecommendationOut)
+        mock_repo.create_message.assert_called_with(db, 1, "assistant", rec.model_dump_json())
+
+    @patch("backend.services.chat.chat_repo")
+    @patch("backend.services.chat.parse_intent", new_callable=AsyncMock)
+    async def test_off_topic_sends_intent_then_message(
+        self,
+        mock_parse: AsyncMock,
+        mock_repo: AsyncMock,
+    ) -> None:
+        mock_parse.return_value = IntentResult(intent_type="off_topic")
+        mock_repo.find_by_id = AsyncMock(return_value=_fake_session(user_id=1))
+        mock_repo.find_messages = AsyncMock(return_value=[])
+        mock_repo.create_message = AsyncMock(
+            return_value=_fake_chat_message(2, "assistant", NON_WINE_MESSAGE)
+        )
+
+        db = AsyncMock()
+        stream = await stream_message(db, user_id=1, session_id=1, message="pizza?")
+        events_out = [event async for event, _ in stream]
+
+        assert events_out == ["intent", "message"]
+        mock_repo.create_message.assert_called_with(db, 1, "assistant", NON_WINE_MESSAGE)
+
+
 class TestBuildMessageOut:
     def test_deserializes_valid_assistant_recommendation(self) -> None:
         rec = _fake_recommendation()
@@ -0,0 +1,50 @@
+from datetime import UTC, datetime, timedelta
+from email.utils import format_datetime
+
+from starlette.requests import Request
+
+from backend.conditional import is_not_modified, strong_etag, validators
+
+MODIFIED = datetime(2025, 3, 1, 12, 0, 0, 500_000, tzinfo=UTC)
+
+
+def _request(**headers: str) -> Request:
+    raw = [(k.replace("_", "-").encode(), v.encode()) for k, v in headers.items()]
+    return Request({"type": "http", "method": "GET", "headers": raw})
+
+
+def test_strong_etag_is_quoted_and_deterministic():
+    tag = strong_etag("product", "123", 4)
+    assert tag.startswith('"') and tag.endswith('"')
+    assert tag == strong_etag("product", "123", 4)
+    assert tag != strong_etag("product", "123", 5)
+
+
+def test_if_none_match_matches_listed_weak_or_wildcard_tags():
+    tag = strong_etag("facets", 1)
+    assert is_not_modified(_request(if_none_match=f'"other", {tag}'), tag, None)
+    assert is_not_modified(_request(if_none_match=f"W/{tag}"), tag, None)
+    assert is_not_modified(_request(if_none_match="*"), tag, None)
+    assert not is_not_modified(_request(if_none_match='"other"'), tag, None)
+
+
+def test_if_none_match_takes_precedence_over_if_modified_since():
+    since = format_datetime(MODIFIED + timedelta(days=1), usegmt=True)
+    request = _request(if_none_match='"stale"', if_modified_since=since)
+    assert not is_not_modified(request, strong_etag("x"), MODIFIED)
+
+
+def test_if_modified_since_compares_at_second_precision():
+    tag = strong_etag("x")
+    same_second = format_datetime(MODIFIED.replace(microsecond=0), usegmt=True)
+    earlier = format_datetime(MODIFIED - timedelta(seconds=1), usegmt=True)
+    assert is_not_modified(_request(if_modified_since=same_second), tag, MODIFIED)
+    assert not is_not_modified(_request(if_modified_since=earlier), tag, MODIFIED)
+    assert not is_not_modified(_request(if_modified_since="not a date"), tag, MODIFIED)
+
+
+def test_validators_emit_http_date_and_private_cache_control():
+    headers = validators('"abc"', MODIFIED, 60)
+    assert headers["ETag"] == '"abc"'
+    assert headers["Last-Modified"] == "Sat, 01 Mar 2025 12:00:00 GMT"
+    assert headers["Cache-Control"] == "private, max-age=60, must-revalidate"
@@ -1,12 +1,16 @@
+import asyncio
+from types import SimpleNamespace
 from unittest.mock import AsyncMock, MagicMock, patch
 
 from backend.services.curation import (
+    ExplanationReason,
     ExplanationResult,
     _build_user_message,
     _fallback,
     _format_wine,
     _parse_tool_input,
     explain_recommendations,
+    stream_explanations,
 )
 
 
@@ -163,6 +167,21 @@ class TestExplainRecommendations:
         assert len(result.reasons) == 1
         assert result.reasons[0] == ""
 
+    @patch("backend.services.curation.get_anthropic_client")
+    @patch("backend.services.curation.backend_settings")
+    async def test_timeout_returns_fallback(
+        self, mock_settings: MagicMock, mock_get_client: MagicMock
+    ) -> None:
+        mock_settings.ANTHROPIC_API_KEY = "sk-test"
+
+        async def slow(**_kwargs: object) -> None:
+            await asyncio.sleep(1)
+
+        mock_get_client.return_value.messages.create = AsyncMock(side_effect=slow)
+
+        result = await explain_recommendations("query", [_fake_product()], timeout=0.01)
+        assert result == ExplanationResult(reasons=[""], summary="")
+
     @patch("backend.services.curation.get_anthropic_client")
     @patch("backend.services.curation.backend_settings")
     async def test_no_tool_use_block_returns_fallback(
@@ -181,3 +200,145 @@ class TestExplainRecommendations:
         products = [_fake_product()]
         result = await explain_recommendations("query", products)
         assert result.reasons[0] == ""
+
+
+class _FakeStream:
+    """messages.stream() context: input_json events with the given snapshots."""
+
+    def __init__(
+        self,
+        snapshots: list[dict],
+        *,
+        final: MagicMock | None = None,
+        error: Exception | None = None,
+    ) -> None:
+        self.snapshots = snapshots
+        self.final = final
+        self.error = error
+
+    async def __aenter__(self) -> "_FakeStream":
+        return self
+
+    async def __aexit__(self, *exc: object) -> bool:
+        return False
+
+    async def __aiter__(self):
+        yield SimpleNamespace(type="message_start")
+        for snapshot in self.snapshots:
+            yield SimpleNamespace(type="input_json", snapshot=snapshot)
+        if self.error is not None:
+            raise self.error
+
+    async def get_final_message(self) -> MagicMock | None:
+        return self.final
+
+
+class _StalledStream(_FakeStream):
+    """Sends its snapshots, then goes quiet."""
+
+    async def __aiter__(self):
+        for snapshot in self.snapshots:
+            yield SimpleNamespace(type="input_json", snapshot=snapshot)
+        await asyncio.sleep(10)
+
+
+def _tool_response(tool_input: dict) -> MagicMock:
+    block = MagicMock()
+    block.type = "tool_use"
+    block.name = "explain"
+    block.input = tool_input
+    response = MagicMock()
+    response.content = [block]
+    return response
+
+
+async def _collect(products: list[MagicMock]) -> list:
+    return [part async for part in stream_explanations("bold red", products)]
+
+
+class TestStreamExplanations:
+    @patch("backend.services.curation.get_anthropic_client")
+    @patch("backend.services.curation.backend_settings")
+    async def test_yields_each_reason_once_then_the_result(
+        self, mock_settings: MagicMock, mock_get_client: MagicMock
+    ) -> None:
+        mock_settings.ANTHROPIC_API_KEY = "sk-test"
+        full = {"reasons": ["First", "Second"], "summary": "Both bold"}
+        mock_get_client.return_value.messages.stream.return_value = _FakeStream(
+            [{}, {"reasons": ["First"]}, {"reasons": ["First"]}, full],
+            final=_tool_response(full),
+        )
+
+        parts = await _collect([_fake_product(), _fake_product()])
+
+        assert parts == [
+            ExplanationReason(index=0, reason="First"),
+            ExplanationReason(index=1, reason="Second"),
+            ExplanationResult(reasons=["First", "Second"], summary="Both bold"),
+        ]
+
+    @patch("backend.services.curation.get_anthropic_client")
+    @patch("backend.services.curation.backend_settings")
+    async def test_stalled_stream_times_out_keeping_reasons_already_sent(
+        self, mock_settings: MagicMock, mock_get_client: MagicMock
+    ) -> None:
+        mock_settings.ANTHROPIC_API_KEY = "sk-test"
+        mock_get_client.return_value.messages.stream.return_value = _StalledStream(
+            [{"reasons": ["First"]}]
+        )
+
+        parts = [
+            part
+            async for part in stream_explanations(
+                "bold red", [_fake_product(), _fake_product()], timeout=0.05
+            )
+        ]
+
+        assert parts == [
+            ExplanationReason(index=0, reason="First"),
+            ExplanationResult(reasons=["First", ""], summary=""),
+        ]
+
+    @patch("backend.services.curation.get_anthropic_client")
+    @patch("backend.services.curation.backend_settings")
+    async def test_broken_stream_keeps_reasons_already_sent(
+        self, mock_settings: MagicMock, mock_get_client: MagicMock
+    ) -> None:
+        import anthropic
+
+        mock_settings.ANTHROPIC_API_KEY = "sk-test"
+        mock_get_client.return_value.messages.stream.return_value = _FakeStream(
+            [{"reasons": ["First"]}],
+            error=anthropic.APIError(message="overloaded", request=MagicMock(), body=None),
+        )
+
+        parts = await _collect([_fake_product(), _fake_product()])
+
+        assert parts == [
+            ExplanationReason(index=0, reason="First"),
+            ExplanationResult(reasons=["First", ""], summary=""),
+        ]
+
+    @patch("backend.services.curation.get_anthropic_client")
+    @patch("backend.services.curation.backend_settings")
+    async def test_extra_reasons_are_not_streamed(
+        self, mock_settings: MagicMock, mock_get_client: MagicMock
+    ) -> None:
+        mock_settings.ANTHROPIC_API_KEY = "sk-test"
+        full = {"reasons": ["Only", "Extra"], "summary": "One wine"}
+        mock_get_client.return_value.messages.stream.return_value = _FakeStream(
+            [full], final=_tool_response(full)
+        )
+
+        parts = await _collect([_fake_product()])
+
+        assert parts == [
+            ExplanationReason(index=0, reason="Only"),
+            ExplanationResult(reasons=["Only"], summary="One wine"),
+        ]
+
+    @patch("backend.services.curation.backend_settings")
+    async def test_no_api_key_yields_fallback(self, mock_settings: MagicMock) -> None:
+        mock_settings.ANTHROPIC_API_KEY = ""
+        assert await _collect([_fake_product()]) == [_fallback(1)]
+        assert await _collect([]) == [ExplanationResult(reasons=[], summary="")]
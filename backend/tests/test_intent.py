@@ -1,8 +1,10 @@
+import asyncio
 from decimal import Decimal
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import anthropic
 
+from backend.schemas.recommendation import IntentResult
 from backend.services.intent import parse_intent
 
 
@@ -125,6 +127,30 @@ class TestParseIntent:
         assert result.intent_type == "recommendation"
         assert result.categories == []
 
+    @patch("backend.services.intent.get_anthropic_client")
+    @patch("backend.services.intent.backend_settings")
+    async def test_falls_back_on_timeout(
+        self, mock_settings: MagicMock, mock_get_client: MagicMock
+    ) -> None:
+        mock_settings.ANTHROPIC_API_KEY = "sk-test"
+        mock_settings.INTENT_CACHE_ENABLED = True
+        mock_client = AsyncMock()
+        mock_get_client.return_value = mock_client
+
+        async def slow(**_kwargs: object) -> MagicMock:
+            await asyncio.sleep(1)
+            return _mock_tool_use_response("off_topic", {})
+
+        mock_client.messages.create.side_effect = slow
+
+        result = await parse_intent("un rouge", timeout=0.01)
+
+        assert result == IntentResult(semantic_query="un rouge")
+        # The fallback isn't cached — the next call asks again
+        mock_client.messages.create.side_effect = None
+        mock_client.messages.create.return_value = _mock_tool_use_response("off_topic", {})
+        assert (await parse_intent("un rouge")).intent_type == "off_topic"
+
     @patch("backend.services.intent.backend_settings")
     async def test_falls_back_when_no_api_key(self, mock_settings: MagicMock) -> None:
         mock_settings.ANTHROPIC_API_KEY = ""
@@ -225,3 +251,81 @@ class TestParseIntent:
         assert len(call_messages) == 1
         assert "Prior conversation" in call_messages[0]["content"]
         assert "what about something lighter?" in call_messages[0]["content"]
+
+
+class TestIntentCache:
+    @patch("backend.services.intent.get_anthropic_client")
+    @patch("backend.services.intent.backend_settings")
+    async def test_repeated_query_skips_the_llm(
+        self, mock_settings: MagicMock, mock_get_client: MagicMock
+    ) -> None:
+        mock_settings.ANTHROPIC_API_KEY = "sk-test"
+        mock_settings.INTENT_CACHE_ENABLED = True
+        mock_client = AsyncMock()
+        mock_get_client.return_value = mock_client
+        mock_client.messages.create.return_value = _mock_tool_use_response(
+            "search_wines", {"categories": ["Vin rouge"], "semantic_query": "fruité"}
+        )
+
+        first = await parse_intent("Un rouge fruité  autour de 25$")
+        first.categories.append("Vin blanc")  # callers can't corrupt the cached copy
+        second = await parse_intent("un rouge fruité autour de 25$")
+
+        mock_client.messages.create.assert_awaited_once()
+        assert second.categories == ["Vin rouge"]
+        assert second.semantic_query == "fruité"
+
+    @patch("backend.services.intent.get_anthropic_client")
+    @patch("backend.services.intent.backend_settings")
+    async def test_conversation_history_bypasses_cache(
+        self, mock_settings: MagicMock, mock_get_client: MagicMock
+    ) -> None:
+        mock_settings.ANTHROPIC_API_KEY = "sk-test"
+        mock_settings.INTENT_CACHE_ENABLED = True
+        mock_client = AsyncMock()
+        mock_get_client.return_value = mock_client
+        mock_client.messages.create.return_value = _mock_tool_use_response(
+            "search_wines", {"semantic_query": "lighter"}
+        )
+
+        await parse_intent("something lighter")
+        await parse_intent("something lighter", conversation_history="User: bold red")
+
+        assert mock_client.messages.create.await_count == 2
+
+    @patch("backend.services.intent.get_anthropic_client")
+    @patch("backend.services.intent.backend_settings")
+    async def test_api_error_fallback_not_cached(
+        self, mock_settings: MagicMock, mock_get_client: MagicMock
+    ) -> None:
+        mock_settings.ANTHROPIC_API_KEY = "sk-test"
+        mock_settings.INTENT_CACHE_ENABLED = True
+        mock_client = AsyncMock()
+        mock_get_client.return_value = mock_client
+        mock_client.messages.create.side_effect = [
+            anthropic.APIError(message="overloaded", request=MagicMock(), body=None),
+            _mock_tool_use_response("wine_chat", {}),
+        ]
+
+        await parse_intent("tell me about Burgundy")
+        result = await parse_intent("tell me about Burgundy")
+
+        assert result.intent_type == "wine_chat"
+        assert mock_client.messages.create.await_count == 2
+
+    @patch("backend.services.intent.get_anthropic_client")
+    @patch("backend.services.intent.backend_settings")
+    async def test_prompt_change_invalidates_entries(
+        self, mock_settings: MagicMock, mock_get_client: MagicMock
+    ) -> None:
+        mock_settings.ANTHROPIC_API_KEY = "sk-test"
+        mock_settings.INTENT_CACHE_ENABLED = True
+        mock_client = AsyncMock()
+        mock_get_client.return_value = mock_client
+        mock_client.messages.create.return_value = _mock_tool_use_response("off_topic", {})
+
+        await parse_intent("do you have beer?")
+        with patch("backend.services.intent._PROMPT_FINGERPRINT", "edited-prompt"):
+            await parse_intent("do you have beer?")
+
+        assert mock_client.messages.create.await_count == 2
@@ -0,0 +1,102 @@
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from backend.services._latency import LatencyBudget, _windows, call_with_deadline
+from backend.tests.conftest import _mock_settings
+
+_SETTINGS = {
+    "LATENCY_BUDGET": 10.0,
+    "INTENT_TIMEOUT": 3.0,
+    "EMBED_TIMEOUT": 2.0,
+    "CURATION_TIMEOUT": 8.0,
+    "SOMMELIER_TIMEOUT": 10.0,
+    "HEDGE_REQUESTS": True,
+}
+
+
+async def _warm_up(stage: str, seconds: float = 0.01, samples: int = 20) -> None:
+    """Record `samples` calls of `seconds` each, so the stage has a p95 to hedge at."""
+    with patch(
+        "backend.services._latency.backend_settings",
+        _mock_settings(_SETTINGS, HEDGE_REQUESTS=False),
+    ):
+        for _ in range(samples):
+            await call_with_deadline(lambda: asyncio.sleep(seconds), stage=stage, timeout=None)
+
+
+class TestLatencyBudget:
+    @patch("backend.services._latency.backend_settings", _mock_settings(_SETTINGS))
+    def test_stage_gets_its_cap_while_the_budget_lasts(self) -> None:
+        budget = LatencyBudget(10.0)
+        assert budget.timeout("intent") == 3.0
+        assert budget.timeout("sommelier") == pytest.approx(10.0, abs=0.1)
+
+    @patch("backend.services._latency.backend_settings", _mock_settings(_SETTINGS))
+    def test_stage_gets_what_is_left_when_the_budget_runs_low(self) -> None:
+        budget = LatencyBudget(1.0)
+        assert 0.9 < budget.timeout("curation") <= 1.0
+        assert LatencyBudget(-1.0).timeout("curation") == 0.0
+
+
+class TestCallWithDeadline:
+    async def test_raises_timeout_error_past_the_deadline(self) -> None:
+        with pytest.raises(TimeoutError):
+            await call_with_deadline(lambda: asyncio.sleep(1), stage="curation", timeout=0.01)
+
+    async def test_slow_call_is_hedged_and_the_duplicate_wins(self) -> None:
+        await _warm_up("intent")
+        calls: list[asyncio.Event] = []
+
+        async def call() -> int:
+            cancelled = asyncio.Event()
+            calls.append(cancelled)
+            try:
+                # The first call hangs; its duplicate answers at once
+                await asyncio.sleep(1 if len(calls) == 1 else 0)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+            return len(calls)
+
+        with patch("backend.services._latency.backend_settings", _mock_settings(_SETTINGS)):
+            result = await call_with_deadline(call, stage="intent", timeout=0.5, hedge=True)
+
+        assert result == 2
+        assert calls[0].is_set()  # the straggler was cancelled
+
+    async def test_fast_call_is_not_hedged(self) -> None:
+        await _warm_up("embed", seconds=0.05)
+        started = 0
+
+        async def call() -> str:
+            nonlocal started
+            started += 1
+            return "vector"
+
+        with patch("backend.services._latency.backend_settings", _mock_settings(_SETTINGS)):
+            assert await call_with_deadline(call, stage="embed", timeout=1, hedge=True) == "vector"
+        assert started == 1
+
+    async def test_no_hedge_without_enough_history(self) -> None:
+        await _warm_up("intent", samples=5)
+        assert _windows["intent"].p95() is None
+
+    async def test_error_from_both_calls_surfaces_the_first(self) -> None:
+        await _warm_up("intent")
+        calls = 0
+
+        async def call() -> None:
+            nonlocal calls
+            calls += 1
+            n = calls
+            await asyncio.sleep(0.1 if n == 1 else 0)
+            raise RuntimeError(f"call {n}")
+
+        with (
+            patch("backend.services._latency.backend_settings", _mock_settings(_SETTINGS)),
+            pytest.raises(RuntimeError, match="call 1"),
+        ):
+            await call_with_deadline(call, stage="intent", timeout=1, hedge=True)
+        assert calls == 2
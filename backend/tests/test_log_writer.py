@@ -0,0 +1,194 @@
+import asyncio
+import itertools
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from backend.log_writer import RecommendationLogWriter
+from backend.metrics import recommendation_log_writes
+from backend.services.recommendations import _write_log
+from backend.tests.conftest import _mock_session_factory, _mock_settings
+
+_SETTINGS = {
+    "RECOMMENDATION_LOG_BATCH_SIZE": 3,
+    "RECOMMENDATION_LOG_FLUSH_MS": 20,
+    "RECOMMENDATION_LOG_QUEUE_SIZE": 10,
+}
+
+
+@pytest.fixture()
+def repo():
+    """allocate_log_ids hands out consecutive blocks; insert_logs records each batch."""
+    counter = itertools.count(101)
+    batches: list[list[dict]] = []
+
+    async def allocate(_db, n: int) -> list[int]:
+        return [next(counter) for _ in range(n)]
+
+    async def insert(_db, rows: list[dict]) -> None:
+        batches.append([row["id"] for row in rows])
+
+    with (
+        patch("backend.log_writer.allocate_log_ids", side_effect=allocate) as mock_allocate,
+        patch("backend.log_writer.insert_logs", side_effect=insert),
+    ):
+        yield mock_allocate, batches
+
+
+async def _started(settings: MagicMock) -> RecommendationLogWriter:
+    writer = RecommendationLogWriter()
+    with patch("backend.log_writer.backend_settings", settings):
+        writer.start(_mock_session_factory())
+    return writer
+
+
+async def test_ids_come_from_preallocated_blocks_and_full_batches_flush(repo):
+    mock_allocate, batches = repo
+    with patch(
+        "backend.log_writer.backend_settings",
+        _mock_settings(_SETTINGS, RECOMMENDATION_LOG_FLUSH_MS=10_000),
+    ):
+        writer = await _started(_mock_settings(_SETTINGS, RECOMMENDATION_LOG_FLUSH_MS=10_000))
+        ids = [await writer.submit(AsyncMock(), query=f"q{i}") for i in range(4)]
+        await asyncio.sleep(0.01)
+
+        assert ids == [101, 102, 103, 104]
+        assert mock_allocate.await_count == 2  # one round trip per block of 3
+        assert batches == [[101, 102, 103]]  # full batch, without waiting for the timer
+        await writer.stop()
+
+    assert batches == [[101, 102, 103], [104]]  # stop() flushes the rest
+
+
+async def test_ids_are_drawn_on_the_submitting_session(repo):
+    mock_allocate, _ = repo
+    with patch("backend.log_writer.backend_settings", _mock_settings(_SETTINGS)):
+        writer = await _started(_mock_settings(_SETTINGS))
+        db = AsyncMock()
+        await writer.submit(db, query="rouge")
+        await writer.stop()
+
+    assert mock_allocate.call_args.args[0] is db
+
+
+def _writes(outcome: str) -> float:
+    return recommendation_log_writes.labels(outcome=outcome)._value.get()
+
+
+async def test_stop_waits_for_the_insert_in_flight(repo):
+    _, batches = repo
+    inserting, release = asyncio.Event(), asyncio.Event()
+
+    async def slow(_db, rows: list[dict]) -> None:
+        inserting.set()
+        await release.wait()
+        batches.append([row["id"] for row in rows])
+
+    settings = _mock_settings(_SETTINGS, RECOMMENDATION_LOG_FLUSH_MS=10_000)
+    written = _writes("written")
+    with (
+        patch("backend.log_writer.backend_settings", settings),
+        patch("backend.log_writer.insert_logs", side_effect=slow),
+    ):
+        writer = await _started(settings)
+        ids = [await writer.submit(AsyncMock(), query=f"q{i}") for i in range(4)]
+        await inserting.wait()
+        stopping = asyncio.create_task(writer.stop())
+        await asyncio.sleep(0.01)
+        assert not stopping.done()
+        release.set()
+        await stopping
+
+    assert batches == [ids[:3], ids[3:]]
+    assert _writes("written") == written + 4
+
+
+async def test_batch_cancelled_mid_insert_is_counted_not_retried(repo):
+    _, batches = repo
+    inserting = asyncio.Event()
+
+    async def hang(_db, rows: list[dict]) -> None:
+        batches.append([row["id"] for row in rows])
+        inserting.set()
+        await asyncio.Event().wait()
+
+    settings = _mock_settings(_SETTINGS, RECOMMENDATION_LOG_FLUSH_MS=10_000)
+    failed = _writes("failed")
+    with (
+        patch("backend.log_writer.backend_settings", settings),
+        patch("backend.log_writer.insert_logs", side_effect=hang),
+    ):
+        writer = await _started(settings)
+        for i in range(3):
+            await writer.submit(AsyncMock(), query=f"q{i}")
+        await inserting.wait()
+        # Torn down without stop()
+        writer._flush_task.cancel()
+        await asyncio.gather(writer._flush_task, return_exceptions=True)
+
+    assert batches == [[101, 102, 103]]
+    assert _writes("failed") == failed + 3
+
+
+async def test_partial_batch_flushes_after_the_interval(repo):
+    _, batches = repo
+    with patch("backend.log_writer.backend_settings", _mock_settings(_SETTINGS)):
+        writer = await _started(_mock_settings(_SETTINGS))
+        await writer.submit(AsyncMock(), query="rouge")
+        await asyncio.sleep(0)
+        assert batches == []
+        await asyncio.sleep(0.05)
+        assert batches == [[101]]
+        await writer.stop()
+
+
+async def test_full_queue_drops_rows_without_a_log_id(repo):
+    _, batches = repo
+    settings = _mock_settings(
+        _SETTINGS, RECOMMENDATION_LOG_QUEUE_SIZE=2, RECOMMENDATION_LOG_FLUSH_MS=10_000
+    )
+    with patch("backend.log_writer.backend_settings", settings):
+        writer = await _started(settings)
+        ids = [await writer.submit(AsyncMock(), query=f"q{i}") for i in range(5)]
+        assert None not in ids[:2]
+        assert ids[-1] is None
+        await writer.stop()
+
+    assert sorted(itertools.chain(*batches)) == [i for i in ids if i is not None]
+
+
+@pytest.mark.usefixtures("repo")
+async def test_failed_insert_is_logged_and_the_writer_keeps_going():
+    with (
+        patch("backend.log_writer.backend_settings", _mock_settings(_SETTINGS)),
+        patch(
+            "backend.log_writer.insert_logs", side_effect=[RuntimeError("db down"), None]
+        ) as mock_insert,
+    ):
+        writer = await _started(_mock_settings(_SETTINGS))
+        await writer.submit(AsyncMock(), query="a")
+        await asyncio.sleep(0.05)
+        assert await writer.submit(AsyncMock(), query="b") is not None
+        await writer.stop()
+
+    assert mock_insert.await_count == 2
+
+
+async def test_write_log_queues_when_the_writer_is_started():
+    db = AsyncMock()
+    with patch("backend.services.recommendations.log_writer") as mock_writer:
+        mock_writer.started = True
+        mock_writer.submit = AsyncMock(return_value=42)
+        log_id = await _write_log(
+            db,
+            user_id="web:1",
+            query="rouge",
+            parsed_intent=None,
+            returned_skus=["1"],
+            product_count=1,
+            latency_ms={"total": 5},
+        )
+
+    assert log_id == 42
+    assert mock_writer.submit.call_args.kwargs["returned_skus"] == ["1"]
+    db.add.assert_not_called()
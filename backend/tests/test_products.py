@@ -1,58 +1,42 @@
+from bisect import bisect_right
 from datetime import UTC, datetime
 from decimal import Decimal
-from types import SimpleNamespace, UnionType
-from typing import get_origin
-from unittest.mock import AsyncMock, MagicMock
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import httpx
 import pytest
 from fastapi import status
+from sqlalchemy.dialects import postgresql
 
 from backend.app import app
-from backend.config import MAX_FILTER_LENGTH, MAX_SEARCH_LENGTH, MAX_SKU_LENGTH
+from backend.config import MAX_BATCH_SKUS, MAX_FILTER_LENGTH, MAX_SEARCH_LENGTH, MAX_SKU_LENGTH
 from backend.db import get_db, get_session_factory
+from backend.pagination import encode_cursor
+from backend.repositories import products as products_repo
+from backend.repositories import tastings as tastings_repo
+from backend.repositories import watches as watches_repo
+from backend.repositories.products import PRICE_BUCKET_EDGES
+from backend.repositories.recommendations import find_similar
 from backend.schemas.product import ProductOut
-from core.db.models import Product
+from backend.schemas.recommendation import IntentResult
+from backend.tests.conftest import _fake_product
+from core.db.models import CatalogState, Product, StoreInventory
 
 NOW = datetime(2025, 1, 1, tzinfo=UTC)
 
 EXPECTED_FIELDS = set(ProductOut.model_fields.keys())
 
-# One dummy value per type — used to auto-populate _fake_product defaults
-_DUMMY_VALUES: dict[type, object] = {
-    str: "test",
-    Decimal: Decimal("9.99"),
-    float: 1.0,
-    int: 0,
-    bool: True,
-    list: [],
-}
-
-
-def _fake_product(**overrides):
-    """Build a fake Product object. Raises AttributeError on unknown attrs."""
-    defaults = {}
-    for name, field_info in ProductOut.model_fields.items():
-        annotation = field_info.annotation
-        # Unwrap Optional (str | None → str)
-        if isinstance(annotation, UnionType):
-            args = [a for a in annotation.__args__ if a is not type(None)]
-            annotation = args[0] if args else annotation
-        origin = get_origin(annotation)
-        defaults[name] = _DUMMY_VALUES.get(origin or annotation, NOW)
-    defaults.update(overrides)
-    return SimpleNamespace(**defaults)
-
 
 def _mock_db_for_products(products: list, total: int):
     """Mock async session — returns correct result regardless of query order."""
     session = AsyncMock()
 
     def _execute_side_effect(stmt, *args, **kwargs):
-        # Count query has 1 column (count(*)), product query has many
+        # Count and catalog-version queries have 1 column, product query has many
         if len(list(stmt.selected_columns)) == 1:
             result = MagicMock()
             result.scalar_one.return_value = total
+            result.scalar_one_or_none.return_value = 1
             return result
         result = MagicMock()
         scalars_mock = MagicMock()
@@ -64,18 +48,80 @@ def _mock_db_for_products(products: list, total: int):
     return session
 
 
-def _mock_db_for_detail(product):
-    """Mock async session — returns a single product or None."""
+def _mock_db_for_detail(product, version: int = 1):
+    """Mock async session — returns a single product or None, its updated_at, and the
+    catalog version."""
     session = AsyncMock()
     result = MagicMock()
     result.scalar_one_or_none.return_value = product
-    session.execute = AsyncMock(return_value=result)
+    validator_result = MagicMock()
+    validator_result.scalar_one_or_none.return_value = product and product.updated_at
+    version_result = MagicMock()
+    version_result.scalar_one_or_none.return_value = version
+
+    def _execute(stmt, *args, **kwargs):
+        if CatalogState.__table__ in stmt.get_final_froms():
+            return version_result
+        if len(stmt.selected_columns) == 1:
+            return validator_result
+        return result
+
+    session.execute = AsyncMock(side_effect=_execute)
     return session
 
 
 # ── Detail endpoint ──────────────────────────────────────────────
 
 
+async def test_get_product_not_modified_for_matching_etag_or_date():
+    product = _fake_product(sku="ABC123")
+    session = _mock_db_for_detail(product)
+
+    app.dependency_overrides[get_db] = lambda: session
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        first = await client.get("/api/products/ABC123")
+        by_tag = await client.get(
+            "/api/products/ABC123", headers={"If-None-Match": first.headers["etag"]}
+        )
+        by_date = await client.get(
+            "/api/products/ABC123", headers={"If-Modified-Since": first.headers["last-modified"]}
+        )
+        stale = await client.get("/api/products/ABC123", headers={"If-None-Match": '"old"'})
+    assert first.status_code == status.HTTP_200_OK
+    assert by_tag.status_code == status.HTTP_304_NOT_MODIFIED
+    assert by_date.status_code == status.HTTP_304_NOT_MODIFIED
+    assert stale.status_code == status.HTTP_200_OK
+    assert stale.json()["sku"] == "ABC123"
+
+
+async def test_get_product_not_modified_skips_loading_the_product():
+    session = _mock_db_for_detail(_fake_product(sku="ABC123"))
+
+    app.dependency_overrides[get_db] = lambda: session
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        first = await client.get("/api/products/ABC123")
+        session.execute.reset_mock()
+        revalidated = await client.get(
+            "/api/products/ABC123", headers={"If-None-Match": first.headers["etag"]}
+        )
+    assert revalidated.status_code == status.HTTP_304_NOT_MODIFIED
+    # Only the updated_at and catalog-version reads
+    assert all(len(c.args[0].selected_columns) == 1 for c in session.execute.call_args_list)
+
+
+async def test_get_product_etag_changes_with_updated_at():
+    transport = httpx.ASGITransport(app=app)
+    etags = []
+    for updated_at in (NOW, datetime(2025, 6, 1, tzinfo=UTC)):
+        session = _mock_db_for_detail(_fake_product(sku="ABC123", updated_at=updated_at))
+        app.dependency_overrides[get_db] = lambda session=session: session
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            etags.append((await client.get("/api/products/ABC123")).headers["etag"])
+    assert etags[0] != etags[1]
+
+
 async def test_get_product_returns_200_with_sku_and_name():
     product = _fake_product(sku="ABC123", name="Château Test")
     session = _mock_db_for_detail(product)
@@ -163,7 +209,7 @@ async def test_list_products_response_shape():
 
 async def test_list_products_price_serialization():
     """Decimal price serializes as string to preserve precision."""
-    products = [_fake_product(price=15.99)]
+    products = [_fake_product(price=Decimal("15.99"))]
     session = _mock_db_for_products(products, total=1)
 
     app.dependency_overrides[get_db] = lambda: session
@@ -252,6 +298,235 @@ async def test_list_products_excludes_sensitive_fields():
         assert field not in product, f"{field} should not be exposed in API"
 
 
+# ── Keyset pagination ────────────────────────────────────────────
+
+
+def _capturing_session(pages: list[list], total: int):
+    """Mock session that returns one page per product query and records the statements."""
+    session = AsyncMock()
+    session.statements = []
+    remaining = list(pages)
+
+    def _execute_side_effect(stmt, *args, **kwargs):
+        result = MagicMock()
+        if len(list(stmt.selected_columns)) == 1:
+            result.scalar_one.return_value = total
+            result.scalar_one_or_none.return_value = 1
+            return result
+        session.statements.append(stmt)
+        scalars_mock = MagicMock()
+        scalars_mock.all.return_value = remaining.pop(0) if remaining else []
+        result.scalars.return_value = scalars_mock
+        return result
+
+    session.execute = AsyncMock(side_effect=_execute_side_effect)
+    return session
+
+
+def _compiled(stmt) -> str:
+    return str(stmt.compile(dialect=postgresql.dialect()))
+
+
+async def test_list_products_returns_next_cursor_when_more_rows():
+    products = [_fake_product(sku=f"SKU{i}", name=f"Wine {i}") for i in range(3)]
+    session = _capturing_session([products], total=10)
+
+    app.dependency_overrides[get_db] = lambda: session
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        resp = await client.get("/api/products?limit=2")
+    data = resp.json()
+    assert [p["sku"] for p in data["products"]] == ["SKU0", "SKU1"]
+    assert data["next_cursor"] is not None
+    # Over-fetches a single row to detect the next page
+    assert "LIMIT" in _compiled(session.statements[0])
+
+
+async def test_list_products_last_page_has_no_cursor():
+    session = _capturing_session([[_fake_product(sku="SKU0")]], total=1)
+
+    app.dependency_overrides[get_db] = lambda: session
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        resp = await client.get("/api/products?limit=2")
+    assert resp.json()["next_cursor"] is None
+
+
+async def test_cursor_round_trip_seeks_past_last_row():
+    """The next request seeks with a row comparison instead of OFFSET."""
+    first = [
+        _fake_product(sku="A1", price=Decimal("10.00")),
+        _fake_product(sku="A2", price=Decimal("12.50")),
+    ]
+    session = _capturing_session([first], total=5)
+    app.dependency_overrides[get_db] = lambda: session
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        cursor = (await client.get("/api/products?limit=1&sort=price_asc")).json()["next_cursor"]
+
+        session = _capturing_session([[_fake_product(sku="A2", price=Decimal("12.50"))]], total=5)
+        app.dependency_overrides[get_db] = lambda: session
+        resp = await client.get(f"/api/products?limit=1&sort=price_asc&cursor={cursor}")
+
+    assert resp.status_code == status.HTTP_200_OK
+    assert resp.json()["offset"] == 0
+    sql = _compiled(session.statements[0])
+    assert "(products.price, products.sku) >" in sql
+    assert "OFFSET" not in sql
+
+
+async def test_cursor_continues_into_null_prices():
+    """A short non-NULL segment falls through to the NULL tail of an ASC sort."""
+    session = _capturing_session(
+        [[_fake_product(sku="A9", price=Decimal("99.00"))], [_fake_product(sku="B1", price=None)]],
+        total=5,
+    )
+    cursor = encode_cursor("price_asc", "50.00", "A5")
+    app.dependency_overrides[get_db] = lambda: session
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        resp = await client.get(f"/api/products?limit=5&sort=price_asc&cursor={cursor}")
+    assert [p["sku"] for p in resp.json()["products"]] == ["A9", "B1"]
+    assert "products.price IS NULL" in _compiled(session.statements[1])
+
+
+@pytest.mark.parametrize(
+    ("cursor", "sort"),
+    [
+        ("not-base64!!", "recent"),
+        ("WzFd", "recent"),  # [1] — wrong shape
+        ("WyJwcmljZV9hc2MiLCIxMC4wMCIsIkExIl0", "recent"),  # issued for price_asc
+        ("WyJyZWNlbnQiLCJub3QtYS1kYXRlIiwiQTEiXQ", "recent"),  # bad datetime
+    ],
+    ids=["garbage", "wrong_shape", "other_sort", "bad_value"],
+)
+async def test_invalid_cursor_rejected(cursor, sort):
+    session = _capturing_session([], total=0)
+    app.dependency_overrides[get_db] = lambda: session
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        resp = await client.get(f"/api/products?sort={sort}&cursor={cursor}")
+    assert resp.status_code == status.HTTP_400_BAD_REQUEST
+
+
+# ── Count strategies ─────────────────────────────────────────────
+
+
+def _count_statements(session) -> list[str]:
+    return [
+        _compiled(call.args[0])
+        for call in session.execute.call_args_list
+        if "count(*)" in _compiled(call.args[0])
+    ]
+
+
+async def test_cached_count_reused_for_equivalent_filters():
+    session = _mock_db_for_products([_fake_product()], total=7)
+
+    app.dependency_overrides[get_db] = lambda: session
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        first = await client.get("/api/products?q=Merlot&category=B&category=A")
+        second = await client.get("/api/products?q=merlot &category=A&category=B")
+    assert first.json()["total"] == second.json()["total"] == 7
+    assert second.json()["total_exact"] is True
+    assert len(_count_statements(session)) == 1
+
+
+async def test_cached_count_recomputed_when_catalog_version_changes():
+    from backend.services.catalog import reset_catalog_version
+
+    session = _mock_db_for_products([_fake_product()], total=7)
+
+    app.dependency_overrides[get_db] = lambda: session
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        await client.get("/api/products")
+        reset_catalog_version()
+        with patch("backend.services.catalog.get_version", new_callable=AsyncMock) as mock_v:
+            mock_v.return_value = 2
+            await client.get("/api/products")
+    assert len(_count_statements(session)) == 2
+
+
+async def test_exact_count_uses_window_in_page_query():
+    products = [_fake_product(sku=f"SKU{i}") for i in range(2)]
+    session = AsyncMock()
+    result = MagicMock()
+    result.all.return_value = [(p, 42) for p in products]
+    session.execute = AsyncMock(return_value=result)
+
+    app.dependency_overrides[get_db] = lambda: session
+    transport = httpx.ASGITransport(app=app)
+    with patch("backend.services.products.backend_settings") as mock_settings:
+        mock_settings.PRODUCT_COUNT_STRATEGY = "exact"
+        # Keep the catalog-version read out of the single round trip under test
+        mock_settings.RESPONSE_CACHE_ENABLED = False
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            resp = await client.get("/api/products")
+    data = resp.json()
+    assert data["total"] == 42
+    assert data["total_exact"] is True
+    session.execute.assert_called_once()
+    assert "count(*) OVER ()" in _compiled(session.execute.call_args.args[0])
+
+
+def _explain_session(plan_rows: int, total: int):
+    session = _mock_db_for_products([_fake_product()], total=total)
+    conn = MagicMock()
+    explain = MagicMock()
+    explain.scalar_one.return_value = [{"Plan": {"Plan Rows": plan_rows}}]
+    conn.exec_driver_sql = AsyncMock(return_value=explain)
+    session.connection = AsyncMock(return_value=conn)
+    return session, conn
+
+
+async def test_estimated_count_returns_planner_rows():
+    session, conn = _explain_session(plan_rows=12000, total=11873)
+
+    app.dependency_overrides[get_db] = lambda: session
+    transport = httpx.ASGITransport(app=app)
+    with patch("backend.services.products.backend_settings") as mock_settings:
+        mock_settings.PRODUCT_COUNT_STRATEGY = "estimated"
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            resp = await client.get("/api/products?scope=wine")
+    data = resp.json()
+    assert data["total"] == 12000
+    assert data["total_exact"] is False
+    sql = conn.exec_driver_sql.call_args.args[0]
+    assert sql.startswith("EXPLAIN (FORMAT JSON)")
+    assert _count_statements(session) == []
+
+
+async def test_estimated_strategy_counts_filtered_listings_exactly():
+    session, conn = _explain_session(plan_rows=12000, total=11873)
+
+    app.dependency_overrides[get_db] = lambda: session
+    transport = httpx.ASGITransport(app=app)
+    with patch("backend.services.products.backend_settings") as mock_settings:
+        mock_settings.PRODUCT_COUNT_STRATEGY = "estimated"
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            resp = await client.get("/api/products?country=France")
+    data = resp.json()
+    assert data["total"] == 11873
+    assert data["total_exact"] is True
+    conn.exec_driver_sql.assert_not_called()
+
+
+async def test_estimated_count_falls_back_to_exact_when_small():
+    session, _ = _explain_session(plan_rows=40, total=37)
+
+    app.dependency_overrides[get_db] = lambda: session
+    transport = httpx.ASGITransport(app=app)
+    with patch("backend.services.products.backend_settings") as mock_settings:
+        mock_settings.PRODUCT_COUNT_STRATEGY = "estimated"
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            resp = await client.get("/api/products")
+    data = resp.json()
+    assert data["total"] == 37
+    assert data["total_exact"] is True
+
+
 # ── Search & filter endpoint ────────────────────────────────────
 
 
@@ -270,6 +545,66 @@ async def test_search_query_returns_matching_products():
     assert len(data["products"]) == 1
 
 
+async def test_search_query_uses_full_text_document():
+    session = _capturing_session([[_fake_product(sku="T1")]], total=1)
+
+    app.dependency_overrides[get_db] = lambda: session
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        await client.get("/api/products?q=domaine+tempier")
+    sql = _compiled(session.statements[0])
+    assert "products.search_vector @@ websearch_to_tsquery('french_unaccent'::regconfig" in sql
+    # Partial words still match on the name trigram index
+    assert "products.name ILIKE" in sql
+
+
+async def test_wine_scope_filters_on_category_family():
+    session = _capturing_session([[_fake_product(sku="W1")]], total=1)
+
+    app.dependency_overrides[get_db] = lambda: session
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        await client.get("/api/products")
+    sql = _compiled(session.statements[0])
+    assert "products.category_family = " in sql
+    assert "LIKE" not in sql
+
+
+async def test_in_stores_filters_through_store_inventory():
+    session = _capturing_session([[_fake_product(sku="S1")]], total=1)
+
+    app.dependency_overrides[get_db] = lambda: session
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        await client.get("/api/products?in_stores=23009")
+    sql = _compiled(session.statements[0])
+    assert "products.sku IN (SELECT store_inventory.sku" in sql
+    assert "store_availability" not in sql.split("WHERE", 1)[1]
+
+
+async def test_relevance_sort_ranks_matches_and_pages_by_offset():
+    products = [_fake_product(sku=f"R{i}") for i in range(3)]
+    session = _capturing_session([products], total=10)
+
+    app.dependency_overrides[get_db] = lambda: session
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        resp = await client.get("/api/products?q=nebbiolo+langhe&sort=relevance&limit=2")
+    data = resp.json()
+    assert "ORDER BY ts_rank_cd(products.search_vector" in _compiled(session.statements[0])
+    assert len(data["products"]) == 2
+    assert data["next_cursor"] is None
+
+
+async def test_relevance_sort_rejects_cursor():
+    cursor = encode_cursor("relevance", "Wine", "SKU1")
+    app.dependency_overrides[get_db] = lambda: _mock_db_for_products([], total=0)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        resp = await client.get(f"/api/products?q=barolo&sort=relevance&cursor={cursor}")
+    assert resp.status_code == status.HTTP_400_BAD_REQUEST
+
+
 async def test_filter_by_category_returns_matching_products():
     products = [_fake_product(sku="RED1", category="Vin rouge")]
     session = _mock_db_for_products(products, total=1)
@@ -347,53 +682,50 @@ async def test_input_validation_rejected(path):
 # ── Facets endpoint ───────────────────────────────────────────
 
 
-def _mock_scalars_result(values: list):
-    """Mock result for SELECT DISTINCT queries (scalars().all())."""
-    result = MagicMock()
-    scalars_mock = MagicMock()
-    scalars_mock.all.return_value = values
-    result.scalars.return_value = scalars_mock
-    return result
-
-
-def _mock_row_result(row: tuple):
-    """Mock result for SELECT MIN/MAX queries (one())."""
-    result = MagicMock()
-    result.one.return_value = row
-    return result
+def _grouped_row(dimension: int, value, n_all: int, n_scoped: int, low=None, high=None) -> tuple:
+    """One GROUPING SETS row of get_facet_rows for the `dimension`-th facet column."""
+    keys = [None] * 5
+    keys[dimension] = value
+    grouping = 0b11111 ^ (1 << (4 - dimension))
+    return (grouping, *keys, n_all, n_scoped, low, high, 0)
 
 
-def _mock_rows_result(rows: list[tuple]):
-    """Mock result for GROUP BY queries (all() returning tuples)."""
-    result = MagicMock()
-    result.all.return_value = rows
-    return result
+def _total_row(n_online: int) -> tuple:
+    """The whole-CTE GROUPING SETS row of get_facet_rows, carrying the online count."""
+    return (0b11111, *[None] * 5, 0, 0, None, None, n_online)
 
 
 def _mock_session_factory_for_facets(
-    categories: list[str],
+    category_rows: list[tuple],
     country_rows: list[tuple],
-    regions: list[str],
-    grapes: list[str],
+    region_rows: list[tuple],
+    grape_rows: list[tuple],
     price_row: tuple,
+    store_rows: list[tuple] = (),
+    online_count: int = 0,
 ):
-    """Mock session factory for facets — each call returns a session for one query."""
-    #! Order-sensitive: results map by position to asyncio.gather in get_facets.
-    #! If gather order changes there, update the results list here.
-    results = [
-        _mock_scalars_result(categories),
-        _mock_rows_result(country_rows),
-        _mock_scalars_result(regions),
-        _mock_scalars_result(grapes),
-        _mock_row_result(price_row),
-    ]
-    call_index = 0
+    """Mock session factory for facets — answers the grouped facet and store statements."""
+    rows = [_total_row(online_count)]
+    rows.extend(_grouped_row(0, name, cnt, cnt) for name, cnt in category_rows)
+    for dimension, dim_rows in enumerate((country_rows, region_rows, grape_rows), 1):
+        rows.extend(_grouped_row(dimension, name, cnt, cnt) for name, cnt in dim_rows)
+    for price in dict.fromkeys(p for p in price_row if p is not None):
+        bucket = bisect_right(PRICE_BUCKET_EDGES, price)
+        rows.append(_grouped_row(4, bucket, 1, 1, price, price))
+
+    def _execute(stmt, *args, **kwargs):
+        result = MagicMock()
+        if CatalogState.__table__ in stmt.get_final_froms():
+            result.scalar_one_or_none.return_value = 1
+        elif stmt.selected_columns.contains_column(StoreInventory.__table__.c.saq_store_id):
+            result.all.return_value = list(store_rows)
+        else:
+            result.all.return_value = rows
+        return result
 
     def _make_session():
-        nonlocal call_index
         session = AsyncMock()
-        session.execute = AsyncMock(return_value=results[call_index])
-        call_index += 1
+        session.execute = AsyncMock(side_effect=_execute)
         return session
 
     factory = MagicMock()
@@ -408,11 +740,13 @@ def _mock_session_factory_for_facets(
 async def test_facets_response_shape():
     """Facets endpoint returns all expected keys with sorted values."""
     factory = _mock_session_factory_for_facets(
-        categories=["Vin blanc", "Vin rouge"],
+        category_rows=[("Vin rouge", 12), ("Vin blanc", 3)],
         country_rows=[("France", 10), ("Italie", 5)],
-        regions=["Bordeaux", "Toscane"],
-        grapes=["Chardonnay", "Merlot"],
+        region_rows=[("Toscane", 5), ("Bordeaux", 4)],
+        grape_rows=[("Chardonnay", 3), ("Merlot", 3)],
         price_row=(Decimal("8.99"), Decimal("450.00")),
+        store_rows=[("23102", 4), ("23101", 9)],
+        online_count=11,
     )
 
     app.dependency_overrides[get_session_factory] = lambda: factory
@@ -429,17 +763,127 @@ async def test_facets_response_shape():
     assert data["regions"] == ["Bordeaux", "Toscane"]
     assert data["grapes"] == ["Chardonnay", "Merlot"]
     assert data["price_range"] == {"min": "8.99", "max": "450.00"}
+    assert data["category_counts"][0] == {"name": "Vin rouge", "count": 12}
+    assert data["region_counts"] == [
+        {"name": "Toscane", "count": 5},
+        {"name": "Bordeaux", "count": 4},
+    ]
+    assert data["store_counts"] == [
+        {"name": "23101", "count": 9},
+        {"name": "23102", "count": 4},
+    ]
+    assert data["online_count"] == 11
+    histogram = data["price_histogram"]
+    assert len(histogram) == len(PRICE_BUCKET_EDGES)
+    assert histogram[0] == {"min": "0", "max": "15", "count": 1}
+    assert histogram[-1] == {"min": "200", "max": None, "count": 1}
+    assert sum(b["count"] for b in histogram) == 2
     assert isinstance(data["grouped_categories"], list)
     assert isinstance(data["category_families"], list)
 
 
+async def test_facet_rows_single_grouped_statement():
+    """Categories count over the whole scope, other dimensions over the filtered rows."""
+    result = MagicMock()
+    result.all.return_value = [
+        _total_row(3),
+        _grouped_row(0, "Vin rouge", 12, 4),
+        _grouped_row(0, "Vin blanc", 3, 0),
+        _grouped_row(1, "France", 5, 4),
+        _grouped_row(1, "Italie", 2, 0),  # outside the filters
+        _grouped_row(1, None, 1, 1),
+        _grouped_row(4, 2, 4, 4, Decimal("16.50"), Decimal("19.95")),
+        _grouped_row(4, None, 1, 1),  # no price
+    ]
+    store_result = MagicMock()
+    store_result.all.return_value = [("23101", 1), ("23102", 3)]
+    session = AsyncMock()
+    session.execute = AsyncMock(side_effect=[result, store_result])
+
+    rows = await products_repo.get_facet_rows(
+        session, category=["Vin rouge"], available=True, in_stores=["23102"]
+    )
+
+    grouped, stores = (_compiled(c.args[0]) for c in session.execute.call_args_list)
+    assert "GROUPING SETS" in grouped
+    assert "saq_store_id IN" in grouped
+    # Store counts ignore the store filter itself
+    assert "FROM store_inventory JOIN products" in stores
+    assert "saq_store_id IN" not in stores
+    assert rows.stores == [("23102", 3), ("23101", 1)]
+    assert rows.online_count == 3
+    assert rows.categories == [("Vin rouge", 12), ("Vin blanc", 3)]
+    assert rows.countries == [("France", 4)]
+    assert rows.regions == []
+    assert rows.price_range == (Decimal("16.50"), Decimal("19.95"))
+    assert [cnt for _, _, cnt in rows.price_histogram] == [0, 4, 0, 0, 0, 0, 0, 0, 0, 0]
+
+
+async def test_facets_cached_until_catalog_version_changes():
+    """A repeated facets request is answered from the response cache."""
+    factory = _mock_session_factory_for_facets(
+        category_rows=[("Vin rouge", 1)],
+        country_rows=[("France", 1)],
+        region_rows=[],
+        grape_rows=[],
+        price_row=(None, None),
+    )
+
+    app.dependency_overrides[get_session_factory] = lambda: factory
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        first = await client.get("/api/products/facets?available=true")
+        calls = factory.call_count
+        second = await client.get("/api/products/facets?available=true")
+    assert second.json() == first.json()
+    # Only the (memoized) version check opens a session on a cache hit
+    assert factory.call_count == calls + 1
+
+
+async def test_facets_not_modified_skips_computation():
+    factory = _mock_session_factory_for_facets(
+        category_rows=[("Vin rouge", 1)],
+        country_rows=[],
+        region_rows=[],
+        grape_rows=[],
+        price_row=(None, None),
+    )
+
+    app.dependency_overrides[get_session_factory] = lambda: factory
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        first = await client.get("/api/products/facets")
+        calls = factory.call_count
+        resp = await client.get(
+            "/api/products/facets", headers={"If-None-Match": first.headers["etag"]}
+        )
+    assert resp.status_code == status.HTTP_304_NOT_MODIFIED
+    assert factory.call_count == calls + 1  # the version check only
+
+
+async def test_list_products_first_page_cached():
+    session = _mock_db_for_products([_fake_product(sku="A")], total=1)
+
+    app.dependency_overrides[get_db] = lambda: session
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        await client.get("/api/products?country=France")
+        calls = session.execute.await_count
+        resp = await client.get("/api/products?country=France")
+        assert session.execute.await_count == calls
+        # Deep pages bypass the cache
+        await client.get("/api/products?country=France&offset=20")
+    assert resp.json()["products"][0]["sku"] == "A"
+    assert session.execute.await_count > calls
+
+
 async def test_facets_empty_catalog():
     """Empty catalog returns empty lists and null price range."""
     factory = _mock_session_factory_for_facets(
-        categories=[],
+        category_rows=[],
         country_rows=[],
-        regions=[],
-        grapes=[],
+        region_rows=[],
+        grape_rows=[],
         price_row=(None, None),
     )
 
@@ -459,10 +903,10 @@ async def test_facets_empty_catalog():
 async def test_facets_no_prices():
     """Products exist but none have prices — lists populated, price_range null."""
     factory = _mock_session_factory_for_facets(
-        categories=["Vin rouge"],
+        category_rows=[("Vin rouge", 1)],
         country_rows=[("France", 1)],
-        regions=["Bordeaux"],
-        grapes=["Merlot"],
+        region_rows=[("Bordeaux", 1)],
+        grape_rows=[("Merlot", 1)],
         price_row=(None, None),
     )
 
@@ -517,6 +961,40 @@ async def test_sort_by_price_returns_products(sort_value):
     assert resp.json()["total"] == 1
 
 
+# ── Batch endpoint ───────────────────────────────────────────
+
+
+async def test_batch_returns_products_in_request_order_and_flags_gaps():
+    gone = _fake_product(sku="B3", delisted_at=datetime(2025, 6, 1, tzinfo=UTC))
+    active = [_fake_product(sku=sku, delisted_at=None) for sku in ("B2", "B1")]
+    session = _capturing_session([[gone, *active]], total=0)
+
+    app.dependency_overrides[get_db] = lambda: session
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        resp = await client.get("/api/products/batch?sku=B1&sku=B9&sku=B3&sku=B2&sku=B1")
+    assert resp.status_code == status.HTTP_200_OK
+    data = resp.json()
+    assert [p["sku"] for p in data["products"]] == ["B1", "B2"]
+    assert data["missing"] == ["B9"]
+    assert data["delisted"] == ["B3"]
+    # One query, one array parameter
+    session.execute.assert_called_once()
+    assert "products.sku = ANY (%(param_1)s::VARCHAR[])" in _compiled(session.statements[0])
+
+
+async def test_batch_requires_a_sku_and_caps_the_count():
+    app.dependency_overrides[get_db] = lambda: AsyncMock()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        empty = await client.get("/api/products/batch")
+        too_many = await client.get(
+            "/api/products/batch", params=[("sku", str(i)) for i in range(MAX_BATCH_SKUS + 1)]
+        )
+    assert empty.status_code == status.HTTP_422_UNPROCESSABLE_CONTENT
+    assert too_many.status_code == status.HTTP_422_UNPROCESSABLE_CONTENT
+
+
 # ── Random endpoint ───────────────────────────────────────────
 
 
@@ -557,6 +1035,47 @@ async def test_random_with_filters():
     assert resp.json()["sku"] == "FILT1"
 
 
+async def test_random_seeks_on_random_key_and_wraps_around():
+    """No ORDER BY random() — a threshold seek, retried from the lowest key when it misses."""
+    session = _mock_db_for_detail(None)
+
+    app.dependency_overrides[get_db] = lambda: session
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        await client.get("/api/products/random?country=France")
+    seek, wrap = (_compiled(call.args[0]) for call in session.execute.call_args_list)
+    assert "products.random_key >= " in seek
+    assert "ORDER BY products.random_key" in seek
+    assert "random()" not in seek
+    assert "products.random_key >= " not in wrap
+    assert "products.country = " in wrap
+
+
+async def test_random_sample_fills_from_wrapped_run():
+    """A short run past the threshold is topped up from below it."""
+    session = _capturing_session(
+        [[_fake_product(sku="S1")], [_fake_product(sku="S2"), _fake_product(sku="S3")]], total=3
+    )
+
+    app.dependency_overrides[get_db] = lambda: session
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        resp = await client.get("/api/products/random/sample?n=3")
+    assert resp.status_code == status.HTTP_200_OK
+    assert [p["sku"] for p in resp.json()] == ["S1", "S2", "S3"]
+    first, second = (_compiled(stmt) for stmt in session.statements)
+    assert "LIMIT %(param_1)s" in first
+    assert "products.random_key < " in second
+
+
+async def test_random_sample_rejects_oversized_n():
+    app.dependency_overrides[get_db] = lambda: AsyncMock()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        resp = await client.get("/api/products/random/sample?n=500")
+    assert resp.status_code == status.HTTP_422_UNPROCESSABLE_CONTENT
+
+
 async def test_scope_wine_is_default_on_list_endpoint():
     """Default scope=wine means wine prefix filtering is active."""
     products = [_fake_product(sku="W1", category="Vin rouge")]
@@ -605,3 +1124,49 @@ async def test_random_endpoint_scope_default():
         resp = await client.get("/api/products/random")
     assert resp.status_code == status.HTTP_200_OK
     assert resp.json()["sku"] == "R1"
+
+
+# ── Heavy columns ────────────────────────────────────────────
+
+
+_HEAVY_COLUMNS = ("embedding", "embedding_prefix", "description", "tasting_profile")
+
+
+@pytest.mark.parametrize(
+    "read",
+    [
+        lambda db: products_repo.find_page(db, 0, 20),
+        lambda db: products_repo.find_page_with_total(db, 0, 20),
+        lambda db: products_repo.find_by_sku(db, "123"),
+        lambda db: products_repo.find_by_skus(db, ["123"]),
+        lambda db: products_repo.find_random(db),
+        lambda db: products_repo.find_random_sample(db, 3),
+        lambda db: watches_repo.find_by_user(db, "u1"),
+        lambda db: watches_repo.find_pending_notifications(db),
+        lambda db: tastings_repo.find_by_user(db, "u1", 20, 0),
+        lambda db: find_similar(db, IntentResult(semantic_query="fruité"), [0.1, 0.2]),
+    ],
+    ids=[
+        "find_page",
+        "find_page_with_total",
+        "find_by_sku",
+        "find_by_skus",
+        "find_random",
+        "find_random_sample",
+        "watches",
+        "notifications",
+        "tastings",
+        "find_similar",
+    ],
+)
+async def test_read_queries_never_select_heavy_columns(read):
+    """Embedding, description and tasting_profile stay out of every read's SELECT list."""
+    session = AsyncMock()
+    session.execute = AsyncMock(return_value=MagicMock())
+    await read(session)
+
+    assert session.execute.call_args_list
+    for call in session.execute.call_args_list:
+        selected = _compiled(call.args[0]).split("\nFROM ")[0]
+        for column in _HEAVY_COLUMNS:
+            assert f"products.{column}" not in selected
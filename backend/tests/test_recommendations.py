@@ -1,16 +1,33 @@
+import asyncio
+import json
+from types import SimpleNamespace
 from unittest.mock import AsyncMock, MagicMock, patch
 
+import numpy as np
 import pytest
+from sqlalchemy.dialects import postgresql
 
+from backend.app import app
+from backend.config import NON_WINE_MESSAGE
+from backend.db import get_db
 from backend.repositories.recommendations import (
-    _redundancy_penalty,
+    _Redundancy,
     _rerank,
     find_similar,
 )
-from backend.schemas.recommendation import IntentResult, RecommendationOut
-from backend.services.curation import ExplanationResult
-from backend.services.recommendations import recommend
+from backend.responses import EventStreamResponse
+from backend.schemas.recommendation import (
+    IntentResult,
+    RecommendationOut,
+    RecommendationProductsOut,
+    RecommendationReasonOut,
+)
+from backend.services._latency import LatencyBudget
+from backend.services.curation import ExplanationReason, ExplanationResult
+from backend.services.recommendations import recommend, recommend_stream
+from backend.tests.conftest import make_test_client
 from core.embedding_client import EMBEDDING_DIMENSIONS
+from core.embedding_constants import EMBEDDING_PREFIX_DIMENSIONS
 
 
 def _fake_product(
@@ -161,6 +178,32 @@ class TestRecommend:
             "User: bold red\nAssistant: Great picks."
         )
 
+    @patch("backend.services.recommendations._write_log", new_callable=AsyncMock)
+    @patch("backend.services.recommendations.explain_recommendations", new_callable=AsyncMock)
+    @patch("backend.services.recommendations.find_similar", new_callable=AsyncMock)
+    @patch("backend.services.recommendations.async_embed_query", new_callable=AsyncMock)
+    async def test_repeated_semantic_query_reuses_cached_embedding(
+        self,
+        mock_embed: AsyncMock,
+        mock_find: AsyncMock,
+        mock_explain: AsyncMock,
+        mock_write_log: AsyncMock,
+    ) -> None:
+        mock_embed.return_value = [0.1] * EMBEDDING_DIMENSIONS
+        mock_find.return_value = []
+        mock_explain.return_value = ExplanationResult(reasons=[], summary="")
+
+        db = AsyncMock()
+        await recommend(db, "q", intent=IntentResult(semantic_query="Rouge  fruité"))
+        await recommend(db, "q", intent=IntentResult(semantic_query="rouge fruité"))
+
+        mock_embed.assert_awaited_once()
+        assert mock_embed.call_args.args[0] == "Rouge  fruité"
+        first, second = (c.kwargs["latency_ms"] for c in mock_write_log.call_args_list)
+        assert first["embed_cached"] == 0
+        assert second["embed_cached"] == 1
+        assert mock_find.call_args_list[0].args[2] == mock_find.call_args_list[1].args[2]
+
     @patch("backend.services.recommendations.parse_intent", new_callable=AsyncMock)
     async def test_pipeline_failure_does_not_log(
         self,
@@ -173,6 +216,315 @@ class TestRecommend:
             await recommend(db, "red wine")
 
 
+def _sse(body: str) -> list[tuple[str, dict]]:
+    """Parse a text/event-stream body into (event, data) pairs."""
+    events = []
+    for block in body.strip().split("\n\n"):
+        name, data = block.split("\n")
+        events.append((name.removeprefix("event: "), json.loads(data.removeprefix("data: "))))
+    return events
+
+
+class TestRecommendStream:
+    @patch("backend.services.recommendations._write_log", new_callable=AsyncMock)
+    @patch("backend.services.recommendations.stream_explanations")
+    @patch("backend.services.recommendations.find_similar", new_callable=AsyncMock)
+    @patch("backend.services.recommendations.async_embed_query", new_callable=AsyncMock)
+    @patch("backend.services.recommendations.parse_intent", new_callable=AsyncMock)
+    async def test_products_arrive_before_curation_then_reasons_summary_done(
+        self,
+        mock_parse: AsyncMock,
+        mock_embed: AsyncMock,
+        mock_find: AsyncMock,
+        mock_stream: MagicMock,
+        mock_write_log: AsyncMock,
+    ) -> None:
+        mock_parse.return_value = IntentResult(semantic_query="rouge")
+        mock_embed.return_value = _fake_embedding()
+        mock_find.return_value = [_fake_product(sku="1"), _fake_product(sku="2")]
+        mock_write_log.return_value = 7
+        seen: list[str] = []
+
+        async def explain(*_args, **_kwargs):
+            # Curation only starts once the products have gone out
+            assert seen == ["intent", "products"]
+            yield ExplanationReason(index=0, reason="Un")
+            yield ExplanationReason(index=1, reason="Deux")
+            yield ExplanationResult(reasons=["Un", "Deux"], summary="Deux rouges")
+
+        mock_stream.side_effect = explain
+
+        events = []
+        async for event, data in recommend_stream(AsyncMock(), "rouge"):
+            seen.append(event)
+            events.append((event, data))
+
+        assert seen == ["intent", "products", "reason", "reason", "summary", "done"]
+        assert [p.sku for p in events[1][1].products] == ["1", "2"]
+        assert events[3][1] == RecommendationReasonOut(index=1, reason="Deux")
+        done = events[-1][1]
+        assert [p.reason for p in done.products] == ["Un", "Deux"]
+        assert done.summary == "Deux rouges"
+        assert done.log_id == 7
+        latency = mock_write_log.call_args.kwargs["latency_ms"]
+        assert latency["to_products"] <= latency["total"]
+
+    @patch("backend.services.recommendations.parse_intent", new_callable=AsyncMock)
+    async def test_non_wine_goes_straight_to_done(self, mock_parse: AsyncMock) -> None:
+        mock_parse.return_value = IntentResult(intent_type="off_topic")
+        events = [event async for event, _ in recommend_stream(AsyncMock(), "bière")]
+        assert events == ["intent", "done"]
+
+    @patch("backend.services.recommendations._write_log", new_callable=AsyncMock)
+    @patch("backend.services.recommendations.explain_recommendations", new_callable=AsyncMock)
+    @patch("backend.services.recommendations.find_similar", new_callable=AsyncMock)
+    @patch("backend.services.recommendations._embed_query", new_callable=AsyncMock)
+    @patch("backend.services.recommendations.parse_intent", new_callable=AsyncMock)
+    async def test_stages_share_the_latency_budget(
+        self,
+        mock_parse: AsyncMock,
+        mock_embed: AsyncMock,
+        mock_find: AsyncMock,
+        mock_explain: AsyncMock,
+        _mock_write_log: AsyncMock,
+    ) -> None:
+        mock_parse.return_value = IntentResult(semantic_query="rouge")
+        mock_embed.return_value = (_fake_embedding(), False)
+        mock_find.return_value = [_fake_product()]
+        mock_explain.return_value = ExplanationResult(reasons=["Bon"], summary="Un rouge")
+
+        with patch("backend.services._latency.backend_settings") as mock_settings:
+            mock_settings.INTENT_TIMEOUT = 3.0
+            mock_settings.EMBED_TIMEOUT = 0.5
+            mock_settings.CURATION_TIMEOUT = 8.0
+            await recommend(AsyncMock(), "rouge", budget=LatencyBudget(1.0))
+
+        # Stages get their own cap, clipped to what's left of the request's budget
+        assert 0.9 < mock_parse.call_args.kwargs["timeout"] <= 1.0
+        assert mock_embed.call_args.kwargs["timeout"] == 0.5
+        assert mock_explain.call_args.kwargs["timeout"] <= 1.0
+
+    async def test_endpoint_sends_server_sent_events(self) -> None:
+        async def events(*_args, **_kwargs):
+            yield "intent", IntentResult(semantic_query="rouge")
+            yield "products", RecommendationProductsOut(products=[])
+
+        app.dependency_overrides[get_db] = lambda: AsyncMock()
+        with patch("backend.api.recommendations.recommend_stream", side_effect=events):
+            async with make_test_client() as client:
+                resp = await client.post("/api/recommendations/stream", json={"query": "rouge"})
+
+        assert resp.status_code == 200
+        assert resp.headers["content-type"].startswith("text/event-stream")
+        assert _sse(resp.text) == [
+            ("intent", IntentResult(semantic_query="rouge").model_dump(mode="json")),
+            ("products", {"products": []}),
+        ]
+
+    async def test_failure_mid_stream_rolls_back_and_sends_error(self) -> None:
+        async def events(*_args, **_kwargs):
+            yield "intent", IntentResult(semantic_query="rouge")
+            raise RuntimeError("db down")
+
+        db = AsyncMock()
+        app.dependency_overrides[get_db] = lambda: db
+        with patch("backend.api.recommendations.recommend_stream", side_effect=events):
+            async with make_test_client() as client:
+                resp = await client.post("/api/recommendations/stream", json={"query": "rouge"})
+
+        assert [event for event, _ in _sse(resp.text)] == ["intent", "error"]
+        db.rollback.assert_awaited_once()
+
+    async def test_disconnect_mid_stream_rolls_back(self) -> None:
+        async def events():
+            yield "intent", IntentResult(semantic_query="rouge")
+            await asyncio.Event().wait()
+
+        # Closed between events, or cancelled while a stage runs
+        db = AsyncMock()
+        body = EventStreamResponse(events(), db).body_iterator
+        await anext(body)
+        await body.aclose()
+        db.rollback.assert_awaited_once()
+
+        db = AsyncMock()
+        body = EventStreamResponse(events(), db).body_iterator
+        await anext(body)
+        pending = asyncio.create_task(anext(body))
+        await asyncio.sleep(0)
+        pending.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await pending
+        db.rollback.assert_awaited_once()
+
+
+def _parsing_after_yield(intent: IntentResult) -> AsyncMock:
+    """parse_intent that yields to the loop first, as a Haiku call would."""
+
+    async def parse(_query: str, **_kwargs: object) -> IntentResult:
+        for _ in range(5):
+            await asyncio.sleep(0)
+        return intent
+
+    return AsyncMock(side_effect=parse)
+
+
+def _session() -> AsyncMock:
+    """Mock session whose begin_nested() works as `async with`, like AsyncSession's."""
+    db = AsyncMock()
+    db.begin_nested = MagicMock()
+    return db
+
+
+@patch("backend.services.recommendations.backend_settings")
+@patch("backend.services.recommendations._write_log", new_callable=AsyncMock)
+@patch("backend.services.recommendations.explain_recommendations", new_callable=AsyncMock)
+@patch("backend.services.recommendations.find_similar", new_callable=AsyncMock)
+@patch("backend.services.recommendations.async_embed_query", new_callable=AsyncMock)
+class TestSpeculativePipeline:
+    def _setup(self, mock_settings, mock_embed, mock_find, mock_explain) -> None:
+        mock_settings.SPECULATIVE_PIPELINE = True
+        mock_settings.EMBEDDING_CACHE_ENABLED = False
+        mock_embed.side_effect = lambda text, **_: [float(len(text))] * EMBEDDING_DIMENSIONS
+        mock_find.return_value = [_fake_product()]
+        mock_explain.return_value = ExplanationResult(reasons=["Nice"], summary="Picks")
+
+    async def test_plain_query_reuses_speculative_embedding_and_retrieval(
+        self, mock_embed, mock_find, mock_explain, mock_write_log, mock_settings
+    ) -> None:
+        self._setup(mock_settings, mock_embed, mock_find, mock_explain)
+        parsed = IntentResult(semantic_query="vin rouge fruité")
+        with patch("backend.services.recommendations.parse_intent", _parsing_after_yield(parsed)):
+            result = await recommend(_session(), "Vin rouge  fruité")
+
+        assert [p.product.sku for p in result.products] == ["123456"]
+        mock_embed.assert_awaited_once()
+        mock_find.assert_awaited_once()
+        assert mock_find.call_args.args[1] == IntentResult()  # default wine scope
+        latency = mock_write_log.call_args.kwargs["latency_ms"]
+        assert latency["embed_speculative"] == latency["search_speculative"] == 1
+        assert latency["embed_wasted"] == latency["search_wasted"] == 0
+
+    async def test_filters_keep_embedding_but_retrieve_again(
+        self, mock_embed, mock_find, mock_explain, mock_write_log, mock_settings
+    ) -> None:
+        self._setup(mock_settings, mock_embed, mock_find, mock_explain)
+        parsed = IntentResult(country="Italie", semantic_query="vin rouge fruité")
+        with patch("backend.services.recommendations.parse_intent", _parsing_after_yield(parsed)):
+            await recommend(_session(), "vin rouge fruité")
+
+        mock_embed.assert_awaited_once()
+        assert [c.args[1] for c in mock_find.call_args_list] == [IntentResult(), parsed]
+        latency = mock_write_log.call_args.kwargs["latency_ms"]
+        assert latency["embed_speculative"] == 1
+        assert latency["search_speculative"] == 0
+
+    async def test_rewritten_query_discards_speculative_work(
+        self, mock_embed, mock_find, mock_explain, mock_write_log, mock_settings
+    ) -> None:
+        self._setup(mock_settings, mock_embed, mock_find, mock_explain)
+        parsed = IntentResult(semantic_query="rouge corsé")
+        with patch("backend.services.recommendations.parse_intent", _parsing_after_yield(parsed)):
+            await recommend(_session(), "un rouge corsé pour ce soir")
+
+        assert [c.args[0] for c in mock_embed.call_args_list] == [
+            "un rouge corsé pour ce soir",
+            "rouge corsé",
+        ]
+        # The real search got the parsed query's vector, after the speculative one finished
+        assert mock_find.call_args.args[2][0] == len("rouge corsé")
+        latency = mock_write_log.call_args.kwargs["latency_ms"]
+        assert latency["embed_speculative"] == latency["search_speculative"] == 0
+
+    async def test_speculation_not_started_is_cancelled(
+        self, mock_embed, mock_find, mock_explain, mock_write_log, mock_settings
+    ) -> None:
+        self._setup(mock_settings, mock_embed, mock_find, mock_explain)
+        # parse_intent returns without yielding — nothing speculative has run yet
+        with patch(
+            "backend.services.recommendations.parse_intent",
+            AsyncMock(return_value=IntentResult(semantic_query="rouge corsé")),
+        ):
+            await recommend(_session(), "un rouge corsé")
+
+        assert [c.args[0] for c in mock_embed.call_args_list] == ["rouge corsé"]
+        mock_find.assert_awaited_once()
+
+    async def test_failed_speculation_falls_back(
+        self, mock_embed, mock_find, mock_explain, mock_write_log, mock_settings
+    ) -> None:
+        self._setup(mock_settings, mock_embed, mock_find, mock_explain)
+        mock_find.side_effect = [RuntimeError("db hiccup"), [_fake_product()]]
+        parsed = IntentResult(semantic_query="rouge")
+        db = _session()
+        with patch("backend.services.recommendations.parse_intent", _parsing_after_yield(parsed)):
+            result = await recommend(db, "rouge")
+
+        assert len(result.products) == 1
+        assert mock_find.await_count == 2
+        # The failed query only rolled back its savepoint, not the request's transaction
+        savepoint_exit = db.begin_nested.return_value.__aexit__
+        assert savepoint_exit.call_args.args[0] is RuntimeError
+        db.rollback.assert_not_called()
+        assert mock_write_log.call_args.kwargs["latency_ms"]["search_speculative"] == 0
+
+    async def test_non_wine_and_errors_settle_speculation(
+        self, mock_embed, mock_find, mock_explain, mock_write_log, mock_settings
+    ) -> None:
+        self._setup(mock_settings, mock_embed, mock_find, mock_explain)
+        off_topic = IntentResult(intent_type="off_topic", semantic_query="bière")
+        with patch(
+            "backend.services.recommendations.parse_intent", _parsing_after_yield(off_topic)
+        ):
+            result = await recommend(_session(), "bière")
+        assert result.summary == NON_WINE_MESSAGE
+
+        with (
+            patch(
+                "backend.services.recommendations.parse_intent",
+                AsyncMock(side_effect=RuntimeError("API down")),
+            ),
+            pytest.raises(RuntimeError, match="API down"),
+        ):
+            await recommend(_session(), "rouge")
+
+        # Nothing left running against the session
+        pending = asyncio.all_tasks() - {asyncio.current_task()}
+        assert not pending
+        mock_write_log.assert_not_called()
+
+    async def test_cancelled_request_waits_for_speculative_retrieval(
+        self, mock_embed, mock_find, mock_explain, mock_write_log, mock_settings
+    ) -> None:
+        self._setup(mock_settings, mock_embed, mock_find, mock_explain)
+        searching = asyncio.Event()
+        finished = False
+
+        async def slow_find(*_args: object, **_kwargs: object) -> list:
+            nonlocal finished
+            searching.set()
+            for _ in range(5):
+                await asyncio.sleep(0)
+            finished = True
+            return []
+
+        async def parse_forever(_query: str, **_kwargs: object) -> IntentResult:
+            await asyncio.Event().wait()
+            raise AssertionError("unreachable")
+
+        mock_find.side_effect = slow_find
+        with patch("backend.services.recommendations.parse_intent", side_effect=parse_forever):
+            request = asyncio.create_task(recommend(_session(), "rouge"))
+            await searching.wait()
+            request.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await request
+
+        # The session was released only once the retrieval using it had finished
+        assert finished
+        assert not asyncio.all_tasks() - {asyncio.current_task()}
+
+
 def _fake_embedding() -> list[float]:
     return [0.1] * EMBEDDING_DIMENSIONS
 
@@ -203,6 +555,77 @@ class TestFindSimilar:
 
         assert products == []
 
+    @pytest.mark.parametrize(("limit", "ef_search"), [(5, "100"), (40, "200")])
+    async def test_tunes_hnsw_scan_before_searching(self, limit: int, ef_search: str) -> None:
+        db = AsyncMock()
+        db.execute.return_value = MagicMock()
+
+        await find_similar(
+            db, IntentResult(semantic_query="bold red"), _fake_embedding(), limit=limit
+        )
+
+        settings_stmt, search_stmt = (c.args[0] for c in db.execute.call_args_list)
+        values = list(settings_stmt.compile(dialect=postgresql.dialect()).params.values())
+        # ef_search covers the whole over-fetched pool, never below the configured floor
+        assert values[values.index("hnsw.ef_search") + 1] == ef_search
+        assert values[values.index("hnsw.iterative_scan") + 1] == "strict_order"
+        assert "<=>" in str(search_stmt.compile(dialect=postgresql.dialect()))
+
+    @patch("backend.repositories.recommendations.backend_settings")
+    async def test_quantized_first_pass_then_exact_rerank(self, mock_settings: MagicMock) -> None:
+        mock_settings.HNSW_EF_SEARCH = 100
+        mock_settings.HNSW_MAX_SCAN_TUPLES = 20_000
+        mock_settings.VECTOR_QUANTIZED_SEARCH = True
+        mock_settings.VECTOR_RERANK_CANDIDATES = 300
+        mock_settings.RERANK_EMBEDDING_WEIGHT = 0.0
+        db = AsyncMock()
+        db.execute.return_value = MagicMock()
+
+        await find_similar(db, IntentResult(country="France"), _fake_embedding())
+
+        settings_stmt, search_stmt = (c.args[0] for c in db.execute.call_args_list)
+        values = list(settings_stmt.compile(dialect=postgresql.dialect()).params.values())
+        # The index scan feeding the first pass must yield every re-rank candidate
+        assert values[values.index("hnsw.ef_search") + 1] == "300"
+
+        compiled = search_stmt.compile(dialect=postgresql.dialect())
+        sql = str(compiled)
+        first_pass, rerank = sql.split("SELECT products.sku, products.url")
+        assert first_pass.startswith("WITH first_pass AS MATERIALIZED")
+        assert "products.embedding_prefix <=>" in first_pass
+        assert "products.country =" in first_pass
+        assert "products.embedding <=>" in rerank
+        assert "products.embedding_prefix" not in rerank
+
+        prefix = compiled.params["embedding_prefix_1"]
+        assert len(prefix) == EMBEDDING_PREFIX_DIMENSIONS
+        assert sum(x * x for x in prefix) == pytest.approx(1.0)
+        assert compiled.params["param_1"] == 300  # first-pass candidates
+        assert compiled.params["param_2"] == 25  # limit x diversity pool
+
+    @patch("backend.repositories.recommendations._rerank", side_effect=lambda c, *_, **__: c)
+    @patch("backend.repositories.recommendations.backend_settings")
+    async def test_embedding_weight_loads_embeddings_for_rerank(
+        self, mock_settings: MagicMock, mock_rerank: MagicMock
+    ) -> None:
+        mock_settings.HNSW_EF_SEARCH = 100
+        mock_settings.VECTOR_QUANTIZED_SEARCH = False
+        mock_settings.RERANK_EMBEDDING_WEIGHT = 0.5
+        products = [SimpleNamespace(sku=str(i), embedding=np.full(3, i)) for i in range(2)]
+        mock_result = MagicMock()
+        mock_result.scalars.return_value.all.return_value = products
+        db = AsyncMock()
+        db.execute.return_value = mock_result
+
+        await find_similar(db, IntentResult(), _fake_embedding())
+
+        search_stmt = db.execute.call_args_list[1].args[0]
+        # Deferred column, read only when the reranker needs it
+        assert "products.embedding," in str(search_stmt.compile(dialect=postgresql.dialect()))
+        kwargs = mock_rerank.call_args.kwargs
+        np.testing.assert_array_equal(kwargs["embeddings"], [[0, 0, 0], [1, 1, 1]])
+        assert kwargs["embedding_weight"] == 0.5
+
 
 class TestRerank:
     def test_passthrough_when_fewer_than_limit(self) -> None:
@@ -243,15 +666,96 @@ class TestRerank:
         result = _rerank(candidates, limit=3)
         assert len(result) == 3
 
+    def test_embedding_similarity_counts_as_redundancy(self) -> None:
+        # No attributes to compare — only the embeddings can tell 2 apart from 1
+        candidates = [SimpleNamespace(sku=str(i), **dict.fromkeys(_ATTRIBUTES)) for i in range(3)]
+        embeddings = np.array([[1.0, 0.0], [0.99, 0.1], [0.0, 1.0]])
+
+        assert [c.sku for c in _rerank(candidates, limit=2)] == ["0", "1"]
+        result = _rerank(candidates, limit=2, embeddings=embeddings, embedding_weight=1.0)
+        assert [c.sku for c in result] == ["0", "2"]
+
+
+_ATTRIBUTES = ("producer", "taste_tag", "country", "grape", "region", "category")
+
+
+def _reference_redundancy(candidate: SimpleNamespace, selected: list[SimpleNamespace]) -> float:
+    """The loop-based penalty the vectorized reranker replaced, verbatim in effect."""
+    if not selected:
+        return 0.0
+    weights = dict(zip(_ATTRIBUTES, (1.5, 1.0, 0.5, 1.0, 1.0, 0.75), strict=True))
+    penalties = []
+    for s in selected:
+        overlap = checks = 0.0
+        for attr, weight in weights.items():
+            if getattr(candidate, attr) and getattr(s, attr):
+                checks += weight
+                if getattr(candidate, attr) == getattr(s, attr):
+                    overlap += weight
+        penalties.append(overlap / checks if checks > 0 else 0.0)
+    return max(penalties) * (1.0 + 0.2 * sum(1 for p in penalties if p > 0.3))
+
+
+def _reference_rerank(candidates: list[SimpleNamespace], limit: int) -> list[SimpleNamespace]:
+    if len(candidates) <= limit:
+        return candidates
+    n = len(candidates)
+    remaining = list(range(1, n))
+    selected = [candidates[0]]
+    while len(selected) < limit and remaining:
+        scores = [
+            1.0 - idx / n - 0.5 * _reference_redundancy(candidates[idx], selected)
+            for idx in remaining
+        ]
+        selected.append(candidates[remaining.pop(scores.index(max(scores)))])
+    return selected
+
+
+def _random_candidates(rng: np.random.Generator, n: int) -> list[SimpleNamespace]:
+    # Small vocabularies with missing values — plenty of overlaps and score ties
+    vocab = {
+        "producer": [None, "", "A", "B", "C", "D", "E"],
+        "taste_tag": [None, "Fruité", "Aromatique", "Corsé"],
+        "country": [None, "France", "Italie", "Espagne"],
+        "grape": [None, "Merlot", "Syrah", "Gamay", "Pinot noir"],
+        "region": [None, "Bordeaux", "Toscana", "Rioja", "Bourgogne"],
+        "category": [None, "Vin rouge", "Vin blanc"],
+    }
+    return [
+        SimpleNamespace(
+            sku=str(i), **{a: vocab[a][rng.integers(len(vocab[a]))] for a in _ATTRIBUTES}
+        )
+        for i in range(n)
+    ]
+
+
+class TestRerankEquivalence:
+    @pytest.mark.parametrize("seed", range(20))
+    @pytest.mark.parametrize(("n", "limit"), [(6, 5), (25, 5), (100, 20), (40, 39)])
+    def test_matches_loop_implementation(self, seed: int, n: int, limit: int) -> None:
+        candidates = _random_candidates(np.random.default_rng(seed), n)
+        assert _rerank(candidates, limit) == _reference_rerank(candidates, limit)
+
+    def test_identical_candidates_keep_rank_order(self) -> None:
+        candidates = [_fake_product(sku=str(i)) for i in range(10)]
+        assert _rerank(candidates, 4) == _reference_rerank(candidates, 4) == candidates[:4]
+
+
+def _penalty(candidate: MagicMock, selected: list[MagicMock]) -> float:
+    redundancy = _Redundancy([candidate, *selected])
+    for j in range(1, len(selected) + 1):
+        redundancy.add(j)
+    return float(redundancy.penalty[0])
+
 
 class TestRedundancyPenalty:
     def test_empty_selected_returns_zero(self) -> None:
         candidate = _fake_product()
-        assert _redundancy_penalty(candidate, []) == 0.0
+        assert _penalty(candidate, []) == 0.0
 
     def test_identical_wine_returns_boosted_penalty(self) -> None:
         wine = _fake_product()
-        penalty = _redundancy_penalty(wine, [wine])
+        penalty = _penalty(wine, [wine])
         # 1.0 base * (1.0 + 0.2 * 1 similar) = 1.2
         assert penalty == pytest.approx(1.2)
 
@@ -272,19 +776,26 @@ class TestRedundancyPenalty:
             taste_tag="Fruité",
             category="Vin rouge",
         )
-        penalty = _redundancy_penalty(candidate, [selected])
+        penalty = _penalty(candidate, [selected])
         assert penalty == 0.0
 
     def test_partial_overlap(self) -> None:
         candidate = _fake_product(producer="A", grape="Merlot", country="France")
         selected = _fake_product(producer="B", grape="Merlot", country="Italie")
-        penalty = _redundancy_penalty(candidate, [selected])
+        penalty = _penalty(candidate, [selected])
         # Same grape (1.0) out of total checks (4.5)
         assert 0.0 < penalty < 1.0
 
     def test_null_attributes_excluded_from_checks(self) -> None:
         candidate = _fake_product(producer=None, grape=None, country="France")
         selected = _fake_product(producer=None, grape=None, country="France")
-        penalty = _redundancy_penalty(candidate, [selected])
+        penalty = _penalty(candidate, [selected])
         # Only country + taste_tag + region can match
         assert penalty > 0.0
+
+    def test_boost_grows_with_each_similar_selected_wine(self) -> None:
+        candidate = _fake_product(producer="A")
+        selected = [_fake_product(producer=p) for p in ("A", "B", "C")]
+        assert _penalty(candidate, selected) == pytest.approx(
+            _reference_redundancy(candidate, selected)
+        )
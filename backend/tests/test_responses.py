@@ -0,0 +1,52 @@
+import json
+from datetime import UTC, datetime
+from decimal import Decimal
+from types import SimpleNamespace
+
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+from backend.repositories.products import product_row
+from backend.responses import ModelJSONResponse, from_row
+from backend.schemas.product import PaginatedOut, ProductOut
+
+NOW = datetime(2025, 3, 1, 12, 0, tzinfo=UTC)
+
+
+def _row(**overrides: object) -> SimpleNamespace:
+    fields = dict.fromkeys(ProductOut.model_fields)
+    fields.update(sku="123", price=Decimal("24.95"), created_at=NOW, updated_at=NOW)
+    fields.update(overrides)
+    return SimpleNamespace(**fields)
+
+
+def test_from_row_builds_without_validating():
+    product = from_row(ProductOut, _row(name="Château Test"))
+    assert product.sku == "123"
+    assert product.name == "Château Test"
+    assert product.price == Decimal("24.95")
+
+
+def test_from_row_values_override_and_missing_fields_default():
+    row = _row()
+    del row.url
+    product = from_row(ProductOut, row, sku="456")
+    assert product.sku == "456"
+    assert product.url is None
+
+
+def test_model_json_response_matches_response_model_encoding():
+    page = PaginatedOut(products=[from_row(ProductOut, _row())], total=1, limit=20, offset=0)
+    body = json.loads(ModelJSONResponse(page).body)
+    assert body == page.model_dump(mode="json")
+    assert body["products"][0]["price"] == "24.95"
+    assert body["products"][0]["created_at"] == "2025-03-01T12:00:00Z"
+
+
+def test_product_row_selects_only_product_out_columns():
+    sql = str(select(product_row("delisted_at")).compile(dialect=postgresql.dialect()))
+    selected = sql.split("FROM")[0]
+    for field in ProductOut.model_fields:
+        assert f"products.{field}" in selected
+    assert "products.delisted_at" in selected
+    assert "products.description" not in selected
@@ -1,3 +1,4 @@
+import asyncio
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import anthropic
@@ -63,6 +64,21 @@ class TestSommelierChat:
         result = await sommelier_chat("What is tannin?")
         assert result == _FALLBACK_MESSAGE
 
+    @patch("backend.services.sommelier.get_anthropic_client")
+    @patch("backend.services.sommelier.backend_settings")
+    async def test_timeout_returns_fallback(
+        self, mock_settings: MagicMock, mock_get_client: MagicMock
+    ) -> None:
+        mock_settings.ANTHROPIC_API_KEY = "sk-test"
+
+        async def slow(**_kwargs: object) -> None:
+            await asyncio.sleep(1)
+
+        mock_get_client.return_value.messages.create = AsyncMock(side_effect=slow)
+
+        result = await sommelier_chat("What is tannin?", timeout=0.01)
+        assert result == _FALLBACK_MESSAGE
+
     @patch("backend.services.sommelier.get_anthropic_client")
     @patch("backend.services.sommelier.backend_settings")
     async def test_no_text_blocks_returns_fallback(
@@ -3,12 +3,14 @@ from types import SimpleNamespace
 from unittest.mock import AsyncMock, patch
 
 import httpx
+import pytest
 from fastapi import status
 from sqlalchemy.exc import IntegrityError
 
 from backend.app import app
 from backend.auth import get_caller_user_id
 from backend.db import get_db
+from backend.schemas.product import PaginatedOut
 
 NOW = datetime(2025, 1, 1, tzinfo=UTC)
 
@@ -40,6 +42,13 @@ def _fake_pref(**overrides):
     return SimpleNamespace(**defaults)
 
 
+@pytest.fixture(autouse=True)
+def _catalog_version():
+    """Nearby responses are validated against the catalog version — pin it."""
+    with patch("backend.api.stores.catalog_version", AsyncMock(return_value=1)) as mock_v:
+        yield mock_v
+
+
 # ── GET /stores/nearby ────────────────────────────────────────
 
 
@@ -50,6 +59,7 @@ async def test_nearby_returns_stores_sorted_by_distance():
 
     with patch("backend.services.stores.repo") as mock_repo:
         mock_repo.get_all_stores = AsyncMock(return_value=[far, close])
+        mock_repo.count_inventory = AsyncMock(return_value={})
         session = AsyncMock()
         app.dependency_overrides[get_db] = lambda: session
         transport = httpx.ASGITransport(app=app)
@@ -64,12 +74,59 @@ async def test_nearby_returns_stores_sorted_by_distance():
     assert data[0]["distance_km"] < data[1]["distance_km"]
 
 
+async def test_nearby_includes_inventory_counts():
+    """200 — each store carries its in-stock product and wine counts."""
+    stocked = _fake_store(saq_store_id="A", latitude=45.52, longitude=-73.60)
+    empty = _fake_store(saq_store_id="B", latitude=46.00, longitude=-74.00)
+
+    with patch("backend.services.stores.repo") as mock_repo:
+        mock_repo.get_all_stores = AsyncMock(return_value=[stocked, empty])
+        mock_repo.count_inventory = AsyncMock(return_value={"A": (1200, 800)})
+        session = AsyncMock()
+        app.dependency_overrides[get_db] = lambda: session
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            resp = await client.get("/api/stores/nearby?lat=45.52&lng=-73.60")
+
+    assert resp.status_code == status.HTTP_200_OK
+    data = resp.json()
+    assert (data[0]["product_count"], data[0]["wine_count"]) == (1200, 800)
+    assert (data[1]["product_count"], data[1]["wine_count"]) == (0, 0)
+    mock_repo.count_inventory.assert_awaited_once_with(session, ["A", "B"])
+
+
+async def test_nearby_revalidates_until_catalog_version_changes(_catalog_version):
+    """304 — same catalog version; 200 with a new ETag once the scraper bumps it."""
+    with patch("backend.services.stores.repo") as mock_repo:
+        mock_repo.get_all_stores = AsyncMock(return_value=[_fake_store()])
+        mock_repo.count_inventory = AsyncMock(return_value={})
+        app.dependency_overrides[get_db] = lambda: AsyncMock()
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            url = "/api/stores/nearby?lat=45.52&lng=-73.60"
+            first = await client.get(url)
+            etag = first.headers["etag"]
+            cached = await client.get(url, headers={"If-None-Match": etag})
+            _catalog_version.return_value = 2
+            changed = await client.get(url, headers={"If-None-Match": etag})
+
+    assert first.headers["cache-control"].startswith("private, max-age=")
+    assert cached.status_code == status.HTTP_304_NOT_MODIFIED
+    assert cached.content == b""
+    assert cached.headers["etag"] == etag
+    # The 304 skipped the store scan entirely
+    assert mock_repo.get_all_stores.await_count == 2
+    assert changed.status_code == status.HTTP_200_OK
+    assert changed.headers["etag"] != etag
+
+
 async def test_nearby_limit_respected():
     """200 — limit query param caps results."""
     stores = [_fake_store(saq_store_id=str(i), name=f"Store {i}") for i in range(10)]
 
     with patch("backend.services.stores.repo") as mock_repo:
         mock_repo.get_all_stores = AsyncMock(return_value=stores)
+        mock_repo.count_inventory = AsyncMock(return_value={})
         session = AsyncMock()
         app.dependency_overrides[get_db] = lambda: session
         transport = httpx.ASGITransport(app=app)
@@ -87,6 +144,7 @@ async def test_nearby_excludes_stores_without_coordinates():
 
     with patch("backend.services.stores.repo") as mock_repo:
         mock_repo.get_all_stores = AsyncMock(return_value=[with_coords, no_coords])
+        mock_repo.count_inventory = AsyncMock(return_value={})
         session = AsyncMock()
         app.dependency_overrides[get_db] = lambda: session
         transport = httpx.ASGITransport(app=app)
@@ -107,6 +165,7 @@ async def test_nearby_excludes_non_consumer_store_types():
 
     with patch("backend.services.stores.repo") as mock_repo:
         mock_repo.get_all_stores = AsyncMock(return_value=[consumer, restaurant, vrac])
+        mock_repo.count_inventory = AsyncMock(return_value={})
         session = AsyncMock()
         app.dependency_overrides[get_db] = lambda: session
         transport = httpx.ASGITransport(app=app)
@@ -123,6 +182,7 @@ async def test_nearby_empty_db():
     """200 — empty list when no stores exist."""
     with patch("backend.services.stores.repo") as mock_repo:
         mock_repo.get_all_stores = AsyncMock(return_value=[])
+        mock_repo.count_inventory = AsyncMock(return_value={})
         session = AsyncMock()
         app.dependency_overrides[get_db] = lambda: session
         transport = httpx.ASGITransport(app=app)
@@ -133,6 +193,45 @@ async def test_nearby_empty_db():
     assert resp.json() == []
 
 
+# ── GET /stores/{saq_store_id}/products ──────────────────────
+
+
+async def test_store_products_scopes_listing_to_store():
+    """200 — listing filters are forwarded with the store as the only in_stores value."""
+    page = PaginatedOut(products=[], total=0, limit=20, offset=0)
+
+    with (
+        patch("backend.services.stores.repo") as mock_repo,
+        patch("backend.services.stores.list_products", AsyncMock(return_value=page)) as mock_list,
+    ):
+        mock_repo.get_store_by_id = AsyncMock(return_value=_fake_store())
+        session = AsyncMock()
+        app.dependency_overrides[get_db] = lambda: session
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            resp = await client.get("/api/stores/23009/products?country=France&sort=price_asc")
+
+    assert resp.status_code == status.HTTP_200_OK
+    kwargs = mock_list.await_args.kwargs
+    assert kwargs["in_stores"] == ["23009"]
+    assert kwargs["country"] == "France"
+    assert kwargs["sort"] == "price_asc"
+    assert kwargs["wine_scope"] is True
+
+
+async def test_store_products_unknown_store_returns_404():
+    """404 — store doesn't exist."""
+    with patch("backend.services.stores.repo") as mock_repo:
+        mock_repo.get_store_by_id = AsyncMock(return_value=None)
+        session = AsyncMock()
+        app.dependency_overrides[get_db] = lambda: session
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            resp = await client.get("/api/stores/99999/products")
+
+    assert resp.status_code == status.HTTP_404_NOT_FOUND
+
+
 # ── GET /stores/preferences ──────────────────────────────────
 
 
@@ -0,0 +1,102 @@
+from types import SimpleNamespace
+
+import pytest
+from fastapi import status
+
+from backend.catalog_engine import catalog_engine
+from backend.suggest import SuggestIndex, normalize
+from backend.tests.conftest import make_test_client
+
+
+def _row(sku: str, name: str | None, **overrides):
+    fields = {"producer": None, "region": None, "grape": None, "appellation": None}
+    fields.update(overrides)
+    return SimpleNamespace(sku=sku, name=name, **fields)
+
+
+ROWS = [
+    _row("1", "Château Margaux 2015", producer="Château Margaux", region="Bordeaux"),
+    _row("2", "Pavillon Rouge du Château Margaux", producer="Château Margaux", region="Bordeaux"),
+    _row("3", "Barolo Cannubi", producer="Marchesi di Barolo", grape="Nebbiolo", region="Piémont"),
+    _row("4", "Langhe Nebbiolo", grape="Nebbiolo", region="Piémont", appellation="Langhe"),
+    _row("5", "Bandol Rouge", producer="Domaine Tempier", region="Provence", appellation="Bandol"),
+    _row("6", None, region="Bordeaux"),
+]
+
+
+@pytest.fixture()
+def index() -> SuggestIndex:
+    return SuggestIndex(ROWS)
+
+
+def test_normalize_folds_case_accents_and_punctuation():
+    assert normalize("  Château-Margaux, 2015 ") == "chateau margaux 2015"
+    assert normalize("Piémont") == "piemont"
+
+
+def test_prefix_matches_any_word_start(index):
+    suggestions, corrected = index.suggest("marg", 10)
+    assert corrected is None
+    texts = [s.text for s in suggestions]
+    # Text-start matches first, the most products first among them
+    assert texts[0] == "Château Margaux"
+    assert "Pavillon Rouge du Château Margaux" in texts
+    assert all("Margaux" in t for t in texts)
+
+
+def test_facet_values_carry_product_counts(index):
+    suggestions, _ = index.suggest("piem", 10)
+    assert [(s.kind, s.text, s.count) for s in suggestions] == [("region", "Piémont", 2)]
+
+
+def test_products_carry_sku_and_respect_limit(index):
+    suggestions, _ = index.suggest("chateau", 1)
+    assert len(suggestions) == 1
+    products, _ = index.suggest("bandol r", 10)
+    assert [(s.kind, s.sku) for s in products] == [("product", "5")]
+
+
+def test_typo_falls_back_to_closest_spelling(index):
+    suggestions, corrected = index.suggest("nebiolo", 10)
+    assert corrected == "nebbiolo"
+    assert ("grape", "Nebbiolo") in {(s.kind, s.text) for s in suggestions}
+
+
+def test_typo_in_earlier_word_and_partial_last_word(index):
+    suggestions, corrected = index.suggest("domain tempi", 10)
+    assert corrected == "domaine tempier"
+    assert [s.text for s in suggestions] == ["Domaine Tempier"]
+
+
+def test_no_match_returns_nothing(index):
+    assert index.suggest("zzzz", 10) == ([], None)
+    assert index.suggest("--", 10) == ([], None)
+
+
+# ── Endpoint ─────────────────────────────────────────────────────
+
+
+async def test_suggest_endpoint_served_from_engine_snapshot():
+    catalog_engine.snapshot = SimpleNamespace(suggest_index=SuggestIndex(ROWS))
+    try:
+        async with make_test_client() as client:
+            resp = await client.get("/api/products/suggest?prefix=tempier")
+    finally:
+        catalog_engine.snapshot = None
+    assert resp.status_code == status.HTTP_200_OK
+    assert resp.json() == {
+        "suggestions": [{"kind": "producer", "text": "Domaine Tempier", "sku": None, "count": 1}],
+        "corrected": None,
+    }
+
+
+async def test_suggest_endpoint_empty_while_engine_cold():
+    async with make_test_client() as client:
+        resp = await client.get("/api/products/suggest?prefix=marg")
+    assert resp.json() == {"suggestions": [], "corrected": None}
+
+
+async def test_suggest_endpoint_requires_prefix():
+    async with make_test_client() as client:
+        resp = await client.get("/api/products/suggest?prefix=m")
+    assert resp.status_code == status.HTTP_422_UNPROCESSABLE_CONTENT
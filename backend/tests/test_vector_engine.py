@@ -0,0 +1,243 @@
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import numpy as np
+import pytest
+
+from backend.repositories.products import WINE_FAMILY
+from backend.repositories.recommendations import find_similar
+from backend.schemas.recommendation import IntentResult
+from backend.services.recommendations import _vector_index
+from backend.tests.conftest import _mock_session_factory
+from backend.vector_engine import VectorEngine, VectorIndex, vector_engine
+from core.categories import classify_category
+from core.embedding_constants import EMBEDDING_DIMENSIONS
+
+_rng = np.random.default_rng(7)
+
+
+def _row(sku: str, **overrides):
+    defaults = {
+        "sku": sku,
+        "last_embedded_hash": f"h-{sku}",
+        "category": "Vin rouge",
+        "country": "France",
+        "grape": None,
+        "price": Decimal("20.00"),
+        "online_availability": True,
+        "store_availability": None,
+    }
+    defaults.update(overrides)
+    _, defaults["category_family"] = classify_category(defaults["category"])
+    return SimpleNamespace(**defaults)
+
+
+ROWS = [
+    _row("A1", category="Vin blanc", grape="Chardonnay 100 %", price=Decimal("30.50")),
+    _row("A2", country="Italie", grape="Nebbiolo", price=Decimal("55.00")),
+    _row("A3", price=None, store_availability=["23101"]),
+    _row("A4", grape="Merlot 60 %, Cabernet franc 40 %", store_availability=["23101", "23102"]),
+    _row("A5", category="Spiritueux", country="Portugal", price=Decimal("18.25")),
+    _row("A6", country="Italie", price=Decimal("0"), online_availability=False),
+    _row("A7", online_availability=None, price=Decimal("12.00")),
+    _row("A8", category="Vin rosé", country="Italie", grape="Sangiovese", price=Decimal("17.95")),
+    _row("A9", grape="merlot", price=Decimal("24.00"), store_availability=["23102"]),
+    _row("B1", country="Espagne", online_availability=False, price=Decimal("22.00")),
+]
+VECTORS = {r.sku: _rng.standard_normal(EMBEDDING_DIMENSIONS) for r in ROWS}
+
+
+def _unit(v: np.ndarray) -> np.ndarray:
+    return (v / np.linalg.norm(v)).astype(np.float32)
+
+
+@pytest.fixture()
+def index() -> VectorIndex:
+    return VectorIndex(ROWS, {sku: _unit(v) for sku, v in VECTORS.items()}, version=3)
+
+
+def _pgvector_reference(
+    intent: IntentResult,
+    query: np.ndarray,
+    *,
+    exclude_skus: list[str] | None = None,
+    available_online: bool = True,
+    in_store: str | None = None,
+    limit: int,
+) -> list[str]:
+    """similar_stmt's WHERE clauses row by row, then ORDER BY cosine distance LIMIT n."""
+    hits = []
+    for r in ROWS:
+        if r.price is None or not r.price > 0:
+            continue
+        if intent.categories and r.category not in intent.categories:
+            continue
+        if not intent.categories and r.category_family != WINE_FAMILY:
+            continue
+        if intent.country is not None and r.country != intent.country:
+            continue
+        if intent.min_price is not None and r.price < intent.min_price:
+            continue
+        if intent.max_price is not None and r.price > intent.max_price:
+            continue
+        if any(r.grape and g.lower() in r.grape.lower() for g in intent.exclude_grapes):
+            continue
+        if exclude_skus and r.sku in exclude_skus:
+            continue
+        if available_online and r.online_availability is not True:
+            continue
+        if in_store is not None and in_store not in (r.store_availability or []):
+            continue
+        v = VECTORS[r.sku]
+        distance = 1 - float(v @ query) / (np.linalg.norm(v) * np.linalg.norm(query))
+        hits.append((distance, r.sku))
+    return [sku for _, sku in sorted(hits)[:limit]]
+
+
+# ── Search ───────────────────────────────────────────────────────
+
+
+@pytest.mark.parametrize(
+    ("intent", "options"),
+    [
+        (IntentResult(), {}),
+        (IntentResult(categories=["Vin blanc", "Vin rosé"]), {}),
+        (IntentResult(categories=["Spiritueux"]), {}),
+        (IntentResult(country="Italie", min_price=Decimal("15"), max_price=Decimal("20")), {}),
+        (IntentResult(exclude_grapes=["MERLOT"]), {}),
+        (IntentResult(), {"exclude_skus": ["A4", "zz"]}),
+        (IntentResult(), {"available_online": False}),
+        (IntentResult(), {"available_online": False, "in_store": "23101"}),
+        (IntentResult(), {"in_store": "99999"}),
+        (IntentResult(country="Nowhere"), {}),
+    ],
+)
+@pytest.mark.parametrize("limit", [2, 25])
+def test_search_matches_pgvector_path(index, intent, options, limit):
+    query = _rng.standard_normal(EMBEDDING_DIMENSIONS)
+    expected = _pgvector_reference(intent, query, limit=limit, **options)
+    assert index.search(intent, query.tolist(), limit=limit, **options) == expected
+
+
+def test_search_scores_with_full_product_or_gather(index):
+    query = VECTORS["A4"] + 0.01 * _rng.standard_normal(EMBEDDING_DIMENSIONS)
+    # Broad filter scores the whole matrix; a narrow one only the matches
+    assert index.search(IntentResult(), query.tolist(), limit=1) == ["A4"]
+    narrow = IntentResult(country="France", min_price=Decimal("20"), max_price=Decimal("20"))
+    assert index.search(narrow, query.tolist(), limit=1, in_store="23102") == ["A4"]
+
+
+def test_vectors_returns_unit_rows_in_requested_order(index):
+    vectors = index.vectors(["B1", "A1"])
+    np.testing.assert_allclose(vectors, [_unit(VECTORS["B1"]), _unit(VECTORS["A1"])], rtol=1e-6)
+
+
+async def test_find_similar_hydrates_index_order_without_pgvector(index):
+    query = _rng.standard_normal(EMBEDDING_DIMENSIONS).tolist()
+    ranked = index.search(IntentResult(), query, limit=25)
+    # Postgres returns rows in any order, minus one delisted since the index was built
+    loaded = [SimpleNamespace(sku=sku) for sku in reversed(ranked[1:])]
+    result = MagicMock()
+    result.scalars.return_value.all.return_value = loaded
+    db = AsyncMock()
+    db.execute.return_value = result
+
+    with patch("backend.repositories.recommendations._rerank", side_effect=lambda c, *_, **__: c):
+        products = await find_similar(db, IntentResult(), query, index=index)
+
+    assert [p.sku for p in products] == ranked[1:]
+    db.execute.assert_awaited_once()  # no hnsw settings, no ORDER BY embedding
+
+
+# ── Engine lifecycle ─────────────────────────────────────────────
+
+
+def _embedded(rows, vectors=VECTORS):
+    return [
+        SimpleNamespace(
+            sku=r.sku, last_embedded_hash=r.last_embedded_hash, embedding=vectors[r.sku]
+        )
+        for r in rows
+    ]
+
+
+async def test_refresh_reads_only_changed_embeddings():
+    engine = VectorEngine()
+    engine._session_factory = _mock_session_factory()
+    with (
+        patch("backend.vector_engine.get_version", new_callable=AsyncMock) as mock_version,
+        patch("backend.vector_engine.fetch_vector_rows", new_callable=AsyncMock) as mock_rows,
+        patch("backend.vector_engine.fetch_embeddings", new_callable=AsyncMock) as mock_fetch,
+    ):
+        mock_version.return_value = 1
+        mock_rows.return_value = ROWS
+        mock_fetch.side_effect = lambda _db, skus: _embedded([r for r in ROWS if r.sku in skus])
+        await engine.refresh()
+        assert sorted(mock_fetch.call_args.args[1]) == sorted(VECTORS)
+
+        # A1 re-embedded, A2 delisted, C1 new; A3's price changed but not its embedding
+        changed = {**VECTORS, "A1": _rng.standard_normal(EMBEDDING_DIMENSIONS)}
+        changed["C1"] = _rng.standard_normal(EMBEDDING_DIMENSIONS)
+        rows = [
+            _row("A1", category="Vin blanc", last_embedded_hash="h-A1-v2"),
+            _row("A3", price=Decimal("9.00")),
+            *(r for r in ROWS if r.sku not in ("A1", "A2", "A3")),
+            _row("C1"),
+        ]
+        mock_version.return_value = 2
+        mock_rows.return_value = rows
+        mock_fetch.side_effect = lambda _db, skus: _embedded(
+            [r for r in rows if r.sku in skus], changed
+        )
+        await engine.refresh()
+
+    assert sorted(mock_fetch.call_args.args[1]) == ["A1", "C1"]
+    index = engine.get(2)
+    assert index is engine.index
+    assert "A2" not in index.skus
+    assert len(index) == len(ROWS)
+    for sku in index.skus:
+        i = index.skus.index(sku)
+        np.testing.assert_allclose(index.matrix[i], _unit(changed[sku]), rtol=1e-6)
+    assert index.hashes[index.skus.index("A1")] == "h-A1-v2"
+    assert index.price[index.skus.index("A3")] == 9.0
+
+
+async def test_refresh_failure_keeps_previous_index(index):
+    engine = VectorEngine()
+    engine.index = index
+    engine._session_factory = _mock_session_factory()
+    with patch("backend.vector_engine.get_version", new_callable=AsyncMock) as mock_version:
+        mock_version.side_effect = RuntimeError("db down")
+        await engine.refresh()
+    assert engine.index is index
+
+
+async def test_get_returns_none_and_refreshes_on_version_change(index):
+    engine = VectorEngine()
+    engine.index = index
+    engine._session_factory = _mock_session_factory()
+    with patch.object(engine, "refresh", new_callable=AsyncMock) as mock_refresh:
+        assert engine.get(3) is index
+        assert engine.get(4) is None
+        await engine._refresh_task
+    mock_refresh.assert_awaited_once()
+
+
+def test_get_is_cold_until_started():
+    assert VectorEngine().get(0) is None
+
+
+async def test_service_uses_index_only_when_started_and_current(index):
+    db = AsyncMock()
+    assert await _vector_index(db) is None
+
+    vector_engine.index = index
+    vector_engine._session_factory = _mock_session_factory()
+    try:
+        with patch("backend.services.recommendations.catalog_version", return_value=3):
+            assert await _vector_index(db) is index
+    finally:
+        vector_engine.index = None
+        vector_engine._session_factory = None
@@ -0,0 +1,259 @@
+import asyncio
+from collections.abc import Iterable, Mapping
+from typing import Any
+
+import numpy as np
+from loguru import logger
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from backend.repositories.catalog import get_version
+from backend.repositories.products import WINE_FAMILY
+from backend.repositories.recommendations import fetch_embeddings, fetch_vector_rows
+from backend.schemas.recommendation import IntentResult
+from core.embedding_constants import EMBEDDING_DIMENSIONS
+
+# Below this share of matching rows, score only the matches (a gather copies them);
+# above it, one product over the whole matrix is cheaper than the copy.
+_GATHER_BELOW = 0.25
+
+
+def _unit(vector: Any) -> np.ndarray:
+    """float32 copy scaled to unit length — cosine similarity becomes a dot product."""
+    v = np.asarray(vector, dtype=np.float32)
+    norm = np.linalg.norm(v)
+    return v / norm if norm else v
+
+
+class _Codes:
+    """Dictionary-encoded string column; -1 is NULL."""
+
+    def __init__(self, values: list[str | None]) -> None:
+        self.values: list[str] = sorted({v for v in values if v is not None})
+        self.lookup: dict[str, int] = {v: i for i, v in enumerate(self.values)}
+        self.codes = np.fromiter(
+            (self.lookup[v] if v is not None else -1 for v in values),
+            dtype=np.int32,
+            count=len(values),
+        )
+
+    def isin(self, values: Iterable[str]) -> np.ndarray:
+        return np.isin(self.codes, [self.lookup[v] for v in values if v in self.lookup])
+
+    def contains(self, fragment: str) -> np.ndarray:
+        """Rows whose value contains `fragment`, case-insensitively (ILIKE '%fragment%')."""
+        needle = fragment.casefold()
+        return np.isin(self.codes, [i for i, v in enumerate(self.values) if needle in v.casefold()])
+
+
+class VectorIndex:
+    """Active product embeddings and the columns find_similar filters on, as NumPy arrays.
+
+    Filters become one boolean mask, scores one matrix-vector product over unit vectors,
+    top-k an argpartition. Returns SKUs — the caller hydrates them from Postgres.
+    """
+
+    def __init__(
+        self,
+        rows: list[Any],
+        fresh: Mapping[str, np.ndarray],
+        version: int,
+        *,
+        previous: "VectorIndex | None" = None,
+        hashes: Mapping[str, str | None] | None = None,
+    ) -> None:
+        """`fresh` holds newly read unit vectors; every other row's is copied from `previous`.
+
+        `hashes` overrides the rows' last_embedded_hash — the hash each vector was read at.
+        """
+        self.version = version
+        held = previous._index if previous is not None else {}
+        ordered = sorted((r for r in rows if r.sku in fresh or r.sku in held), key=lambda r: r.sku)
+        self.skus: list[str] = [r.sku for r in ordered]
+        self._index: dict[str, int] = {sku: i for i, sku in enumerate(self.skus)}
+        hashes = hashes or {}
+        self.hashes: list[str | None] = [hashes.get(r.sku, r.last_embedded_hash) for r in ordered]
+
+        self.matrix = np.empty((len(ordered), EMBEDDING_DIMENSIONS), dtype=np.float32)
+        kept = [(i, held[sku]) for i, sku in enumerate(self.skus) if sku not in fresh]
+        if previous is not None and kept:
+            new, old = np.array(kept, dtype=np.int64).T
+            self.matrix[new] = previous.matrix[old]
+        for i, sku in enumerate(self.skus):
+            if sku in fresh:
+                self.matrix[i] = fresh[sku]
+
+        self._category = _Codes([r.category for r in ordered])
+        self._country = _Codes([r.country for r in ordered])
+        self._grape = _Codes([r.grape for r in ordered])
+        self.price = np.array(
+            [float(r.price) if r.price is not None else np.nan for r in ordered], dtype=np.float64
+        )
+        self.online = np.array([r.online_availability is True for r in ordered], dtype=bool)
+        self.is_wine = np.array([r.category_family == WINE_FAMILY for r in ordered], dtype=bool)
+        carriers: dict[str, list[int]] = {}
+        for i, r in enumerate(ordered):
+            for store_id in r.store_availability or ():
+                carriers.setdefault(store_id, []).append(i)
+        self._stores = {k: np.array(v, dtype=np.int32) for k, v in carriers.items()}
+
+    def __len__(self) -> int:
+        return len(self.skus)
+
+    def vectors(self, skus: list[str]) -> np.ndarray:
+        """Unit vectors of `skus`, one row each, in order."""
+        return self.matrix[[self._index[sku] for sku in skus]]
+
+    def mask(
+        self,
+        intent: IntentResult,
+        *,
+        exclude_skus: list[str] | None = None,
+        available_online: bool = True,
+        in_store: str | None = None,
+    ) -> np.ndarray:
+        """Boolean row mask — same semantics as repositories.recommendations.similar_stmt."""
+        # NaN comparisons are False — NULL prices drop out like `price > 0` does in SQL
+        mask = self.price > 0
+        if intent.categories:
+            mask &= self._category.isin(intent.categories)
+        else:
+            mask &= self.is_wine
+        if intent.country is not None:
+            mask &= self._country.isin([intent.country])
+        if intent.min_price is not None:
+            mask &= self.price >= float(intent.min_price)
+        if intent.max_price is not None:
+            mask &= self.price <= float(intent.max_price)
+        for grape in intent.exclude_grapes:
+            # NULL grapes stay, as in SQL
+            mask &= ~self._grape.contains(grape)
+        if exclude_skus:
+            excluded = [self._index[s] for s in exclude_skus if s in self._index]
+            mask[excluded] = False
+        if available_online:
+            mask &= self.online
+        if in_store is not None:
+            carried = np.zeros(len(self.skus), dtype=bool)
+            ordinals = self._stores.get(in_store)
+            if ordinals is not None:
+                carried[ordinals] = True
+            mask &= carried
+        return mask
+
+    def search(
+        self,
+        intent: IntentResult,
+        query_embedding: list[float],
+        *,
+        exclude_skus: list[str] | None = None,
+        available_online: bool = True,
+        in_store: str | None = None,
+        limit: int,
+    ) -> list[str]:
+        """SKUs of the `limit` closest matches by cosine similarity, closest first."""
+        ids = np.flatnonzero(
+            self.mask(
+                intent,
+                exclude_skus=exclude_skus,
+                available_online=available_online,
+                in_store=in_store,
+            )
+        )
+        if not len(ids):
+            return []
+        query = _unit(query_embedding)
+        if len(ids) < _GATHER_BELOW * len(self.skus):
+            scores = self.matrix[ids] @ query
+        else:
+            scores = (self.matrix @ query)[ids]
+        if len(ids) > limit:
+            top = np.argpartition(-scores, limit - 1)[:limit]
+        else:
+            top = np.arange(len(ids))
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [self.skus[i] for i in ids[top]]
+
+
+class VectorEngine:
+    """Holds the current vector index and refreshes it in the background on version bumps.
+
+    A refresh re-reads the small filter columns of every embedded product but only the
+    embeddings whose last_embedded_hash changed. While the index lags the catalog version
+    (or before the first load), get() returns None and find_similar uses pgvector.
+    """
+
+    def __init__(self) -> None:
+        self.index: VectorIndex | None = None
+        self._session_factory: async_sessionmaker[AsyncSession] | None = None
+        self._refresh_task: asyncio.Task | None = None
+
+    @property
+    def started(self) -> bool:
+        return self._session_factory is not None
+
+    def start(self, session_factory: async_sessionmaker[AsyncSession]) -> None:
+        """Enable the engine and begin the initial load. Until it lands, search uses pgvector."""
+        self._session_factory = session_factory
+        self._schedule_refresh()
+
+    async def stop(self) -> None:
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            await asyncio.gather(self._refresh_task, return_exceptions=True)
+        self._session_factory = None
+        self._refresh_task = None
+        self.index = None
+
+    def get(self, version: int) -> VectorIndex | None:
+        """Return the index if it matches `version`, else kick off a refresh and return None."""
+        if self.index is not None and self.index.version == version:
+            return self.index
+        if self.started:
+            self._schedule_refresh()
+        return None
+
+    def _schedule_refresh(self) -> None:
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self.refresh())
+
+    async def refresh(self) -> None:
+        """Re-read filter columns, fetch embeddings whose hash changed, rebuild the index."""
+        if self._session_factory is None:
+            return
+        previous = self.index
+        held: dict[str, str | None] = (
+            dict(zip(previous.skus, previous.hashes, strict=True)) if previous is not None else {}
+        )
+        try:
+            async with self._session_factory() as db:
+                # Read the version first — the index is never labelled newer than its data
+                version = await get_version(db)
+                rows = await fetch_vector_rows(db)
+                stale = [
+                    r.sku for r in rows if r.sku not in held or held[r.sku] != r.last_embedded_hash
+                ]
+                fetched = await fetch_embeddings(db, stale)
+        except Exception as exc:
+            logger.opt(exception=exc).warning(
+                "Vector engine refresh failed — searching with pgvector"
+            )
+            return
+
+        fresh = {r.sku: _unit(r.embedding) for r in fetched}
+        # Keep the hash each vector was read at, so a re-embed landing between the two
+        # reads is picked up by the next refresh
+        hashes = {r.sku: r.last_embedded_hash for r in fetched}
+        # Copying ~6 KB per product (~90 MB at 14k) — keep it off the event loop
+        self.index = await asyncio.to_thread(
+            VectorIndex, rows, fresh, version, previous=previous, hashes=hashes
+        )
+        logger.info(
+            "Vector engine loaded version {} ({} vectors, {} read)",
+            version,
+            len(self.index),
+            len(fetched),
+        )
+
+
+# Module-level singleton — started in the app lifespan when VECTOR_SEARCH_BACKEND="memory".
+vector_engine = VectorEngine()
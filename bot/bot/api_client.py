@@ -52,6 +52,14 @@ class BackendClient:
         """GET /api/products/{sku}. Returns None if 404."""
         return await self._get_or_none(f"/products/{sku}")
 
+    async def get_products(self, skus: list[str]) -> dict[str, Any]:
+        """GET /api/products/batch — many products in one call (up to 200 SKUs).
+
+        Returns {"products": [...], "missing": [...], "delisted": [...]}, products in
+        request order.
+        """
+        return await self._get("/products/batch", params=[("sku", sku) for sku in skus])
+
     # ── Recommendations ──────────────────────────────────────────
 
     async def recommend(
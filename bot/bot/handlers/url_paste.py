@@ -12,40 +12,41 @@ from bot.keyboards import build_watch_prompt_keyboard
 _SAQ_URL_RE = re.compile(r"https?://(?:www\.)?saq\.com/(?:fr|en)/(\d+)")
 
 
-def _extract_sku(text: str) -> str | None:
-    m = _SAQ_URL_RE.search(text)
-    return m.group(1) if m else None
+def _extract_skus(text: str) -> list[str]:
+    """Every SAQ product SKU linked in the text, first occurrence order, no duplicates."""
+    return list(dict.fromkeys(_SAQ_URL_RE.findall(text)))
 
 
 async def url_paste_handler(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
-    """Detect SAQ product URLs in messages and offer a Watch / Skip prompt."""
-    sku = _extract_sku(update.message.text or "")
-    if not sku:
+    """Detect SAQ product URLs in messages and offer a Watch / Skip prompt for each."""
+    skus = _extract_skus(update.message.text or "")
+    if not skus:
         return
 
     api: BackendClient = context.bot_data["api"]
     try:
-        product = await api.get_product(sku)
+        # One round trip however many links were pasted
+        batch = await api.get_products(skus)
     except BackendUnavailableError as exc:
         logger.warning("Backend unavailable during URL paste handler: {}", exc)
         return
 
-    if not product:
-        return  # SKU not in our catalog — ignore silently
-
-    name = product.get("name") or "Unknown"
-    price = product.get("price")
-    available = product.get("online_availability")
-    price_str = f"{price}$" if price is not None else "N/A"
-    status = "\u2705" if available else "\u274c"
-    card = f"[{name}]({SAQ_BASE_URL}/{sku}) \u2014 {price_str} {status}"
-
-    await update.message.reply_text(
-        card,
-        parse_mode="Markdown",
-        disable_web_page_preview=True,
-        reply_markup=build_watch_prompt_keyboard(sku),
-    )
+    # SKUs not in our catalog (or delisted) are ignored silently
+    for product in batch["products"]:
+        sku = product["sku"]
+        name = product.get("name") or "Unknown"
+        price = product.get("price")
+        available = product.get("online_availability")
+        price_str = f"{price}$" if price is not None else "N/A"
+        status = "\u2705" if available else "\u274c"
+        card = f"[{name}]({SAQ_BASE_URL}/{sku}) \u2014 {price_str} {status}"
+
+        await update.message.reply_text(
+            card,
+            parse_mode="Markdown",
+            disable_web_page_preview=True,
+            reply_markup=build_watch_prompt_keyboard(sku),
+        )
 
 
 async def watch_confirm_callback(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
@@ -53,6 +53,21 @@ async def test_get_product_returns_none_when_not_found(client: BackendClient) ->
     assert result is None
 
 
+# ── Products: batch ─────────────────────────────────────────────
+
+
+async def test_get_products_sends_repeated_sku_params(client: BackendClient) -> None:
+    data = {"products": [{"sku": "A"}], "missing": ["B"], "delisted": []}
+    client._client.request.return_value = _response(json_data=data)
+
+    result = await client.get_products(["A", "B"])
+
+    assert result == data
+    call = client._client.request.call_args
+    assert call.args[:2] == ("GET", "/products/batch")
+    assert call.kwargs["params"] == [("sku", "A"), ("sku", "B")]
+
+
 # ── Watches: create ─────────────────────────────────────────────
 
 
@@ -6,7 +6,7 @@ import pytest
 from bot.api_client import BackendAPIError, BackendUnavailableError
 from bot.config import CALLBACK_WATCH_CONFIRM, CALLBACK_WATCH_SKIP
 from bot.handlers.url_paste import (
-    _extract_sku,
+    _extract_skus,
     url_paste_handler,
     watch_confirm_callback,
     watch_skip_callback,
@@ -16,23 +16,25 @@ from .conftest import TEST_USER_ID
 
 _USER_ID_STR = f"tg:{TEST_USER_ID}"
 
-# ── _extract_sku ─────────────────────────────────────────────
+# ── _extract_skus ────────────────────────────────────────────
 
 
 @pytest.mark.parametrize(
     "text,expected",
     [
-        ("https://www.saq.com/fr/12345678", "12345678"),
-        ("https://www.saq.com/en/12345678", "12345678"),
-        ("https://saq.com/fr/12345678", "12345678"),  # no www
-        ("check this out https://www.saq.com/fr/99999 looks good", "99999"),
-        ("no url here", None),
-        ("https://www.example.com/fr/12345678", None),
-        ("https://notsaq.com/fr/12345678", None),  # subdomain spoofing
+        ("https://www.saq.com/fr/12345678", ["12345678"]),
+        ("https://www.saq.com/en/12345678", ["12345678"]),
+        ("https://saq.com/fr/12345678", ["12345678"]),  # no www
+        ("check this out https://www.saq.com/fr/99999 looks good", ["99999"]),
+        ("https://saq.com/fr/111 vs https://saq.com/en/222", ["111", "222"]),
+        ("https://saq.com/fr/111 https://saq.com/en/111", ["111"]),  # deduplicated
+        ("no url here", []),
+        ("https://www.example.com/fr/12345678", []),
+        ("https://notsaq.com/fr/12345678", []),  # subdomain spoofing
     ],
 )
-def test_extract_sku(text: str, expected: str | None) -> None:
-    assert _extract_sku(text) == expected
+def test_extract_skus(text: str, expected: list[str]) -> None:
+    assert _extract_skus(text) == expected
 
 
 # ── url_paste_handler ────────────────────────────────────────
@@ -56,30 +58,46 @@ _PRODUCT = {
 }
 
 
+def _batch(*products, missing=(), delisted=()):
+    return {"products": list(products), "missing": list(missing), "delisted": list(delisted)}
+
+
 async def test_url_paste_sends_card_with_keyboard(update, context, api):
-    api.get_product.return_value = _PRODUCT
+    api.get_products.return_value = _batch(_PRODUCT)
     await url_paste_handler(update, context)
+    api.get_products.assert_awaited_once_with(["12345678"])
     update.message.reply_text.assert_called_once()
     call = update.message.reply_text.call_args
     assert "Mouton Cadet" in call[0][0]
     assert call[1]["reply_markup"] is not None
 
 
+async def test_url_paste_several_urls_one_lookup(update, context, api):
+    update.message.text = "https://www.saq.com/fr/12345678 or https://www.saq.com/fr/87654321"
+    other = {**_PRODUCT, "sku": "87654321", "name": "Château Musar"}
+    api.get_products.return_value = _batch(_PRODUCT, other)
+    await url_paste_handler(update, context)
+    api.get_products.assert_awaited_once_with(["12345678", "87654321"])
+    cards = [call[0][0] for call in update.message.reply_text.call_args_list]
+    assert len(cards) == 2
+    assert "Château Musar" in cards[1]
+
+
 async def test_url_paste_no_saq_url(update, context, api):
     update.message.text = "just a normal message"
     await url_paste_handler(update, context)
-    api.get_product.assert_not_called()
+    api.get_products.assert_not_called()
     update.message.reply_text.assert_not_called()
 
 
 async def test_url_paste_product_not_found(update, context, api):
-    api.get_product.return_value = None
+    api.get_products.return_value = _batch(missing=["12345678"])
     await url_paste_handler(update, context)
     update.message.reply_text.assert_not_called()
 
 
 async def test_url_paste_backend_unavailable(update, context, api):
-    api.get_product.side_effect = BackendUnavailableError("down")
+    api.get_products.side_effect = BackendUnavailableError("down")
     await url_paste_handler(update, context)
     update.message.reply_text.assert_not_called()
 
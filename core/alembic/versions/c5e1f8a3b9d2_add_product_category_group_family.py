@@ -0,0 +1,133 @@
+"""add product category_group and category_family
+
+Revision ID: c5e1f8a3b9d2
+Revises: a7c3d9e2f4b1
+Create Date: 2026-10-16 16:42:37.918204
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c5e1f8a3b9d2"
+down_revision: str | Sequence[str] | None = "a7c3d9e2f4b1"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# Frozen copy of core.categories at this revision — (group, family, prefixes), first match wins
+_GROUPS: list[tuple[str, str, tuple[str, ...]]] = [
+    ("rouge", "vins", ("Vin rouge",)),
+    ("blanc", "vins", ("Vin blanc",)),
+    ("rose", "vins", ("Vin rosé",)),
+    ("bulles", "vins", ("Champagne", "Vin mousseux")),
+    (
+        "fortifie",
+        "vins",
+        (
+            "Porto",
+            "Madère",
+            "Xérès",
+            "Marsala",
+            "Sauternes",
+            "Muscat",
+            "Pineau",
+            "Banyuls",
+            "Maury",
+            "Rivesaltes",
+            "Macvin",
+            "Floc",
+            "Moscatel",
+            "Montilla",
+            "Vin de dessert",
+            "Vin de glace",
+            "Vin fortifié",
+            "Vin doux naturel",
+        ),
+    ),
+    ("whisky", "spiritueux", ("Whisky", "Whiskey")),
+    ("rhum", "spiritueux", ("Rhum",)),
+    ("gin", "spiritueux", ("Dry gin", "Genièvre")),
+    ("vodka", "spiritueux", ("Vodka",)),
+    ("tequila", "spiritueux", ("Téquila", "Mezcal", "Sotol")),
+    ("cognac", "spiritueux", ("Cognac", "Armagnac", "Brandy", "Calvados", "Pisco")),
+    ("liqueur", "spiritueux", ("Liqueur",)),
+    ("biere", "autres", ("Bière",)),
+    ("cidre", "autres", ("Cidre", "Poiré")),
+    (
+        "eauxdevie",
+        "spiritueux",
+        ("Eau-de-vie", "Eaux-de-vie", "Grappa", "Kirsch", "Poire Williams", "Marc "),
+    ),
+    (
+        "aperitif",
+        "spiritueux",
+        ("Vermouth", "Apéritif", "Vin apéritif", "Alcool anisé", "Absinthe", "Anisette"),
+    ),
+    ("cocktail", "autres", ("Cocktail", "Cooler")),
+    ("boisson", "autres", ("Boisson",)),
+    ("sake", "vins", ("Saké",)),
+    ("hydromel", "autres", ("Hydromel",)),
+]
+
+
+def _classify(category: str) -> tuple[str, str]:
+    for group, family, prefixes in _GROUPS:
+        if category.startswith(prefixes):
+            return group, family
+    return "autre", "autres"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # ### commands auto generated by Alembic - please adjust! ###
+    op.add_column(
+        "products",
+        sa.Column(
+            "category_group",
+            sa.String(),
+            nullable=True,
+            comment="CATEGORY_GROUPS key derived from category at write time",
+        ),
+    )
+    op.add_column(
+        "products",
+        sa.Column(
+            "category_family",
+            sa.String(),
+            nullable=True,
+            comment="CATEGORY_FAMILIES key derived from category at write time",
+        ),
+    )
+    # ### end Alembic commands ###
+
+    # A few hundred distinct categories — classify each once, one UPDATE per category
+    conn = op.get_bind()
+    categories = conn.execute(
+        sa.text("SELECT DISTINCT category FROM products WHERE category IS NOT NULL")
+    ).scalars()
+    backfill = sa.text(
+        "UPDATE products SET category_group = :group, category_family = :family "
+        "WHERE category = :category"
+    )
+    for category in list(categories):
+        group, family = _classify(category)
+        conn.execute(backfill, {"group": group, "family": family, "category": category})
+
+    op.create_index(
+        op.f("ix_products_category_group"), "products", ["category_group"], unique=False
+    )
+    op.create_index(
+        op.f("ix_products_category_family"), "products", ["category_family"], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f("ix_products_category_family"), table_name="products")
+    op.drop_index(op.f("ix_products_category_group"), table_name="products")
+    op.drop_column("products", "category_family")
+    op.drop_column("products", "category_group")
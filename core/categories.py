@@ -11,7 +11,7 @@ class CategoryFamily(NamedTuple):
     children: tuple[str, ...]  # keys into CATEGORY_GROUPS
 
 
-#! Order matters — first match wins in group_facets(). Keep specific prefixes before generic ones.
+#! Order matters — first match wins in category_group(). Keep specific prefixes before generic ones.
 CATEGORY_GROUPS: dict[str, CategoryGroup] = {
     "rouge": CategoryGroup("Vin rouge", ("Vin rouge",)),
     "blanc": CategoryGroup("Vin blanc", ("Vin blanc",)),
@@ -79,6 +79,30 @@ CATEGORY_FAMILIES: dict[str, CategoryFamily] = {
 }
 
 
+# Group key → family key (every group belongs to exactly one family)
+_FAMILY_OF: dict[str, str] = {
+    group_key: family_key
+    for family_key, family in CATEGORY_FAMILIES.items()
+    for group_key in family.children
+}
+
+
+def category_group(category: str) -> str:
+    """Return the group key for a raw DB category — first prefix match wins, else "autre"."""
+    for key, group in CATEGORY_GROUPS.items():
+        if any(category.startswith(prefix) for prefix in group.prefixes):
+            return key
+    return "autre"
+
+
+def classify_category(category: str | None) -> tuple[str | None, str | None]:
+    """Return (group key, family key) stored on products at write time — (None, None) for NULL."""
+    if category is None:
+        return None, None
+    group_key = category_group(category)
+    return group_key, _FAMILY_OF[group_key]
+
+
 def group_facets(raw_categories: list[str]) -> dict[str, list[str]]:
     """Group raw DB categories into user-friendly groups using prefix matching.
 
@@ -86,19 +110,8 @@ def group_facets(raw_categories: list[str]) -> dict[str, list[str]]:
     Unmatched categories land in "autre".
     """
     grouped: dict[str, list[str]] = {}
-
     for cat in raw_categories:
-        matched = False
-        for key, group in CATEGORY_GROUPS.items():
-            if key == "autre":
-                continue
-            if any(cat.startswith(prefix) for prefix in group.prefixes):
-                grouped.setdefault(key, []).append(cat)
-                matched = True
-                break
-        if not matched:
-            grouped.setdefault("autre", []).append(cat)
-
+        grouped.setdefault(category_group(cat), []).append(cat)
     return grouped
 
 
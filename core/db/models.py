@@ -1,6 +1,6 @@
 from datetime import UTC, date, datetime
 
-from pgvector.sqlalchemy import Vector
+from pgvector.sqlalchemy import HALFVEC, Vector
 from sqlalchemy import (
     BigInteger,
     Boolean,
@@ -16,11 +16,13 @@ from sqlalchemy import (
     String,
     Text,
     UniqueConstraint,
+    text,
 )
-from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR
+from sqlalchemy.orm import deferred
 
 from core.db.base import Base
-from core.embedding_constants import EMBEDDING_DIMENSIONS
+from core.embedding_constants import EMBEDDING_DIMENSIONS, EMBEDDING_PREFIX_DIMENSIONS
 
 
 class User(Base):
@@ -223,12 +225,63 @@ class Product(Base):
             postgresql_using="gin",
             postgresql_ops={"name": "gin_trgm_ops"},
         ),
+        # GIN on the weighted French document: full-text search (WHERE search_vector @@ ...)
+        Index(
+            "ix_products_search_vector",
+            "search_vector",
+            postgresql_using="gin",
+        ),
         # GIN on store_availability for @> containment queries ("available at store X")
         Index(
             "ix_products_store_availability_gin",
             "store_availability",
             postgresql_using="gin",
         ),
+        # Keyset pagination: one (sort column, sku) index per listing sort, active rows only.
+        # DESC sorts (recent, price_desc) scan these backwards.
+        Index(
+            "ix_products_active_updated_at_sku",
+            "updated_at",
+            "sku",
+            postgresql_where=text("delisted_at IS NULL"),
+        ),
+        Index(
+            "ix_products_active_price_sku",
+            "price",
+            "sku",
+            postgresql_where=text("delisted_at IS NULL"),
+        ),
+        Index(
+            "ix_products_active_name_sku",
+            "name",
+            "sku",
+            postgresql_where=text("delisted_at IS NULL"),
+        ),
+        # Random picks: seek to a random threshold instead of ORDER BY random()
+        Index(
+            "ix_products_active_random_key",
+            "random_key",
+            postgresql_where=text("delisted_at IS NULL"),
+        ),
+        # HNSW on embeddings: approximate nearest neighbours (ORDER BY embedding <=> :q).
+        # find_similar tunes ef_search / iterative scan per query, see repositories
+        Index(
+            "ix_products_active_embedding_hnsw",
+            "embedding",
+            postgresql_using="hnsw",
+            postgresql_with={"m": 16, "ef_construction": 64},
+            postgresql_ops={"embedding": "vector_cosine_ops"},
+            postgresql_where=text("delisted_at IS NULL"),
+        ),
+        # HNSW on the half-precision prefix: the quantized first pass, re-ranked on embedding
+        Index(
+            "ix_products_active_embedding_prefix_hnsw",
+            "embedding_prefix",
+            postgresql_using="hnsw",
+            postgresql_with={"m": 16, "ef_construction": 64},
+            postgresql_ops={"embedding_prefix": "halfvec_cosine_ops"},
+            postgresql_where=text("delisted_at IS NULL"),
+        ),
     )
 
     # Primary key: SAQ SKU (immutable business identifier)
@@ -260,11 +313,31 @@ class Product(Base):
         nullable=True,
         comment="SHA256 of scraped ProductData fields — skip write when unchanged",
     )
+    random_key = Column(
+        Float,
+        nullable=False,
+        server_default=text("random()"),
+        comment="Uniform [0, 1) shuffle key, fixed at insert — random picks seek on it",
+    )
 
     # JSON-LD fields (from <script type="application/ld+json">)
     name = Column(String, nullable=True, index=True, comment="Product name")
-    description = Column(Text, nullable=True, comment="Product description")
+    # Deferred, like tasting_profile and embedding: no list or detail view shows it, so
+    # select(Product) skips it — opt in with undefer() or select the column
+    description = deferred(Column(Text, nullable=True, comment="Product description"))
     category = Column(String, nullable=True, index=True, comment="Product category")
+    category_group = Column(
+        String,
+        nullable=True,
+        index=True,
+        comment="CATEGORY_GROUPS key derived from category at write time",
+    )
+    category_family = Column(
+        String,
+        nullable=True,
+        index=True,
+        comment="CATEGORY_FAMILIES key derived from category at write time",
+    )
     country = Column(String, nullable=True, index=True, comment="Country of origin")
     size = Column(String, nullable=True, comment="Bottle size (e.g., 750ml)")
     image = Column(String, nullable=True, comment="Product image URL")
@@ -288,13 +361,26 @@ class Product(Base):
         String, nullable=True, comment="SAQ taste profile (e.g. 'Aromatique et souple')"
     )
     vintage = Column(String, nullable=True, comment="Millésime (e.g. '2023')")
-    tasting_profile = Column(JSONB, nullable=True, comment="portrait_* attributes from Adobe")
+    tasting_profile = deferred(
+        Column(JSONB, nullable=True, comment="portrait_* attributes from Adobe")
+    )
     grape_blend = Column(
         JSONB,
         nullable=True,
         comment='Structured blend: [{"code":"MALB","pct":96},{"code":"SYRA","pct":4}]',
     )
 
+    # Full-text search (writers: scrape upsert, enrich) — see core.db.search.
+    # Deferred: only ever read inside SQL, never loaded onto ORM objects.
+    search_vector = deferred(
+        Column(
+            TSVECTOR,
+            nullable=True,
+            comment="Weighted french_unaccent tsvector: name/producer A, grape/region/"
+            "appellation B, description C, taste_tag D",
+        )
+    )
+
     # Availability (writer: availability subcommand)
     store_availability = Column(
         JSONB,
@@ -302,11 +388,22 @@ class Product(Base):
         comment='Store IDs carrying this product: ["23002","23004",...]',
     )
 
-    # Embedding support (writer: embed subcommand)
-    embedding = Column(
-        Vector(EMBEDDING_DIMENSIONS),
-        nullable=True,
-        comment="Wine semantic embedding (text-embedding-3-large, 1536d)",
+    # Embedding support (writer: embed subcommand). Deferred: ~6 KB per row, only ever
+    # compared inside SQL on the vector search path
+    embedding = deferred(
+        Column(
+            Vector(EMBEDDING_DIMENSIONS),
+            nullable=True,
+            comment="Wine semantic embedding (text-embedding-3-large, 1536d)",
+        )
+    )
+    # ~0.5 KB: searched first, then only the closest few hundred re-ranked on `embedding`
+    embedding_prefix = deferred(
+        Column(
+            HALFVEC(EMBEDDING_PREFIX_DIMENSIONS),
+            nullable=True,
+            comment="First 256 dims of embedding, renormalized, half precision — first pass",
+        )
     )
     last_embedded_hash = Column(
         String,
@@ -318,6 +415,35 @@ class Product(Base):
         return f"<Product(sku={self.sku!r}, name={self.name!r})>"
 
 
+class CatalogState(Base):
+    """Singleton row stamping the catalog version.
+
+    The scraper bumps `version` after each command that writes product data; the backend
+    keys catalog caches on it so they invalidate without a TTL guessing game.
+    """
+
+    __tablename__ = "catalog_state"
+    __table_args__ = (CheckConstraint("id = 1", name="ck_catalog_state_singleton"),)
+
+    id = Column(Integer, primary_key=True, default=1)
+    version = Column(
+        BigInteger,
+        nullable=False,
+        default=0,
+        comment="Monotonic catalog version — incremented on every scraper write",
+    )
+    updated_at = Column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(UTC),
+        onupdate=lambda: datetime.now(UTC),
+        nullable=False,
+        comment="When the version was last bumped",
+    )
+
+    def __repr__(self) -> str:
+        return f"<CatalogState(version={self.version!r})>"
+
+
 class Watch(Base):
     """User watch on a product — triggers alerts on availability changes."""
 
@@ -383,6 +509,33 @@ class UserStorePreference(Base):
         )
 
 
+class StoreInventory(Base):
+    """Store → SKU inventory, normalized from Product.store_availability.
+
+    Rewritten alongside store_availability by the availability scraper so "what does
+    store X carry" is a primary-key range scan instead of a scan of every product's
+    JSONB array. No FK to stores — availability can name stores before they're scraped.
+    """
+
+    __tablename__ = "store_inventory"
+
+    saq_store_id = Column(
+        String,
+        primary_key=True,
+        comment="SAQ store identifier carrying the product",
+    )
+    sku = Column(
+        String,
+        ForeignKey("products.sku", ondelete="CASCADE"),
+        primary_key=True,
+        index=True,
+        comment="Product SKU in stock at the store",
+    )
+
+    def __repr__(self) -> str:
+        return f"<StoreInventory(saq_store_id={self.saq_store_id!r}, sku={self.sku!r})>"
+
+
 class StockEvent(Base):
     """Records product availability transitions.
 
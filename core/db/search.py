@@ -0,0 +1,43 @@
+from collections.abc import Mapping
+from functools import reduce
+from typing import Any
+
+from sqlalchemy import ColumnElement, Text, cast, func, literal_column
+
+# French stemming over unaccented tokens — created by migration a7c3d9e2f4b1
+SEARCH_CONFIG = "french_unaccent"
+
+# Searchable product fields and their tsvector weights (A ranks highest)
+SEARCH_WEIGHTS: dict[str, str] = {
+    "name": "A",
+    "producer": "A",
+    "grape": "B",
+    "region": "B",
+    "appellation": "B",
+    "description": "C",
+    "taste_tag": "D",
+}
+
+_REGCONFIG = literal_column(f"'{SEARCH_CONFIG}'::regconfig")
+
+
+def search_document(fields: Mapping[str, Any]) -> ColumnElement:
+    """Weighted tsvector over SEARCH_WEIGHTS.
+
+    `fields` maps each field name to a SQL expression (table columns, `excluded`,
+    bind parameters) or a plain value — so the same document can be built in an
+    INSERT, an upsert or a bulk UPDATE.
+    """
+    parts = [
+        func.setweight(
+            func.to_tsvector(_REGCONFIG, func.coalesce(cast(fields[f], Text), "")),
+            literal_column(f"'{w}'"),
+        )
+        for f, w in SEARCH_WEIGHTS.items()
+    ]
+    return reduce(lambda doc, part: doc.op("||")(part), parts)
+
+
+def search_query(q: str) -> ColumnElement:
+    """tsquery for free text — websearch syntax never raises on stray quotes or operators."""
+    return func.websearch_to_tsquery(_REGCONFIG, q)
@@ -1,8 +1,14 @@
 from __future__ import annotations
 
+import math
+
 from openai import AsyncOpenAI, OpenAI
 
-from core.embedding_constants import EMBEDDING_DIMENSIONS, EMBEDDING_MODEL
+from core.embedding_constants import (
+    EMBEDDING_DIMENSIONS,
+    EMBEDDING_MODEL,
+    EMBEDDING_PREFIX_DIMENSIONS,
+)
 
 # OpenAI batch limit: max 2048 texts per request.
 # We use a smaller batch to keep memory and request size reasonable.
@@ -40,3 +46,25 @@ async def async_embed_query(text: str, *, client: AsyncOpenAI) -> list[float]:
         model=EMBEDDING_MODEL, input=[text], dimensions=EMBEDDING_DIMENSIONS
     )
     return response.data[0].embedding
+
+
+async def async_create_embeddings(texts: list[str], *, client: AsyncOpenAI) -> list[list[float]]:
+    """Async variant of create_embeddings. Caller provides the AsyncOpenAI client."""
+    all_vectors: list[list[float]] = []
+    for i in range(0, len(texts), _BATCH_SIZE):
+        response = await client.embeddings.create(
+            model=EMBEDDING_MODEL, input=texts[i : i + _BATCH_SIZE], dimensions=EMBEDDING_DIMENSIONS
+        )
+        all_vectors.extend([d.embedding for d in response.data])
+    return all_vectors
+
+
+def embedding_prefix(vector: list[float]) -> list[float]:
+    """Leading EMBEDDING_PREFIX_DIMENSIONS components rescaled to unit length.
+
+    text-embedding-3 vectors are Matryoshka-trained, so the prefix is a valid (coarser)
+    embedding on its own — the products.embedding_prefix column and its query side.
+    """
+    head = vector[:EMBEDDING_PREFIX_DIMENSIONS]
+    norm = math.sqrt(sum(x * x for x in head))
+    return [x / norm for x in head] if norm else head
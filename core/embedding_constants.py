@@ -1,2 +1,3 @@
 EMBEDDING_MODEL = "text-embedding-3-large"
 EMBEDDING_DIMENSIONS = 1536  # Matryoshka truncation — same column size, better quality
+EMBEDDING_PREFIX_DIMENSIONS = 256  # Matryoshka prefix — quantized first-pass search
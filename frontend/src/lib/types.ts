@@ -123,6 +123,8 @@ export interface StoreOut {
 
 export interface StoreWithDistance extends StoreOut {
   distance_km: number
+  product_count: number
+  wine_count: number
 }
 
 export interface UserStorePreferenceOut {
@@ -134,8 +136,28 @@ export interface UserStorePreferenceOut {
 export interface PaginatedOut {
   products: ProductOut[]
   total: number
+  total_exact: boolean // false when total is a planner estimate
   limit: number
   offset: number
+  next_cursor: string | null // opaque keyset token, null on the last page
+}
+
+export interface ProductBatchOut {
+  products: ProductOut[] // active products, in request order
+  missing: string[]
+  delisted: string[]
+}
+
+export interface SuggestionOut {
+  kind: 'product' | 'producer' | 'region' | 'grape' | 'appellation'
+  text: string
+  sku: string | null // products only
+  count: number
+}
+
+export interface SuggestOut {
+  suggestions: SuggestionOut[]
+  corrected: string | null // set when the typo fallback rewrote the prefix
 }
 
 export interface PriceRange {
@@ -155,19 +177,31 @@ export interface CategoryFamilyOut {
   children: string[] // group keys
 }
 
-export interface CountryFacet {
+export interface FacetCount {
   name: string
   count: number
 }
 
+export interface PriceBucket {
+  min: string
+  max: string | null
+  count: number
+}
+
 export interface FacetsOut {
   categories: string[]
   grouped_categories: CategoryGroupOut[]
   category_families: CategoryFamilyOut[]
-  countries: CountryFacet[]
+  countries: FacetCount[]
   regions: string[]
   grapes: string[]
   price_range: PriceRange | null
+  category_counts: FacetCount[]
+  region_counts: FacetCount[]
+  grape_counts: FacetCount[]
+  store_counts: FacetCount[]
+  online_count: number | null
+  price_histogram: PriceBucket[]
 }
 
 // --- Shared ---
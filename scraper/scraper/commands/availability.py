@@ -10,6 +10,7 @@ from ..config import settings
 from ..constants import EXIT_FATAL, EXIT_OK, EXIT_PARTIAL
 from ..db import (
     bulk_update_availability,
+    bump_catalog_version,
     delete_old_stock_events,
     emit_stock_event,
     get_all_skus,
@@ -195,6 +196,7 @@ async def availability_check() -> int:
             logger.info("Cleared stale availability for {} products", cleared)
     except SQLAlchemyError:
         return EXIT_FATAL
+    await bump_catalog_version()
 
     # Step 2: watch transition detection
     try:
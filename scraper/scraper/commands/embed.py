@@ -2,11 +2,11 @@ import time
 
 from loguru import logger
 
-from core.embedding_client import create_embeddings
+from core.embedding_client import create_embeddings, embedding_prefix
 
 from ..config import settings
 from ..constants import EXIT_FATAL, EXIT_OK
-from ..db import bulk_update_embeddings, get_products_needing_embedding
+from ..db import bulk_update_embeddings, bump_catalog_version, get_products_needing_embedding
 from ..embed import build_embedding_text
 
 
@@ -17,7 +17,7 @@ async def embed_sync() -> int:
     1. Query products where computed hash != last_embedded_hash
     2. Build embedding text from product fields
     3. Call OpenAI API in batches
-    4. Store vectors + update last_embedded_hash
+    4. Store vectors (full + Matryoshka prefix) + update last_embedded_hash
     """
     if not settings.OPENAI_API_KEY:
         logger.error("OPENAI_API_KEY not set — cannot run `python -m scraper embed`")
@@ -72,9 +72,14 @@ async def embed_sync() -> int:
         logger.opt(exception=exc).error("OpenAI API call failed")
         return EXIT_FATAL
 
-    # Build update payloads
+    # Build update payloads — the prefix feeds the backend's quantized first-pass search
     updates = [
-        {"sku": sku, "embedding": vector, "last_embedded_hash": h}
+        {
+            "sku": sku,
+            "embedding": vector,
+            "embedding_prefix": embedding_prefix(vector),
+            "last_embedded_hash": h,
+        }
         for sku, vector, h in zip(skus, vectors, hashes, strict=True)
     ]
 
@@ -83,6 +88,7 @@ async def embed_sync() -> int:
     except Exception as exc:
         logger.opt(exception=exc).error("Failed to store embeddings")
         return EXIT_FATAL
+    await bump_catalog_version()
 
     elapsed = time.monotonic() - start
     logger.info(
@@ -9,7 +9,7 @@ from sqlalchemy.exc import SQLAlchemyError
 from ..adobe import AdobeProduct, PaginationCapError, build_filters, fetch_facets, search_products
 from ..config import settings
 from ..constants import EXIT_FATAL, EXIT_OK
-from ..db import bulk_update_wine_attrs, get_all_skus
+from ..db import bulk_update_wine_attrs, bump_catalog_version, get_all_skus
 
 # Wine subcategory paths in SAQ's Adobe catalog
 _WINE_SUBCATEGORIES = [
@@ -217,6 +217,7 @@ async def enrich_wines() -> int:
         logger.info("Updated wine attributes for {} products", updated)
     except SQLAlchemyError:
         return EXIT_FATAL
+    await bump_catalog_version()
 
     elapsed = time.monotonic() - start
     minutes, seconds = divmod(int(elapsed), 60)
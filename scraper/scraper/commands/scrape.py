@@ -13,6 +13,7 @@ from ..config import settings
 from ..constants import EXIT_FATAL, EXIT_OK, EXIT_PARTIAL
 from ..db import (
     ProductState,
+    bump_catalog_version,
     clear_delisted,
     delete_old_stock_events,
     emit_stock_event,
@@ -231,6 +232,8 @@ async def scrape_products() -> int:
     sitemap_skus = {e.sku for e in entries}
     db_skus = set(product_states.keys())
     delisted, relisted = await _detect_delists(sitemap_skus, db_skus)
+    if stats.saved or delisted or relisted:
+        await bump_catalog_version()
 
     # Housekeeping: purge old stock events
     await delete_old_stock_events(days=settings.STOCK_EVENT_RETENTION_DAYS)
@@ -6,6 +6,7 @@ from sqlalchemy.exc import SQLAlchemyError
 
 from ..config import settings
 from ..constants import EXIT_FATAL, EXIT_OK
+from ..db import bump_catalog_version
 from ..db.stores import upsert_stores
 from ..stores import fetch_stores
 
@@ -23,6 +24,8 @@ async def scrape_stores() -> int:
         except (httpx.HTTPError, SQLAlchemyError, ValueError, KeyError) as exc:
             logger.opt(exception=exc).error("Store scrape failed")
             return EXIT_FATAL
+    # The backend's /stores/nearby validators follow the catalog version
+    await bump_catalog_version()
 
     elapsed = time.monotonic() - start
     minutes, seconds = divmod(int(elapsed), 60)
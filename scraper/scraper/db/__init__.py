@@ -6,6 +6,7 @@ from .availability import (
     get_watched_product_availability,
     reset_stale_availability,
 )
+from .catalog import bump_catalog_version
 from .embeddings import (
     bulk_update_embeddings,
     bulk_update_wine_attrs,
@@ -28,6 +29,7 @@ __all__ = [
     "bulk_update_availability",
     "bulk_update_embeddings",
     "bulk_update_wine_attrs",
+    "bump_catalog_version",
     "clear_delisted",
     "delete_old_stock_events",
     "emit_stock_event",
@@ -1,8 +1,8 @@
 from loguru import logger
-from sqlalchemy import bindparam, select, update
+from sqlalchemy import bindparam, delete, insert, select, update
 from sqlalchemy.exc import SQLAlchemyError
 
-from core.db.models import Product, UserStorePreference, Watch
+from core.db.models import Product, StoreInventory, UserStorePreference, Watch
 
 from .session import SessionLocal
 
@@ -15,6 +15,7 @@ async def bulk_update_availability(
     """Batch-update online_availability and store_availability for multiple SKUs.
 
     Uses Core-level UPDATE with bindparam, chunked to avoid oversized statements.
+    The store_inventory rows of each SKU are replaced in the same transaction.
     """
     if not updates:
         return 0
@@ -28,11 +29,22 @@ async def bulk_update_availability(
         .where(table.c.sku == bindparam("_sku"))
         .values(online_availability=bindparam("online"), store_availability=bindparam("stores"))
     )
+    inventory = StoreInventory.__table__
     async with SessionLocal() as session:
         try:
             for i in range(0, len(all_params), _BULK_CHUNK_SIZE):
                 chunk = all_params[i : i + _BULK_CHUNK_SIZE]
                 await session.execute(stmt, chunk)
+                await session.execute(
+                    delete(inventory).where(inventory.c.sku.in_([p["_sku"] for p in chunk]))
+                )
+                rows = [
+                    {"saq_store_id": store_id, "sku": p["_sku"]}
+                    for p in chunk
+                    for store_id in dict.fromkeys(p["stores"] or ())
+                ]
+                if rows:
+                    await session.execute(insert(inventory), rows)
             await session.commit()
         except SQLAlchemyError as exc:
             await session.rollback()
@@ -55,15 +67,18 @@ async def reset_stale_availability(exclude_skus: set[str]) -> int:
         )
         return 0
     table = Product.__table__
-    stmt = (
-        update(table)
-        .where(table.c.delisted_at.is_(None))
-        .where(table.c.sku.not_in(exclude_skus))
-        .where((table.c.online_availability.is_(True)) | (table.c.store_availability.is_not(None)))
-        .values(online_availability=False, store_availability=None)
+    stale = (
+        (table.c.delisted_at.is_(None))
+        & (table.c.sku.not_in(exclude_skus))
+        & ((table.c.online_availability.is_(True)) | (table.c.store_availability.is_not(None)))
     )
+    inventory = StoreInventory.__table__
+    # Clear inventory first — the UPDATE below nulls the column the predicate matches on
+    clear_inventory = delete(inventory).where(inventory.c.sku.in_(select(table.c.sku).where(stale)))
+    stmt = update(table).where(stale).values(online_availability=False, store_availability=None)
     async with SessionLocal() as session:
         try:
+            await session.execute(clear_inventory)
             result = await session.execute(stmt)
             await session.commit()
             return result.rowcount  # type: ignore[return-value]
@@ -0,0 +1,28 @@
+from datetime import UTC, datetime
+
+from loguru import logger
+from sqlalchemy import update
+from sqlalchemy.exc import SQLAlchemyError
+
+from core.db.models import CatalogState
+
+from .session import SessionLocal
+
+
+async def bump_catalog_version() -> None:
+    """Increment the catalog version so backend caches keyed on it are invalidated.
+
+    Best-effort — a failed bump only delays cache invalidation until the next run.
+    """
+    stmt = (
+        update(CatalogState)
+        .where(CatalogState.id == 1)
+        .values(version=CatalogState.version + 1, updated_at=datetime.now(UTC))
+    )
+    async with SessionLocal() as session:
+        try:
+            await session.execute(stmt)
+            await session.commit()
+        except SQLAlchemyError as exc:
+            await session.rollback()
+            logger.opt(exception=exc).warning("Failed to bump catalog version")
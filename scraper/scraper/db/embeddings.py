@@ -3,6 +3,7 @@ from sqlalchemy import bindparam, select, update
 from sqlalchemy.exc import SQLAlchemyError
 
 from core.db.models import Product
+from core.db.search import SEARCH_WEIGHTS, search_document
 
 from ..embed import compute_embedding_hash
 from .session import SessionLocal
@@ -61,7 +62,7 @@ async def get_products_needing_embedding() -> list[dict]:
 async def bulk_update_embeddings(
     updates: list[dict],
 ) -> int:
-    """Batch-update embedding vectors and last_embedded_hash."""
+    """Batch-update embedding vectors, their prefixes and last_embedded_hash."""
     if not updates:
         return 0
     table = Product.__table__
@@ -70,11 +71,17 @@ async def bulk_update_embeddings(
         .where(table.c.sku == bindparam("_sku"))
         .values(
             embedding=bindparam("_embedding"),
+            embedding_prefix=bindparam("_prefix"),
             last_embedded_hash=bindparam("_hash"),
         )
     )
     params = [
-        {"_sku": u["sku"], "_embedding": u["embedding"], "_hash": u["last_embedded_hash"]}
+        {
+            "_sku": u["sku"],
+            "_embedding": u["embedding"],
+            "_prefix": u["embedding_prefix"],
+            "_hash": u["last_embedded_hash"],
+        }
         for u in updates
     ]
     async with SessionLocal() as session:
@@ -95,7 +102,10 @@ async def bulk_update_embeddings(
 async def bulk_update_wine_attrs(
     updates: dict[str, dict[str, str | list | dict | None]],
 ) -> int:
-    """Batch-update wine attributes (taste_tag, vintage, tasting_profile, grape_blend)."""
+    """Batch-update wine attributes (taste_tag, vintage, tasting_profile, grape_blend).
+
+    Also refreshes search_vector, which indexes taste_tag.
+    """
     if not updates:
         return 0
     all_params = [
@@ -109,6 +119,8 @@ async def bulk_update_wine_attrs(
         for sku, attrs in updates.items()
     ]
     table = Product.__table__
+    # SET expressions see the old row — feed the new taste_tag into the search document
+    search_fields = {f: table.c[f] for f in SEARCH_WEIGHTS} | {"taste_tag": bindparam("taste_tag")}
     stmt = (
         update(table)
         .where(table.c.sku == bindparam("_sku"))
@@ -117,6 +129,7 @@ async def bulk_update_wine_attrs(
             vintage=bindparam("vintage"),
             tasting_profile=bindparam("tasting_profile"),
             grape_blend=bindparam("grape_blend"),
+            search_vector=search_document(search_fields),
         )
     )
     async with SessionLocal() as session:
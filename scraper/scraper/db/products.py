@@ -6,7 +6,9 @@ from sqlalchemy import select, update
 from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.exc import SQLAlchemyError
 
+from core.categories import classify_category
 from core.db.models import Product
+from core.db.search import SEARCH_WEIGHTS, search_document
 
 from ..products import ProductData
 from .session import SessionLocal
@@ -89,12 +91,23 @@ async def upsert_product(product_data: ProductData, content_hash: str) -> bool:
         now = datetime.now(UTC)
         product_dict["created_at"] = now
         product_dict["updated_at"] = now
+        product_dict["category_group"], product_dict["category_family"] = classify_category(
+            product_data.category
+        )
 
-        stmt = pg_insert(Product).values(product_dict)
+        search_fields = {f: product_dict.get(f) for f in SEARCH_WEIGHTS}
+        stmt = pg_insert(Product).values(
+            {**product_dict, "search_vector": search_document(search_fields)}
+        )
 
         # On conflict (SKU already exists), update all fields except sku and created_at
         update_dict = {k: v for k, v in product_dict.items() if k not in ["sku", "created_at"]}
         update_dict["updated_at"] = now
+        # taste_tag isn't scraped — keep the existing row's (enrich-written) value in the document
+        excluded_fields = {f: stmt.excluded[f] for f in SEARCH_WEIGHTS}
+        update_dict["search_vector"] = search_document(
+            excluded_fields | {"taste_tag": Product.taste_tag}
+        )
 
         stmt = stmt.on_conflict_do_update(
             index_elements=list(Product.__table__.primary_key),
@@ -317,6 +317,10 @@ class TestAvailabilityCheck:
                 new_callable=AsyncMock,
                 return_value=2,
             ) as mock_bulk,
+            patch(
+                "scraper.commands.availability.bump_catalog_version",
+                new_callable=AsyncMock,
+            ) as mock_bump,
             patch(
                 "scraper.commands.availability.reset_stale_availability",
                 new_callable=AsyncMock,
@@ -342,6 +346,7 @@ class TestAvailabilityCheck:
         assert updates["111"] == (True, ["23101"])
         assert updates["222"] == (False, ["23101"])
         mock_cleanup.assert_called_once()
+        mock_bump.assert_awaited_once()
 
     @pytest.mark.asyncio
     async def test_clears_stale_availability(self) -> None:
@@ -374,6 +379,10 @@ class TestAvailabilityCheck:
                 new_callable=AsyncMock,
                 return_value=1,
             ),
+            patch(
+                "scraper.commands.availability.bump_catalog_version",
+                new_callable=AsyncMock,
+            ),
             patch(
                 "scraper.commands.availability.reset_stale_availability",
                 new_callable=AsyncMock,
@@ -425,6 +434,10 @@ class TestAvailabilityCheck:
                 new_callable=AsyncMock,
                 return_value=1,
             ),
+            patch(
+                "scraper.commands.availability.bump_catalog_version",
+                new_callable=AsyncMock,
+            ),
             patch(
                 "scraper.commands.availability.reset_stale_availability",
                 new_callable=AsyncMock,
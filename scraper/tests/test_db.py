@@ -2,6 +2,7 @@ from datetime import UTC, date, datetime
 from unittest.mock import MagicMock, patch
 
 import pytest
+from sqlalchemy.dialects import postgresql
 from sqlalchemy.exc import SQLAlchemyError
 
 from scraper.products import ProductData
@@ -143,6 +144,34 @@ async def test_delete_old_stock_events_swallows_error(mock_db_session) -> None:
     mock_session.commit.assert_not_called()
 
 
+@pytest.mark.asyncio
+async def test_bump_catalog_version_commits(mock_db_session) -> None:
+    mock_session, mock_factory = mock_db_session
+
+    with patch("scraper.db.catalog.SessionLocal", mock_factory):
+        from scraper.db import bump_catalog_version
+
+        await bump_catalog_version()
+
+    mock_session.execute.assert_called_once()
+    mock_session.commit.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_bump_catalog_version_swallows_error(mock_db_session) -> None:
+    mock_session, mock_factory = mock_db_session
+    mock_session.execute.side_effect = SQLAlchemyError("connection lost")
+
+    with patch("scraper.db.catalog.SessionLocal", mock_factory):
+        from scraper.db import bump_catalog_version
+
+        # Should NOT raise
+        await bump_catalog_version()
+
+    mock_session.rollback.assert_called_once()
+    mock_session.commit.assert_not_called()
+
+
 class TestUpsertProduct:
     @pytest.mark.asyncio
     async def test_commits_and_returns_true_on_upsert(self, mock_db_session) -> None:
@@ -160,6 +189,40 @@ class TestUpsertProduct:
         mock_session.commit.assert_called_once()
         mock_session.rollback.assert_not_called()
 
+    @pytest.mark.asyncio
+    async def test_writes_search_vector_on_insert_and_update(self, mock_db_session) -> None:
+        """The upsert rebuilds the full-text document, keeping the stored taste_tag on update."""
+        mock_session, mock_factory = mock_db_session
+        product = ProductData(sku="12345678", name="Test Wine", producer="Domaine Tempier")
+
+        with patch("scraper.db.products.SessionLocal", mock_factory):
+            from scraper.db import upsert_product
+
+            await upsert_product(product, content_hash="abc123")
+
+        sql = str(mock_session.execute.call_args.args[0].compile(dialect=postgresql.dialect()))
+        insert_part, update_part = sql.split("ON CONFLICT")
+        assert "to_tsvector('french_unaccent'::regconfig" in insert_part
+        assert "search_vector = " in update_part
+        assert "excluded.producer" in update_part
+        assert "products.taste_tag" in update_part
+
+    @pytest.mark.asyncio
+    async def test_writes_category_group_and_family(self, mock_db_session) -> None:
+        """The upsert stores the taxonomy group/family derived from the raw category."""
+        mock_session, mock_factory = mock_db_session
+        product = ProductData(sku="12345678", name="Test Porto", category="Porto tawny")
+
+        with patch("scraper.db.products.SessionLocal", mock_factory):
+            from scraper.db import upsert_product
+
+            await upsert_product(product, content_hash="abc123")
+
+        compiled = mock_session.execute.call_args.args[0].compile(dialect=postgresql.dialect())
+        assert compiled.params["category_group"] == "fortifie"
+        assert compiled.params["category_family"] == "vins"
+        assert "category_family = " in str(compiled).split("ON CONFLICT")[1]
+
     @pytest.mark.asyncio
     async def test_rolls_back_and_raises_on_db_error(self, mock_db_session) -> None:
         """When session.execute() raises SQLAlchemyError, upsert should rollback and re-raise."""
@@ -213,3 +276,39 @@ class TestUpsertStores:
 
         mock_session.rollback.assert_called_once()
         mock_session.commit.assert_not_called()
+
+
+class TestBulkUpdateAvailability:
+    @pytest.mark.asyncio
+    async def test_replaces_store_inventory_rows(self, mock_db_session) -> None:
+        """Each SKU's inventory rows are deleted and re-inserted from its store list."""
+        mock_session, mock_factory = mock_db_session
+        updates = {"111": (True, ["23002", "23004", "23002"]), "222": (False, [])}
+
+        with patch("scraper.db.availability.SessionLocal", mock_factory):
+            from scraper.db import bulk_update_availability
+
+            result = await bulk_update_availability(updates)
+
+        assert result == 2
+        _, delete_call, insert_call = mock_session.execute.call_args_list
+        assert "DELETE FROM store_inventory" in str(delete_call.args[0])
+        assert "INSERT INTO store_inventory" in str(insert_call.args[0])
+        assert insert_call.args[1] == [
+            {"saq_store_id": "23002", "sku": "111"},
+            {"saq_store_id": "23004", "sku": "111"},
+        ]
+        mock_session.commit.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_reset_stale_clears_inventory(self, mock_db_session) -> None:
+        mock_session, mock_factory = mock_db_session
+
+        with patch("scraper.db.availability.SessionLocal", mock_factory):
+            from scraper.db import reset_stale_availability
+
+            await reset_stale_availability({"111"})
+
+        delete_call, update_call = mock_session.execute.call_args_list
+        assert "DELETE FROM store_inventory" in str(delete_call.args[0])
+        assert "UPDATE products" in str(update_call.args[0])
@@ -1,6 +1,7 @@
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
+from sqlalchemy.dialects import postgresql
 from sqlalchemy.exc import SQLAlchemyError
 
 from scraper.db.embeddings import (
@@ -140,8 +141,18 @@ class TestBulkUpdateEmbeddings:
         mock_session, mock_factory = mock_db_session
 
         updates = [
-            {"sku": "111", "embedding": [0.1] * 3, "last_embedded_hash": "hash1"},
-            {"sku": "222", "embedding": [0.2] * 3, "last_embedded_hash": "hash2"},
+            {
+                "sku": "111",
+                "embedding": [0.1] * 3,
+                "embedding_prefix": [0.1] * 2,
+                "last_embedded_hash": "hash1",
+            },
+            {
+                "sku": "222",
+                "embedding": [0.2] * 3,
+                "embedding_prefix": [0.2] * 2,
+                "last_embedded_hash": "hash2",
+            },
         ]
 
         with patch("scraper.db.embeddings.SessionLocal", mock_factory):
@@ -157,7 +168,14 @@ class TestBulkUpdateEmbeddings:
         mock_session, mock_factory = mock_db_session
         mock_session.execute.side_effect = SQLAlchemyError("connection lost")
 
-        updates = [{"sku": "111", "embedding": [0.1] * 3, "last_embedded_hash": "h1"}]
+        updates = [
+            {
+                "sku": "111",
+                "embedding": [0.1] * 3,
+                "embedding_prefix": [0.1] * 2,
+                "last_embedded_hash": "h1",
+            }
+        ]
 
         with (
             patch("scraper.db.embeddings.SessionLocal", mock_factory),
@@ -201,6 +219,10 @@ class TestBulkUpdateWineAttrs:
         mock_session.execute.assert_called_once()
         mock_session.commit.assert_called_once()
         mock_session.rollback.assert_not_called()
+        # The search document indexes the incoming taste_tag, not the row's old one
+        sql = str(mock_session.execute.call_args.args[0].compile(dialect=postgresql.dialect()))
+        assert "search_vector=" in sql.replace(" ", "")
+        assert "coalesce(CAST(%(taste_tag)s AS TEXT)" in sql
 
     @pytest.mark.asyncio
     async def test_rolls_back_and_raises_on_db_error(self, mock_db_session) -> None:
@@ -49,8 +49,10 @@ class TestEmbedSync:
     @patch("scraper.commands.embed.get_products_needing_embedding", new_callable=AsyncMock)
     @patch("scraper.commands.embed.create_embeddings")
     @patch("scraper.commands.embed.bulk_update_embeddings", new_callable=AsyncMock)
+    @patch("scraper.commands.embed.bump_catalog_version", new_callable=AsyncMock)
     async def test_embeds_all_products_and_persists_vectors(
         self,
+        mock_bump: AsyncMock,
         mock_bulk: AsyncMock,
         mock_embed: MagicMock,
         mock_get: AsyncMock,
@@ -72,6 +74,10 @@ class TestEmbedSync:
         assert updates[0]["sku"] == "111"
         assert updates[1]["sku"] == "222"
         assert len(updates[0]["embedding"]) == 1536
+        # Matryoshka prefix: leading 256 dims, back to unit length
+        assert len(updates[0]["embedding_prefix"]) == 256
+        assert sum(x * x for x in updates[1]["embedding_prefix"]) == pytest.approx(1.0)
+        mock_bump.assert_awaited_once()
 
     @patch("scraper.commands.embed.settings")
     @patch("scraper.commands.embed.get_products_needing_embedding", new_callable=AsyncMock)
@@ -195,6 +195,9 @@ class TestEnrichWines:
                 new_callable=AsyncMock,
                 return_value=2,
             ) as mock_bulk,
+            patch(
+                "scraper.commands.enrich.bump_catalog_version", new_callable=AsyncMock
+            ) as mock_bump,
         ):
             result = await enrich_wines()
 
@@ -207,6 +210,7 @@ class TestEnrichWines:
         assert "999" not in updates
         assert updates["111"]["taste_tag"] == "Fruité et généreux"
         assert updates["111"]["vintage"] == "2021"
+        mock_bump.assert_awaited_once()
 
     @pytest.mark.asyncio
     async def test_skips_products_with_no_attrs(self) -> None:
@@ -230,6 +234,7 @@ class TestEnrichWines:
                 new_callable=AsyncMock,
                 return_value=0,
             ) as mock_bulk,
+            patch("scraper.commands.enrich.bump_catalog_version", new_callable=AsyncMock),
         ):
             result = await enrich_wines()
 
@@ -270,6 +275,7 @@ class TestEnrichWines:
                 new_callable=AsyncMock,
                 return_value=1,
             ) as mock_bulk,
+            patch("scraper.commands.enrich.bump_catalog_version", new_callable=AsyncMock),
         ):
             result = await enrich_wines()
 
@@ -79,12 +79,15 @@ class TestScrapeStores:
         with (
             patch("scraper.commands.stores.fetch_stores", AsyncMock(return_value=[_make_store()])),
             patch("scraper.commands.stores.upsert_stores", AsyncMock()),
+            patch("scraper.commands.stores.bump_catalog_version", AsyncMock()) as mock_bump,
         ):
             from scraper.commands.stores import scrape_stores
 
             result = await scrape_stores()
 
         assert result == EXIT_OK
+        # Store edits must reach clients revalidating /stores/nearby
+        mock_bump.assert_awaited_once()
 
     @pytest.mark.asyncio
     async def test_returns_exit_fatal_on_http_error(self) -> None:
@@ -109,9 +112,11 @@ class TestScrapeStores:
                 "scraper.commands.stores.upsert_stores",
                 AsyncMock(side_effect=SQLAlchemyError("conn lost")),
             ),
+            patch("scraper.commands.stores.bump_catalog_version", AsyncMock()) as mock_bump,
         ):
             from scraper.commands.stores import scrape_stores
 
             result = await scrape_stores()
 
         assert result == EXIT_FATAL
+        mock_bump.assert_not_awaited()